@@ -0,0 +1,5 @@
+-- Add FIVE_MINUTES to ResolutionType so the worker can store 5-minute forecasts
+-- (the engine produces FIVE_MINUTES, FIFTEEN_MINUTES or HOURLY grids)
+
+-- ADD VALUE cannot be used in the same transaction as the new value; nothing below uses it
+ALTER TYPE "ResolutionType" ADD VALUE IF NOT EXISTS 'FIVE_MINUTES' BEFORE 'FIFTEEN_MINUTES';
@@ -0,0 +1,131 @@
+"""Admission control for forecast submissions"""
+
+from typing import Dict, Any
+import logging
+import math
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.job_scheduler import job_scheduler
+from app.core.metrics import ADMISSION_DECISIONS_TOTAL, DB_POOL_CHECKED_OUT
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a submission would overload the worker"""
+
+    def __init__(self, status_code: int, reason: str, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.reason = reason
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Decides whether new forecast jobs are accepted.
+
+    - DB pool saturated or worker draining -> 503 (transient, short Retry-After)
+    - Queue depth over the lane limit -> 429 (interactive jobs get extra headroom,
+      so batches are shed first)
+    - Estimated wait behind queued + in-flight jobs too long -> 429 with
+      Retry-After set to that estimate
+    """
+
+    def __init__(self):
+        self._accepting = True
+
+    def stop_admitting(self) -> None:
+        """Reject all new work (shutdown drain)"""
+        self._accepting = False
+
+    def resume_admitting(self) -> None:
+        """Accept new work again"""
+        self._accepting = True
+
+    def pool_saturation(self) -> float:
+        """Share of pool_size + max_overflow connections currently checked out"""
+        pool = engine.pool
+        capacity = pool.size() + settings.DATABASE_MAX_OVERFLOW
+        checked_out = pool.checkedout()
+        DB_POOL_CHECKED_OUT.set(checked_out)
+        return checked_out / capacity if capacity else 0.0
+
+    def estimated_wait_seconds(self, jobs_ahead: int) -> float:
+        """Time until a newly queued job would start, from measured job durations"""
+        job_seconds = job_scheduler.average_job_seconds() or settings.ADMISSION_DEFAULT_JOB_SECONDS
+        workers = max(1, job_scheduler.worker_count())
+        return (jobs_ahead + job_scheduler.in_flight()) * job_seconds / workers
+
+    def check(self, priority: str, job_count: int = 1) -> Dict[str, Any]:
+        """Admit job_count jobs on a lane or raise AdmissionRejected"""
+        try:
+            self._evaluate(priority, job_count)
+        except AdmissionRejected as rejection:
+            ADMISSION_DECISIONS_TOTAL.labels(
+                priority=priority, decision="rejected", reason=rejection.reason
+            ).inc()
+            logger.warning(
+                f"Admission rejected {job_count} {priority} job(s): {rejection.detail} "
+                f"(retry after {rejection.retry_after}s)"
+            )
+            raise
+
+        ADMISSION_DECISIONS_TOTAL.labels(priority=priority, decision="admitted", reason="ok").inc()
+        return {"admitted": job_count}
+
+    def _evaluate(self, priority: str, job_count: int) -> None:
+        if not self._accepting:
+            raise AdmissionRejected(
+                503, "draining", "Worker is shutting down",
+                settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+
+        saturation = self.pool_saturation()
+        if saturation >= settings.ADMISSION_DB_POOL_SATURATION:
+            raise AdmissionRejected(
+                503, "db_pool",
+                f"Database pool saturated ({saturation:.0%} of connections in use)",
+                settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+
+        depth = job_scheduler.queue_depth()
+        queued = sum(depth.values())
+        limit = settings.ADMISSION_MAX_QUEUE_DEPTH
+        if priority == "interactive":
+            limit += settings.ADMISSION_INTERACTIVE_HEADROOM
+
+        if queued + job_count > limit:
+            raise AdmissionRejected(
+                429, "queue_depth",
+                f"Forecast queue full ({queued} queued, limit {limit})",
+                self._retry_after(queued)
+            )
+
+        # Interactive jobs only wait for the interactive lane; other lanes wait for
+        # everything of equal or higher priority
+        if priority == "interactive":
+            jobs_ahead = depth.get("interactive", 0)
+        elif priority == "scheduled":
+            jobs_ahead = depth.get("interactive", 0) + depth.get("scheduled", 0)
+        else:
+            jobs_ahead = queued
+
+        wait = self.estimated_wait_seconds(jobs_ahead + job_count - 1)
+        if wait > settings.ADMISSION_MAX_ESTIMATED_WAIT_SECONDS:
+            raise AdmissionRejected(
+                429, "estimated_wait",
+                f"Estimated queue wait {wait:.0f}s exceeds {settings.ADMISSION_MAX_ESTIMATED_WAIT_SECONDS}s",
+                self._retry_after(jobs_ahead)
+            )
+
+    def _retry_after(self, jobs_ahead: int) -> int:
+        """Seconds until roughly one worker-round of the backlog has cleared"""
+        wait = self.estimated_wait_seconds(jobs_ahead)
+        return max(settings.ADMISSION_RETRY_AFTER_SECONDS, math.ceil(wait))
+
+
+# Global instance
+admission_controller = AdmissionController()
@@ -0,0 +1,122 @@
+"""Circuit breaker and latency budget for calls to slow or failing dependencies"""
+
+from collections import deque
+from typing import Deque, Optional
+import logging
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import CIRCUIT_BREAKER_STATE
+
+logger = logging.getLogger(__name__)
+
+# Gauge values per state
+_STATE_VALUES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitBreaker:
+    """
+    Stops calling a dependency after repeated failures.
+
+    - closed: calls go through; failure_threshold consecutive failures
+      (errors or timeouts) open the circuit
+    - open: calls are skipped until reset_seconds have passed
+    - half_open: a single trial call is let through; success closes the
+      circuit, failure opens it for another reset_seconds
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._set_state("closed")
+
+    @property
+    def state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+            self._set_state("half_open")
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be made now"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        if self._state != "closed":
+            logger.info(f"Circuit {self.name} closed")
+            self._set_state("closed")
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._state == "half_open" or self._failures >= self.failure_threshold:
+            if self._state != "open":
+                logger.warning(
+                    f"Circuit {self.name} opened after {self._failures} failures, "
+                    f"retrying in {self.reset_seconds}s"
+                )
+            self._opened_at = time.monotonic()
+            self._set_state("open")
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        CIRCUIT_BREAKER_STATE.labels(name=self.name).set(_STATE_VALUES[state])
+
+
+class LatencyBudget:
+    """
+    Rolling latency window of a dependency.
+
+    budget() is the configured percentile of the last `window` successful
+    calls, clamped to [min_seconds, max_seconds]; max_seconds is used until
+    min_samples calls have been observed.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_seconds: float,
+        max_seconds: float,
+        window: int = 200,
+        min_samples: int = 20
+    ):
+        self.percentile = percentile
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.min_samples = min_samples
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def budget(self) -> float:
+        if len(self._samples) < self.min_samples:
+            return self.max_seconds
+        value = float(np.percentile(self._samples, self.percentile))
+        return min(max(value, self.min_seconds), self.max_seconds)
+
+
+# Global instances
+sveltekit_weather_breaker = CircuitBreaker(
+    "sveltekit_weather",
+    failure_threshold=settings.WEATHER_READ_BREAKER_FAILURES,
+    reset_seconds=settings.WEATHER_READ_BREAKER_RESET_SECONDS
+)
+sveltekit_weather_latency = LatencyBudget(
+    percentile=settings.WEATHER_READ_HEDGE_PERCENTILE,
+    min_seconds=settings.WEATHER_READ_HEDGE_MIN_SECONDS,
+    max_seconds=settings.WEATHER_READ_HEDGE_MAX_SECONDS
+)
@@ -1,6 +1,6 @@
 """Configuration settings using Pydantic"""
 
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -37,11 +37,105 @@ class Settings(BaseSettings):
     SVELTEKIT_URL: str = "http://localhost:5173"
     SVELTEKIT_API_TIMEOUT: int = 30  # seconds
 
+    # Shared HTTP Client (SvelteKit / weather API calls)
+    HTTP_CLIENT_HTTP2: bool = True                 # Multiplex over HTTP/2 when the h2 package is installed
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 20            # Idle connections kept open for reuse
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0     # Seconds an idle connection is kept
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+
+    # Historical Weather Reads (SvelteKit with database hedge)
+    WEATHER_READ_TIMEOUT: float = 30.0               # Hard timeout of the SvelteKit weather call
+    WEATHER_READ_FORMAT: str = "ndjson"              # Requested body format: ndjson (one record per line) or json
+    WEATHER_READ_HEDGE_ENABLED: bool = True          # Start a database read when SvelteKit exceeds its budget
+    WEATHER_READ_HEDGE_PERCENTILE: float = 95.0      # Budget = this percentile of recent SvelteKit latencies
+    WEATHER_READ_HEDGE_MIN_SECONDS: float = 0.25
+    WEATHER_READ_HEDGE_MAX_SECONDS: float = 5.0      # Also the budget until enough latencies were observed
+    WEATHER_READ_BREAKER_FAILURES: int = 5           # Consecutive failures/timeouts that open the circuit
+    WEATHER_READ_BREAKER_RESET_SECONDS: float = 30.0 # Open time before a trial call is let through
+
     # Weather Data Settings
     WEATHER_FRESHNESS_MINUTES: int = 15  # Data older than this triggers sync
     WEATHER_SYNC_TIMEOUT: int = 30       # Timeout for sync operations
     WEATHER_MAX_RETRIES: int = 3         # Max retries for sync failures
     WEATHER_RETRY_DELAY: int = 2         # Seconds between retries
+    WEATHER_SYNC_LISTEN_ENABLED: bool = False        # LISTEN for weather_data upserts (installs a NOTIFY trigger)
+    WEATHER_SYNC_CHANNEL: str = "weather_data_synced"
+    WEATHER_SYNC_WEBHOOK_TOKEN: str = ""             # Required X-Webhook-Token for sync callbacks when set
+    WEATHER_SYNC_ON_MISSING: bool = True             # Sync before forecasting when the weather window is missing/short
+    WEATHER_SYNC_MIN_COVERAGE: float = 0.5           # Fraction of the horizon weather must cover to skip the sync
+    WEATHER_SYNC_COALESCE_SECONDS: float = 0.5       # Window to collect sync requests into one bulk sync
+    WEATHER_SYNC_BULK_MAX: int = 100                 # Locations per bulk sync call
+    WEATHER_CACHE_ENABLED: bool = True
+    WEATHER_CACHE_MAX_AGE_MINUTES: int = 60          # Full reload after this (picks up revised rows)
+    WEATHER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Memory budget across all cached locations
+    
+    # Forecast Job Scheduler
+    SCHEDULER_WORKERS: int = 4                        # Concurrent forecast jobs
+    SCHEDULER_INTERACTIVE_RESERVED_WORKERS: int = 1   # Workers that only serve interactive jobs
+    SCHEDULER_CLIENT_WEIGHTS: Dict[str, float] = {}   # clientId -> fair-share weight (default 1.0)
+
+    # Admission Control
+    ADMISSION_MAX_QUEUE_DEPTH: int = 1000             # Queued jobs before batch submissions get 429
+    ADMISSION_INTERACTIVE_HEADROOM: int = 100         # Extra queue slots reserved for interactive jobs
+    ADMISSION_MAX_ESTIMATED_WAIT_SECONDS: int = 1800  # Reject when a new job would wait longer
+    ADMISSION_DB_POOL_SATURATION: float = 0.9         # Checked-out share of the pool that triggers 503
+    ADMISSION_DEFAULT_JOB_SECONDS: int = 30           # Job duration estimate before any job finished
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5            # Retry-After for transient overload (503)
+
+    # Forecast Write-Behind Sink
+    FORECAST_SINK_ENABLED: bool = False     # Batch non-interactive saves across jobs
+    FORECAST_SINK_MAX_ROWS: int = 20000     # Flush when this many rows are buffered
+    FORECAST_SINK_FLUSH_SECONDS: float = 2.0  # Flush at least this often while rows are buffered
+
+    # Location Config Cache
+    LOCATION_CACHE_TTL_SECONDS: int = 3600    # Always reload after this
+    LOCATION_CACHE_CHECK_SECONDS: int = 30    # Re-check "updatedAt" after this
+    LOCATION_CACHE_MAX_ENTRIES: int = 5000
+
+    # Forecast Engine
+    FORECAST_RESOLUTION: str = "FIFTEEN_MINUTES"  # Default output grid: FIVE_MINUTES, FIFTEEN_MINUTES or HOURLY
+    FORECAST_MIXED_RESOLUTION: bool = False       # Coarse grid past the cut-over horizon (fewer engine points and rows)
+    FORECAST_MIXED_CUTOVER_HOURS: int = 48        # Horizon where the coarse grid starts
+    FORECAST_COARSE_RESOLUTION: str = "HOURLY"
+    RESAMPLE_PLAN_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Memory budget of cached interpolation plans
+
+    # Forecast Storage
+    FORECAST_STORAGE_MODE: str = "upsert"  # "upsert": overwrite rows in forecasts; "append": one row set per run in forecast_runs
+
+    # Forecast Reads
+    FORECAST_PAGE_MAX_ROWS: int = 10000      # Upper bound for the `limit` of paginated range reads
+    FORECAST_STREAM_BATCH_ROWS: int = 2000   # Rows fetched per server-side cursor round trip when streaming
+    EXPORT_CHUNK_ROWS: int = 50000           # Rows per Arrow record batch / Parquet row group in exports
+
+    # Forecast/Production Rollups (TimescaleDB continuous aggregates)
+    ROLLUPS_ENABLED: bool = True               # Create hourly/daily rollups at startup
+    ROLLUP_REFRESH_MINUTES: int = 15           # Refresh policy schedule
+    ROLLUP_REFRESH_LOOKBACK_DAYS: int = 7      # Refresh window start (forecast revisions older than this are not re-aggregated)
+
+    # Forecast Write Amplification
+    FORECAST_SKIP_UNCHANGED: bool = True              # Skip upserts of rows matching the last write
+    FORECAST_UNCHANGED_TOLERANCE_MW: float = 0.001    # Max power/quantile delta treated as unchanged
+    FORECAST_FINGERPRINT_TTL_SECONDS: int = 21600     # Trust cached fingerprints for this long
+    FORECAST_FINGERPRINT_MAX_LOCATIONS: int = 5000    # LRU bound on cached locations
+
+    # Retention & Compression
+    RETENTION_ENABLED: bool = False          # Periodically drop/delete forecasts and weather past retention
+    FORECAST_RETENTION_DAYS: int = 730
+    WEATHER_RETENTION_DAYS: int = 730
+    RETENTION_INTERVAL_HOURS: int = 24
+    RETENTION_DELETE_BATCH_ROWS: int = 5000  # Rows per committed DELETE batch for partial chunks
+    COMPRESSION_ENABLED: bool = False        # Native compression policies for cold chunks
+    COMPRESS_AFTER_DAYS: int = 7
+
+    # Shutdown
+    SHUTDOWN_DRAIN_SECONDS: int = 25  # Grace period for running jobs before they are checkpointed
+
+    # Pipeline Scheduler
+    PIPELINE_SCHEDULER_ENABLED: bool = True
+    PIPELINE_SPREAD_SECONDS: int = 300       # Window to spread a scheduled run's locations over
+    PIPELINE_SCHEDULER_MAX_SLEEP: int = 60   # Max seconds between schedule checks (and reloads from the table)
+    PIPELINE_SCHEDULER_RETRY_SECONDS: int = 30  # Wait before retrying a schedule whose claim failed
     
     # ML Models
     MODELS_PATH: str = "/app/models"
@@ -0,0 +1,89 @@
+"""Process-wide pooled HTTP client for SvelteKit and weather API calls"""
+
+from typing import Optional
+import importlib.util
+import logging
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import HTTP_CLIENT_REQUESTS, HTTP_CLIENT_REQUEST_SECONDS, HTTP_POOL_CONNECTIONS
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class SharedHttpClient:
+    """
+    One httpx.AsyncClient shared by every integration call.
+
+    Keeps connections alive between calls (and multiplexes them over HTTP/2
+    when available) instead of paying TCP/TLS setup per request. Started and
+    closed by the application lifespan; get() creates it lazily for callers
+    outside the app (scripts, tests).
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self) -> None:
+        """Create the pooled client"""
+        self.get()
+        logger.info(
+            f"Shared HTTP client started (http2={self._client_http2()}, "
+            f"max_connections={settings.HTTP_CLIENT_MAX_CONNECTIONS})"
+        )
+
+    async def stop(self) -> None:
+        """Close all pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            HTTP_POOL_CONNECTIONS.labels(state="active").set(0)
+            HTTP_POOL_CONNECTIONS.labels(state="idle").set(0)
+
+    def get(self) -> httpx.AsyncClient:
+        """The shared client; pass per-call timeouts to the request methods"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self._client_http2(),
+                timeout=httpx.Timeout(settings.SVELTEKIT_API_TIMEOUT, connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY
+                ),
+                event_hooks={"request": [self._on_request], "response": [self._on_response]}
+            )
+        return self._client
+
+    def _client_http2(self) -> bool:
+        return settings.HTTP_CLIENT_HTTP2 and HTTP2_AVAILABLE
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        request.extensions["started_at"] = time.monotonic()
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        host = response.request.url.host
+        started_at = response.request.extensions.get("started_at")
+        if started_at is not None:
+            HTTP_CLIENT_REQUEST_SECONDS.labels(host=host).observe(time.monotonic() - started_at)
+        HTTP_CLIENT_REQUESTS.labels(host=host, status=str(response.status_code)).inc()
+        self._record_pool()
+
+    def _record_pool(self) -> None:
+        # httpx does not expose pool statistics; read them from the httpcore pool
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            return
+        idle = sum(1 for connection in connections if connection.is_idle())
+        HTTP_POOL_CONNECTIONS.labels(state="idle").set(idle)
+        HTTP_POOL_CONNECTIONS.labels(state="active").set(len(connections) - idle)
+
+
+# Global instance
+http_client = SharedHttpClient()
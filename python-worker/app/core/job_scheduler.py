@@ -0,0 +1,258 @@
+"""Priority + per-client fair scheduling for forecast jobs"""
+
+from typing import Dict, List, Optional, Any, Callable, Awaitable
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import (
+    FORECAST_QUEUE_DEPTH,
+    FORECAST_QUEUE_WAIT_SECONDS,
+    FORECAST_JOBS_IN_FLIGHT,
+    FORECAST_JOBS_TOTAL,
+)
+from app.core.task_manager import task_manager
+
+logger = logging.getLogger(__name__)
+
+# Lanes in strict priority order
+PRIORITY_CLASSES = ("interactive", "scheduled", "backfill")
+
+
+class _FairQueue:
+    """
+    Start-time fair queue for one priority lane.
+
+    Every job gets a virtual start tag max(lane_time, client's last finish tag)
+    and a finish tag start + cost / weight. Jobs are served in start-tag order,
+    so a client with 500 queued jobs only gets its weighted share when other
+    clients are waiting too.
+    """
+
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._virtual_time = 0.0
+        self._client_finish: Dict[str, float] = {}
+
+    def push(self, job: Dict[str, Any], seq: int, weight: float, cost: float = 1.0) -> None:
+        client = job["client_id"]
+        start = max(self._virtual_time, self._client_finish.get(client, 0.0))
+        self._client_finish[client] = start + cost / weight
+        heapq.heappush(self._heap, (start, seq, job))
+
+    def pop(self) -> Dict[str, Any]:
+        start, _, job = heapq.heappop(self._heap)
+        self._virtual_time = start
+        if not self._heap:
+            # Idle lane - forget history so returning clients are not penalised
+            self._client_finish.clear()
+        return job
+
+    def remove(self, task_id: str) -> Optional[Dict[str, Any]]:
+        for i, (_, _, job) in enumerate(self._heap):
+            if job["task_id"] == task_id:
+                self._heap.pop(i)
+                heapq.heapify(self._heap)
+                return job
+        return None
+
+    def jobs(self) -> List[Dict[str, Any]]:
+        return [entry[2] for entry in sorted(self._heap)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class ForecastJobScheduler:
+    """Worker pool pulling forecast jobs by priority lane, fair across clients"""
+
+    def __init__(self):
+        self._lanes: Dict[str, _FairQueue] = {p: _FairQueue() for p in PRIORITY_CLASSES}
+        self._seq = itertools.count()
+        self._available = asyncio.Condition()
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_jobs: Dict[str, Dict[str, Any]] = {}
+        self._draining = False
+        self._runner: Optional[Callable[[str], Awaitable[None]]] = None
+        self._worker_count = 0
+        self._avg_job_seconds: Optional[float] = None  # EMA of job durations
+
+    async def start(self, runner: Callable[[str], Awaitable[None]]) -> None:
+        """Start worker coroutines; runner(task_id) executes one forecast task"""
+        self._runner = runner
+        self._draining = False
+        worker_count = max(1, settings.SCHEDULER_WORKERS)
+        self._worker_count = worker_count
+        reserved = min(settings.SCHEDULER_INTERACTIVE_RESERVED_WORKERS, worker_count - 1)
+
+        for i in range(worker_count):
+            # The first `reserved` workers only serve the interactive lane so an
+            # operator request never waits behind a fully busy batch pool
+            lanes = PRIORITY_CLASSES[:1] if i < reserved else PRIORITY_CLASSES
+            self._workers.append(asyncio.create_task(self._worker(i, lanes)))
+
+        logger.info(f"Job scheduler started: {worker_count} workers ({reserved} interactive-only)")
+
+    async def stop(self) -> None:
+        """Cancel workers and running jobs"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def drain(self, timeout: float) -> List[Dict[str, Any]]:
+        """
+        Stop picking up jobs, give running jobs up to `timeout` seconds to finish,
+        then cancel the rest and stop the workers.
+
+        Returns the specs of every job that did not finish (queued + cancelled
+        running jobs) so they can be checkpointed and resumed elsewhere.
+        """
+        self._draining = True
+        async with self._available:
+            self._available.notify_all()  # Wake idle workers so they exit
+
+        running = dict(self._running)
+        running_jobs = dict(self._running_jobs)
+        unfinished: List[Dict[str, Any]] = []
+
+        if running:
+            logger.info(f"Draining: waiting up to {timeout}s for {len(running)} running jobs")
+            _, still_running = await asyncio.wait(running.values(), timeout=timeout)
+            for task_id, execution in running.items():
+                if execution in still_running:
+                    execution.cancel()
+                    unfinished.append(running_jobs[task_id])
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+        async with self._available:
+            for priority, lane in self._lanes.items():
+                queued = lane.jobs()
+                unfinished.extend(queued)
+                FORECAST_QUEUE_DEPTH.labels(priority=priority).dec(len(queued))
+                self._lanes[priority] = _FairQueue()
+
+        await self.stop()
+        logger.info(f"Drain complete: {len(unfinished)} unfinished jobs")
+        return unfinished
+
+    async def submit(
+        self,
+        task_id: str,
+        client_id: Optional[Any] = None,
+        priority: str = "interactive",
+        **spec: Any
+    ) -> None:
+        """Queue a task for execution in its priority lane"""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"priority must be one of {PRIORITY_CLASSES}, got: {priority}")
+
+        client = str(client_id) if client_id is not None else "unknown"
+        job = {
+            "task_id": task_id,
+            "client_id": client,
+            "priority": priority,
+            "enqueued_at": time.monotonic(),
+            **spec
+        }
+        weight = settings.SCHEDULER_CLIENT_WEIGHTS.get(client, 1.0)
+
+        async with self._available:
+            self._lanes[priority].push(job, next(self._seq), weight)
+            FORECAST_QUEUE_DEPTH.labels(priority=priority).inc()
+            self._available.notify_all()
+
+    async def cancel(self, task_id: str) -> bool:
+        """Drop a queued job or cancel it while running"""
+        async with self._available:
+            for priority, lane in self._lanes.items():
+                if lane.remove(task_id):
+                    FORECAST_QUEUE_DEPTH.labels(priority=priority).dec()
+                    return True
+
+        running = self._running.get(task_id)
+        if running:
+            running.cancel()
+            return True
+        return False
+
+    def queue_depth(self) -> Dict[str, int]:
+        """Waiting jobs per priority lane"""
+        return {priority: len(lane) for priority, lane in self._lanes.items()}
+
+    def in_flight(self) -> int:
+        """Jobs currently executing"""
+        return len(self._running)
+
+    def worker_count(self) -> int:
+        """Number of started workers"""
+        return self._worker_count
+
+    def average_job_seconds(self) -> Optional[float]:
+        """Moving average job duration (None until the first job finished)"""
+        return self._avg_job_seconds
+
+    def _next_job(self, lanes: tuple) -> Optional[Dict[str, Any]]:
+        for priority in lanes:
+            if self._lanes[priority]:
+                return self._lanes[priority].pop()
+        return None
+
+    async def _worker(self, worker_id: int, lanes: tuple) -> None:
+        while not self._draining:
+            async with self._available:
+                job = None if self._draining else self._next_job(lanes)
+                while job is None:
+                    await self._available.wait()
+                    if self._draining:
+                        return
+                    job = self._next_job(lanes)
+
+            priority = job["priority"]
+            FORECAST_QUEUE_DEPTH.labels(priority=priority).dec()
+            FORECAST_QUEUE_WAIT_SECONDS.labels(priority=priority).observe(
+                time.monotonic() - job["enqueued_at"]
+            )
+
+            await self._execute(job)
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        task_id = job["task_id"]
+        execution = asyncio.create_task(self._runner(task_id))
+        self._running[task_id] = execution
+        self._running_jobs[task_id] = job
+        FORECAST_JOBS_IN_FLIGHT.inc()
+        started = time.monotonic()
+
+        try:
+            await execution
+            outcome = (task_manager.get_all_tasks().get(task_id) or {}).get("status", "unknown")
+        except asyncio.CancelledError:
+            if not execution.cancelled():
+                # The worker itself is being cancelled - propagate
+                execution.cancel()
+                raise
+            outcome = "cancelled"
+        except Exception as e:
+            outcome = "failed"
+            logger.error(f"Job {task_id} raised outside task handling: {e}", exc_info=True)
+        finally:
+            self._running.pop(task_id, None)
+            self._running_jobs.pop(task_id, None)
+            FORECAST_JOBS_IN_FLIGHT.dec()
+
+        FORECAST_JOBS_TOTAL.labels(priority=job["priority"], outcome=outcome).inc()
+
+        duration = time.monotonic() - started
+        if self._avg_job_seconds is None:
+            self._avg_job_seconds = duration
+        else:
+            self._avg_job_seconds = 0.8 * self._avg_job_seconds + 0.2 * duration
+
+
+# Global instance
+job_scheduler = ForecastJobScheduler()
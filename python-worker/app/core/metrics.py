@@ -0,0 +1,89 @@
+"""Prometheus metrics shared across the worker (exposed on /metrics)"""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Forecast job scheduler
+FORECAST_QUEUE_DEPTH = Gauge(
+    "forecast_queue_depth",
+    "Forecast jobs waiting for a worker",
+    ["priority"]
+)
+FORECAST_QUEUE_WAIT_SECONDS = Histogram(
+    "forecast_queue_wait_seconds",
+    "Time between job submission and a worker picking it up",
+    ["priority"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+FORECAST_JOBS_IN_FLIGHT = Gauge(
+    "forecast_jobs_in_flight",
+    "Forecast jobs currently executing"
+)
+FORECAST_JOBS_TOTAL = Counter(
+    "forecast_jobs_total",
+    "Forecast jobs finished by the scheduler",
+    ["priority", "outcome"]
+)
+
+# Admission control
+ADMISSION_DECISIONS_TOTAL = Counter(
+    "forecast_admission_decisions_total",
+    "Admission decisions for forecast submissions",
+    ["priority", "decision", "reason"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections currently checked out of the pool"
+)
+
+# Weather cache
+WEATHER_CACHE_REQUESTS = Counter(
+    "weather_cache_requests_total",
+    "Future weather window reads by cache outcome (hit, incremental, refresh, miss)",
+    ["result"]
+)
+WEATHER_SYNC_REQUESTS = Counter(
+    "weather_sync_requests_total",
+    "Weather sync requests from forecasts (queued: new in a batch, joined: already queued or in flight)",
+    ["result"]
+)
+WEATHER_SYNC_CALLS = Counter(
+    "weather_sync_calls_total",
+    "Bulk weather sync calls made to SvelteKit",
+    ["outcome"]
+)
+
+# Shared HTTP client
+HTTP_CLIENT_REQUESTS = Counter(
+    "http_client_requests_total",
+    "Outgoing requests made through the shared HTTP client",
+    ["host", "status"]
+)
+HTTP_CLIENT_REQUEST_SECONDS = Histogram(
+    "http_client_request_seconds",
+    "Outgoing request latency until response headers",
+    ["host"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+HTTP_POOL_CONNECTIONS = Gauge(
+    "http_client_pool_connections",
+    "Connections held by the shared HTTP client pool",
+    ["state"]
+)
+
+# Historical weather reads
+WEATHER_READ_SECONDS = Histogram(
+    "weather_read_seconds",
+    "Historical weather read latency by source (sveltekit, database, hedged_database)",
+    ["source"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+WEATHER_READ_RESULTS = Counter(
+    "weather_read_results_total",
+    "Historical weather reads by the source that served them and why",
+    ["source", "reason"]
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half open, 2 open)",
+    ["name"]
+)
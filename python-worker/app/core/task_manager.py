@@ -1,7 +1,8 @@
 """Global task manager for tracking async operations"""
 
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Iterable, List, Set, Tuple
 from datetime import datetime
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,11 +12,13 @@ class TaskManager:
 
     _instance = None
     _tasks: Dict[str, Dict[str, Any]] = {}
+    _subscribers: Dict[str, Set[asyncio.Queue]] = {}
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._tasks = {}
+            cls._instance._subscribers = {}
         return cls._instance
 
     def add_task(self, task_id: str, task_data: Dict[str, Any]) -> None:
@@ -37,6 +40,7 @@ class TaskManager:
         if task_id in self._tasks:
             self._tasks[task_id].update(updates)
             logger.info(f"Task {task_id} updated: {updates}")
+            self._publish(task_id)
             return True
         logger.warning(f"Cannot update task {task_id} - not found")
         return False
@@ -71,6 +75,39 @@ class TaskManager:
 
         return removed
 
+    def get_batch_task_ids(self, batch_id: str) -> List[str]:
+        """Get IDs of all tasks queued as part of a batch"""
+        return [
+            task_id for task_id, task_data in self._tasks.items()
+            if task_data.get('batch_id') == batch_id
+        ]
+
+    def subscribe(self, task_ids: Iterable[str]) -> asyncio.Queue:
+        """Register a queue that receives (task_id, snapshot) on every task update"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for task_id in task_ids:
+            self._subscribers.setdefault(task_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue, task_ids: Iterable[str]) -> None:
+        """Remove a queue registered with subscribe()"""
+        for task_id in task_ids:
+            subscribers = self._subscribers.get(task_id)
+            if subscribers is None:
+                continue
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[task_id]
+
+    def _publish(self, task_id: str) -> None:
+        """Push a snapshot of the task to every subscribed queue"""
+        subscribers = self._subscribers.get(task_id)
+        if not subscribers:
+            return
+        snapshot: Tuple[str, Dict[str, Any]] = (task_id, dict(self._tasks[task_id]))
+        for queue in subscribers:
+            queue.put_nowait(snapshot)
+
     def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
         """Get all tasks (for debugging)"""
         return self._tasks.copy()
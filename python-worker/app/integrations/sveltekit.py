@@ -7,6 +7,9 @@ from datetime import datetime
 import httpx
 
 from app.core.config import settings
+from app.core.http_client import http_client
+from app.modules.forecast.weather_cache import weather_cache
+from app.modules.forecast.weather_events import weather_sync_events
 
 logger = logging.getLogger(__name__)
 
@@ -40,13 +43,14 @@ class SvelteKitClient:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(timeout=self.timeout) as client:
-                    response = await client.post(url, json=payload)
-                    response.raise_for_status()
+                client = http_client.get()
+                response = await client.post(url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
 
-                    result = response.json()
-                    logger.info(f"Weather sync triggered successfully for location {location_id}: {result}")
-                    return result
+                result = response.json()
+                logger.info(f"Weather sync triggered successfully for location {location_id}: {result}")
+                weather_cache.invalidate(location_id)
+                return result
 
             except httpx.HTTPError as e:
                 logger.warning(f"Weather sync attempt {attempt + 1} failed for location {location_id}: {e}")
@@ -77,13 +81,15 @@ class SvelteKitClient:
         logger.info(f"Triggering bulk weather sync for {len(location_ids)} locations")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout * 2) as client:  # Longer timeout for bulk
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
+            client = http_client.get()
+            response = await client.post(url, json=payload, timeout=self.timeout * 2)  # Longer timeout for bulk
+            response.raise_for_status()
 
-                result = response.json()
-                logger.info(f"Bulk weather sync completed: {result}")
-                return result
+            result = response.json()
+            logger.info(f"Bulk weather sync completed: {result}")
+            for location_id in location_ids:
+                weather_cache.invalidate(location_id)
+            return result
 
         except httpx.HTTPError as e:
             logger.error(f"Bulk weather sync failed: {e}")
@@ -103,13 +109,13 @@ class SvelteKitClient:
         params = {"locationId": location_id}
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url, params=params)
-                response.raise_for_status()
+            client = http_client.get()
+            response = await client.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
 
-                result = response.json()
-                logger.debug(f"Weather status for location {location_id}: {result}")
-                return result
+            result = response.json()
+            logger.debug(f"Weather status for location {location_id}: {result}")
+            return result
 
         except httpx.HTTPError as e:
             logger.warning(f"Failed to get weather status for location {location_id}: {e}")
@@ -122,7 +128,12 @@ class SvelteKitClient:
         check_interval: int = 2
     ) -> bool:
         """
-        Wait for weather sync to complete by checking status periodically
+        Wait for weather sync to complete
+
+        When sync completions are delivered (LISTEN/NOTIFY or webhook) this
+        awaits the completion event, re-checking status only every
+        check_interval * 5 seconds as a safety net. Otherwise the status
+        endpoint is polled every check_interval seconds.
 
         Args:
             location_id: Location ID to monitor
@@ -134,6 +145,9 @@ class SvelteKitClient:
         """
         logger.info(f"Waiting for weather sync completion for location {location_id}")
 
+        if weather_sync_events.active:
+            return await self._wait_for_sync_event(location_id, max_wait_seconds, check_interval * 5)
+
         start_time = datetime.utcnow()
 
         while (datetime.utcnow() - start_time).seconds < max_wait_seconds:
@@ -153,6 +167,43 @@ class SvelteKitClient:
         logger.warning(f"Weather sync timeout for location {location_id}")
         return False
 
+    async def _wait_for_sync_event(
+        self,
+        location_id: str,
+        max_wait_seconds: int,
+        recheck_interval: int
+    ) -> bool:
+        """Await a sync completion event, falling back to an occasional status check"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_seconds
+        # Registered before the first status check so a completion in between is not lost
+        completion = weather_sync_events.register(location_id)
+
+        try:
+            while True:
+                try:
+                    status = await self.get_weather_sync_status(location_id)
+                    if status.get("hasRecentData", False):
+                        logger.info(f"Weather sync completed for location {location_id}")
+                        return True
+                except Exception as e:
+                    logger.warning(f"Error checking sync status for location {location_id}: {e}")
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(asyncio.shield(completion), timeout=min(remaining, recheck_interval))
+                    logger.info(f"Weather sync completion event received for location {location_id}")
+                    return True
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            weather_sync_events.discard(location_id, completion)
+
+        logger.warning(f"Weather sync timeout for location {location_id}")
+        return False
+
     async def health_check(self) -> bool:
         """
         Check if SvelteKit API is healthy
@@ -163,19 +214,19 @@ class SvelteKitClient:
         url = f"{self.base_url}/api/health"
 
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            client = http_client.get()
+            response = await client.get(url, timeout=5)
+            response.raise_for_status()
 
-                result = response.json()
-                is_healthy = result.get("status") == "healthy"
+            result = response.json()
+            is_healthy = result.get("status") == "healthy"
 
-                if is_healthy:
-                    logger.debug("SvelteKit API health check passed")
-                else:
-                    logger.warning(f"SvelteKit API health check failed: {result}")
+            if is_healthy:
+                logger.debug("SvelteKit API health check passed")
+            else:
+                logger.warning(f"SvelteKit API health check failed: {result}")
 
-                return is_healthy
+            return is_healthy
 
         except Exception as e:
             logger.error(f"SvelteKit API health check failed: {e}")
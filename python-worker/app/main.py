@@ -7,11 +7,25 @@ from prometheus_client import make_asgi_app
 import structlog
 
 from app.core.config import settings
-from app.core.database import engine, Base
+from app.core.database import engine, Base, AsyncSessionLocal
+from app.core.admission import admission_controller
+from app.core.http_client import http_client
+from app.core.job_scheduler import job_scheduler
 from app.modules.forecast import forecast_router
 # Weather module removed - now using SvelteKit API
 from app.modules.analysis import analysis_router
 from app.modules.pipeline import pipeline_router
+from app.modules.forecast.services import (
+    run_forecast_task,
+    checkpoint_jobs,
+    resume_checkpointed_jobs,
+)
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.sink import forecast_sink
+from app.modules.forecast.retention import storage_maintenance
+from app.modules.forecast.weather_events import weather_sync_events
+from app.modules.forecast.weather_sync import weather_sync_coordinator
+from app.modules.pipeline.scheduler import pipeline_scheduler
 
 # Configure structured logging
 structlog.configure(
@@ -44,11 +58,59 @@ async def lifespan(app: FastAPI):
         await conn.run_sync(Base.metadata.create_all)
     
     logger.info("Database initialized")
+
+    await http_client.start()
+    await weather_sync_events.start()
+
+    if settings.FORECAST_STORAGE_MODE == "append":
+        async with AsyncSessionLocal() as db:
+            await ForecastRepository(db).ensure_run_storage()
+
+    if settings.ROLLUPS_ENABLED:
+        try:
+            async with AsyncSessionLocal() as db:
+                await ForecastRepository(db).ensure_rollups()
+        except Exception as e:
+            # Rollup reads fall back to bucketing raw rows on the fly
+            logger.warning("Rollup setup failed", error=str(e))
+
+    if settings.RETENTION_ENABLED or settings.COMPRESSION_ENABLED:
+        await storage_maintenance.start()
+
+    if settings.FORECAST_SINK_ENABLED:
+        await forecast_sink.start()
+
+    await job_scheduler.start(runner=run_forecast_task)
+    await resume_checkpointed_jobs()
+
+    if settings.PIPELINE_SCHEDULER_ENABLED:
+        await pipeline_scheduler.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Solar Forecast Worker")
+    # Drain: refuse new work, let running jobs finish within the grace period,
+    # then checkpoint everything unfinished for the next start to resume
+    admission_controller.stop_admitting()
+    await storage_maintenance.stop()
+    await pipeline_scheduler.stop(flush_pending=True)
+    unfinished = await job_scheduler.drain(timeout=settings.SHUTDOWN_DRAIN_SECONDS)
+    if settings.FORECAST_SINK_ENABLED:
+        # Jobs cancelled while awaiting their sink write are landed by the
+        # sink below; checkpointing them too would recompute (and in append
+        # mode store) the same run again
+        buffered = forecast_sink.buffered_run_ids()
+        unfinished = [job for job in unfinished if job["task_id"] not in buffered]
+    try:
+        await checkpoint_jobs(unfinished)
+    except Exception as e:
+        logger.error("Failed to checkpoint unfinished jobs", count=len(unfinished), error=str(e))
+    if settings.FORECAST_SINK_ENABLED:
+        await forecast_sink.stop()
+    await weather_sync_coordinator.stop()
+    await weather_sync_events.stop()
+    await http_client.stop()
     await engine.dispose()
 
 
@@ -1,18 +1,31 @@
 """Forecast API controllers - handles HTTP requests"""
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import json
+import uuid
 
+from app.core.config import settings
 from app.core.database import get_db
-from .services import ForecastService
+from .services import ForecastService, stream_forecasts
+from .export import ARROW_AVAILABLE, EXPORT_MEDIA_TYPES, export_range, resolve_export_columns
+from .location_cache import location_cache
+from .retention import storage_maintenance
+from .weather_events import weather_sync_events
 from .models_api import (
     ForecastRequest,
     ForecastResponse,
-    ForecastTaskResponse
+    ForecastTaskResponse,
+    BulkForecastRequest,
+    BulkForecastResponse,
+    WeatherSyncNotification
     # ForecastAccuracyResponse removed - business logic moved to SvelteKit
 )
+from app.core.admission import admission_controller, AdmissionRejected
+from app.core.job_scheduler import PRIORITY_CLASSES
 from app.core.task_manager import task_manager
 
 router = APIRouter(
@@ -21,6 +34,18 @@ router = APIRouter(
 )
 
 
+def _admit(priority: str, job_count: int = 1) -> None:
+    """Apply admission control, mapping rejections to 429/503 with Retry-After"""
+    try:
+        admission_controller.check(priority, job_count)
+    except AdmissionRejected as rejection:
+        raise HTTPException(
+            status_code=rejection.status_code,
+            detail=rejection.detail,
+            headers={"Retry-After": str(rejection.retry_after)}
+        )
+
+
 @router.post(
     "/generate",
     response_model=ForecastTaskResponse,
@@ -41,6 +66,8 @@ router = APIRouter(
       - PHYSICS: Pure physics-based calculations using PVLIB
       - ML_ENSEMBLE: Machine learning ensemble with uncertainty bands
       - HYBRID: Combination of ML and physics models
+    - **resolution**: Output grid - FIVE_MINUTES, FIFTEEN_MINUTES or HOURLY
+      (default: FIFTEEN_MINUTES)
 
     The forecast generation runs asynchronously in the background.
     Use the task status endpoint to track progress.
@@ -61,12 +88,13 @@ router = APIRouter(
             }
         },
         404: {"description": "Location not found"},
+        429: {"description": "Forecast queue full - retry after the Retry-After header"},
+        503: {"description": "Worker overloaded or draining - retry after the Retry-After header"},
         500: {"description": "Internal server error"}
     }
 )
 async def generate_forecast(
     request: ForecastRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ) -> ForecastTaskResponse:
     """
@@ -74,6 +102,9 @@ async def generate_forecast(
     Returns task ID for tracking progress.
     """
     service = ForecastService(db)
+
+    # Reject before touching the database when the worker is overloaded
+    _admit("interactive")
     
     try:
         # Validate location exists
@@ -81,17 +112,15 @@ async def generate_forecast(
         if not location_valid:
             raise HTTPException(status_code=404, detail="Location not found")
         
-        # Queue forecast generation task
+        # Queue on the interactive lane of the job scheduler
+        client_ids = await service.get_location_client_ids([request.location_id])
         task_id = await service.queue_forecast_generation(
             location_id=request.location_id,
             horizon_hours=request.horizon_hours,
-            model_type=request.model_type
-        )
-        
-        # Add background task for async processing
-        background_tasks.add_task(
-            service.process_forecast_task,
-            task_id=task_id
+            model_type=request.model_type,
+            priority="interactive",
+            client_id=client_ids.get(request.location_id),
+            resolution=request.resolution
         )
         
         return ForecastTaskResponse(
@@ -161,6 +190,71 @@ async def get_forecast_task_status(
     return task_status
 
 
+def _format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Serialize one Server-Sent Event frame (heartbeats become SSE comments)"""
+    if event == "heartbeat":
+        return ": keep-alive\n\n"
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _task_event_stream(service: ForecastService, task_ids: List[str]) -> StreamingResponse:
+    """Wrap the service event generator in an SSE response"""
+    async def event_source():
+        async for event, data in service.stream_task_events(task_ids):
+            yield _format_sse(event, data)
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+@router.get(
+    "/task/{task_id}/events",
+    summary="Stream Forecast Task Progress",
+    description="""Server-Sent Events stream of a forecast task's progress.
+
+    Replaces polling `GET /task/{task_id}`: the connection receives an event on
+    every status/progress transition and closes after the final result.
+
+    Events:
+    - `progress`: task snapshot (same shape as the task status endpoint)
+    - `result`: final snapshot once the task is `completed` or `failed`
+    - `error`: the task ID is unknown
+    """,
+    responses={404: {"description": "Task not found"}}
+)
+async def stream_forecast_task_events(task_id: str) -> StreamingResponse:
+    """Push progress transitions for one task"""
+    if task_id not in task_manager.get_all_tasks():
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return _task_event_stream(ForecastService(db=None), [task_id])
+
+
+@router.get(
+    "/batch/{batch_id}/events",
+    summary="Stream Batch Forecast Progress",
+    description="""Server-Sent Events stream for every task of a `/batch` call.
+
+    Emits `progress` and `result` events per task (each carrying its `task_id`)
+    and a final `batch_complete` event with completed/failed counts.
+    """,
+    responses={404: {"description": "Batch not found"}}
+)
+async def stream_batch_events(batch_id: str) -> StreamingResponse:
+    """Push progress transitions for all tasks in a batch"""
+    task_ids = task_manager.get_batch_task_ids(batch_id)
+    if not task_ids:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return _task_event_stream(ForecastService(db=None), task_ids)
+
+
 @router.get(
     "/location/{location_id}",
     response_model=List[ForecastResponse],
@@ -176,6 +270,21 @@ async def get_forecast_task_status(
 
     All data is retrieved from TimescaleDB with optimized queries.
     Default time range is next 48 hours if not specified.
+    Pass `run_id` (the generating task ID) to read a specific run instead of the
+    latest one, e.g. for horizon-skill analysis. Only available in append storage
+    mode: upserts overwrite earlier runs and keep the runId of rows a re-run
+    left unchanged.
+
+    Large ranges can be paged with `limit`: when more rows exist the response
+    carries an `X-Next-Cursor` header, passed back as `cursor` for the next page.
+    For whole ranges prefer `GET /location/{location_id}/stream`.
+
+    Without `resolution` the stored rows are returned on the grid they were
+    generated on (5-minute, 15-minute or hourly; a mixed-resolution run stores
+    a fine grid followed by a coarse one). `resolution=FIVE_MINUTES` or
+    `FIFTEEN_MINUTES` returns only the stored rows on that grid.
+    `resolution=HOURLY` or `DAILY` returns bucket averages (energy is the bucket
+    total) from the TimescaleDB rollups.
     """,
     responses={
         200: {
@@ -207,12 +316,18 @@ async def get_forecast_task_status(
 )
 async def get_location_forecasts(
     location_id: str,  # String UUID for database consistency
+    response: Response,
     start_time: Optional[datetime] = None,
     end_time: Optional[datetime] = None,
     model_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=settings.FORECAST_PAGE_MAX_ROWS),
+    cursor: Optional[str] = None,
+    resolution: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ) -> List[ForecastResponse]:
     """Get forecasts for a specific location from TimescaleDB"""
+    _check_run_id(run_id)
     service = ForecastService(db)
 
     try:
@@ -227,12 +342,36 @@ async def get_location_forecasts(
         if not end_time:
             end_time = start_time + timedelta(hours=48)
 
-        forecasts = await service.get_forecasts(
-            location_id=location_id,
-            start_time=start_time,
-            end_time=end_time,
-            model_type=model_type
-        )
+        if limit is not None or cursor:
+            forecasts, next_cursor = await service.get_forecasts_page(
+                location_id=location_id,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit or settings.FORECAST_PAGE_MAX_ROWS,
+                cursor=cursor,
+                model_type=model_type,
+                run_id=run_id,
+                resolution=resolution
+            )
+            if next_cursor:
+                response.headers["X-Next-Cursor"] = next_cursor
+        elif resolution:
+            forecasts = await service.get_forecasts_at_resolution(
+                location_id=location_id,
+                start_time=start_time,
+                end_time=end_time,
+                resolution=resolution,
+                model_type=model_type,
+                run_id=run_id
+            )
+        else:
+            forecasts = await service.get_forecasts(
+                location_id=location_id,
+                start_time=start_time,
+                end_time=end_time,
+                model_type=model_type,
+                run_id=run_id
+            )
 
         # Validate capacity constraints in response
         for forecast in forecasts:
@@ -252,6 +391,188 @@ async def get_location_forecasts(
         raise HTTPException(status_code=500, detail="Error retrieving forecasts")
 
 
+@router.get(
+    "/location/{location_id}/stream",
+    summary="Stream Location Forecasts",
+    description="""Stream a location's forecasts as NDJSON (one JSON object per line).
+
+    Same filters and row shape as `GET /location/{location_id}`, but rows are
+    read from a server-side cursor and written as they arrive, so memory stays
+    flat for ranges of any size (e.g. months of 15-minute history).
+    Default time range is next 48 hours if not specified.
+    """,
+    responses={
+        200: {"description": "NDJSON stream of forecasts", "content": {"application/x-ndjson": {}}},
+        404: {"description": "Location not found"}
+    }
+)
+async def stream_location_forecasts(
+    location_id: str,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    model_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """Stream forecasts of a location in timestamp order"""
+    _check_run_id(run_id)
+    if not await ForecastService(db).validate_location(location_id):
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    if not start_time:
+        start_time = datetime.utcnow()
+    if not end_time:
+        end_time = start_time + timedelta(hours=48)
+
+    async def lines():
+        async for forecast in stream_forecasts(location_id, start_time, end_time, model_type, run_id):
+            yield json.dumps(forecast, default=_json_default) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _check_run_id(run_id: Optional[str]) -> None:
+    """Reject run_id reads unless every run keeps its own rows (append storage)"""
+    if run_id and settings.FORECAST_STORAGE_MODE != "append":
+        raise HTTPException(
+            status_code=400,
+            detail="run_id reads require FORECAST_STORAGE_MODE=append; upserted rows only hold the latest run"
+        )
+
+
+def _json_default(value: Any) -> Any:
+    """ISO timestamps in NDJSON rows, matching the JSON endpoints"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+@router.get(
+    "/location/{location_id}/export",
+    summary="Export Location Forecasts or Production",
+    description="""Stream a range as Arrow IPC (`format=arrow`) or Parquet (`format=parquet`).
+
+    Intended for analytics pulls of long histories: columns are fetched from
+    the database as arrays and written as record batches / row groups without
+    building per-row JSON.
+
+    - `dataset`: `forecasts` (latest run, or `run_id`) or `production`
+    - `columns`: comma-separated projection (`time` is always included)
+    - `compression`: `zstd`/`lz4`/`none` for Arrow; also `snappy`/`gzip`/`brotli` for Parquet
+    Default time range is next 48 hours if not specified.
+    """,
+    responses={
+        200: {"description": "Encoded export stream"},
+        400: {"description": "Invalid export options"},
+        404: {"description": "Location not found"},
+        501: {"description": "pyarrow is not installed on this worker"}
+    }
+)
+async def export_location_data(
+    location_id: str,
+    dataset: str = "forecasts",
+    format: str = "arrow",
+    compression: str = "zstd",
+    columns: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    model_type: Optional[str] = None,
+    run_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+) -> StreamingResponse:
+    """Stream a columnar export of a location's forecasts or production"""
+    _check_run_id(run_id)
+    if not ARROW_AVAILABLE:
+        raise HTTPException(status_code=501, detail="Columnar export requires pyarrow")
+
+    try:
+        projected = resolve_export_columns(
+            dataset, format, compression,
+            [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if not await ForecastService(db).validate_location(location_id):
+        raise HTTPException(status_code=404, detail="Location not found")
+
+    if not start_time:
+        start_time = datetime.utcnow()
+    if not end_time:
+        end_time = start_time + timedelta(hours=48)
+
+    extension = "arrows" if format == "arrow" else "parquet"
+    return StreamingResponse(
+        export_range(
+            dataset, location_id, start_time, end_time, projected,
+            fmt=format, compression=compression, model_type=model_type, run_id=run_id
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}-{location_id}.{extension}"'}
+    )
+
+
+@router.post(
+    "/locations/query",
+    response_model=BulkForecastResponse,
+    summary="Get Forecasts For Many Locations",
+    description="""Retrieve forecasts for a set of locations in one round trip.
+
+    Intended for portfolio views and dashboards that would otherwise call
+    `GET /location/{id}` once per plant. All locations are read with a single
+    query and returned as compact column arrays keyed by location ID.
+    Locations without forecasts in the range are omitted.
+    Default time range is next 48 hours if not specified.
+    """,
+    responses={
+        200: {
+            "description": "Forecasts retrieved successfully",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "start_time": "2025-09-14T00:00:00",
+                        "end_time": "2025-09-16T00:00:00",
+                        "locations": {
+                            "363019d2-5c56-402c-8c32-202786d252ca": {
+                                "time": ["2025-09-14T12:00:00", "2025-09-14T12:15:00"],
+                                "power_output_mw": [0.85, 0.87],
+                                "capacity_factor": [0.85, 0.87],
+                                "power_mw_q10": [0.75, 0.77],
+                                "power_mw_q25": [0.80, 0.82],
+                                "power_mw_q75": [0.90, 0.92],
+                                "power_mw_q90": [0.95, 0.97]
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        500: {"description": "Error retrieving forecasts"}
+    }
+)
+async def get_forecasts_for_locations(
+    request: BulkForecastRequest,
+    db: AsyncSession = Depends(get_db)
+) -> BulkForecastResponse:
+    """Get columnar forecasts for many locations with one query"""
+    service = ForecastService(db)
+
+    start_time = request.start_time or datetime.utcnow()
+    end_time = request.end_time or start_time + timedelta(hours=48)
+
+    try:
+        locations = await service.get_forecasts_bulk(
+            location_ids=request.location_ids,
+            start_time=start_time,
+            end_time=end_time,
+            model_type=request.model_type
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Error retrieving forecasts")
+
+    return BulkForecastResponse(start_time=start_time, end_time=end_time, locations=locations)
+
+
 # Accuracy endpoint removed - now handled by SvelteKit shared utilities
 # Use /api/forecasts/accuracy in SvelteKit instead
 
@@ -267,8 +588,14 @@ async def get_location_forecasts(
     - Uses same horizon period for all locations
     - Returns individual task IDs for tracking
     - Handles failures gracefully per location
+    - All tasks share a `batch_id`; stream progress via `/batch/{batch_id}/events`
+    - Runs on the `scheduled` lane by default (`backfill` for history re-runs),
+      so interactive `/generate` requests are served first
 
     Maximum recommended batch size: 10 locations
+
+    Returns 429 (queue full) or 503 (DB pool saturated) with a Retry-After
+    header when the worker cannot take the batch.
     """,
     responses={
         200: {
@@ -296,31 +623,38 @@ async def get_location_forecasts(
 )
 async def generate_batch_forecasts(
     location_ids: List[str],  # String UUIDs
-    background_tasks: BackgroundTasks,
     horizon_hours: int = 48,
+    priority: str = "scheduled",
     db: AsyncSession = Depends(get_db)
 ) -> List[ForecastTaskResponse]:
     """Generate forecasts for multiple locations in parallel"""
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {PRIORITY_CLASSES}")
+
+    # The whole batch is admitted or rejected - no partially queued batches
+    _admit(priority, len(location_ids))
+
     service = ForecastService(db)
+    batch_id = str(uuid.uuid4())
+    client_ids = await service.get_location_client_ids(location_ids)
     
     tasks = []
     for location_id in location_ids:
         try:
             task_id = await service.queue_forecast_generation(
                 location_id=location_id,
-                horizon_hours=horizon_hours
-            )
-            
-            background_tasks.add_task(
-                service.process_forecast_task,
-                task_id=task_id
+                horizon_hours=horizon_hours,
+                batch_id=batch_id,
+                priority=priority,
+                client_id=client_ids.get(location_id)
             )
             
             tasks.append(ForecastTaskResponse(
                 task_id=task_id,
                 status="queued",
                 location_id=location_id,
-                estimated_time_seconds=30
+                estimated_time_seconds=30,
+                batch_id=batch_id
             ))
         except Exception as e:
             tasks.append(ForecastTaskResponse(
@@ -379,6 +713,92 @@ async def delete_location_forecasts(
     }
 
 
+@router.post(
+    "/weather/synced",
+    summary="Weather Sync Completed Callback",
+    description="""Webhook for SvelteKit to call once a weather sync has stored its rows.
+
+    Wakes forecasts waiting on the sync immediately (instead of them polling
+    `/api/weather/status`) and drops the locations' cached weather windows.
+    When `WEATHER_SYNC_WEBHOOK_TOKEN` is set the call must carry it in `X-Webhook-Token`.
+    """,
+    responses={401: {"description": "Invalid webhook token"}}
+)
+async def weather_sync_completed(
+    notification: WeatherSyncNotification,
+    x_webhook_token: Optional[str] = Header(None)
+) -> dict:
+    """Record weather sync completions"""
+    if settings.WEATHER_SYNC_WEBHOOK_TOKEN and x_webhook_token != settings.WEATHER_SYNC_WEBHOOK_TOKEN:
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+
+    woken = weather_sync_events.notify(notification.location_ids, from_webhook=True)
+    return {"locations": len(set(notification.location_ids)), "waiters_woken": woken}
+
+
+@router.get(
+    "/retention/report",
+    summary="Retention Dry-Run Report",
+    description="""Report what retention and compression would reclaim, without changing data.
+
+    Per table (forecasts, weather_data, and forecast_runs in append storage):
+    - `droppable_chunks` / `droppable_bytes`: whole chunks past retention, removed with `drop_chunks`
+    - `partial_rows`: rows past retention in the chunk straddling the cutoff (batched deletes)
+    - `compressible_chunks` / `compressible_bytes`: uncompressed chunks older than `COMPRESS_AFTER_DAYS`
+    - `estimated_compression_savings_bytes`: from the ratio of chunks compressed so far
+    """
+)
+async def get_retention_report() -> Dict[str, Any]:
+    """Dry-run retention report"""
+    try:
+        return await storage_maintenance.run(dry_run=True)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building retention report: {e}")
+
+
+@router.post(
+    "/retention/run",
+    summary="Apply Retention Now",
+    description="""Drop chunks and delete rows past retention immediately.
+
+    Runs the same job as the periodic retention loop (`RETENTION_ENABLED`) and
+    returns its report. ⚠️ This operation is irreversible.
+    """
+)
+async def run_retention() -> Dict[str, Any]:
+    """Apply retention once"""
+    try:
+        return await storage_maintenance.run(dry_run=False)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Retention run failed: {e}")
+
+
+@router.delete(
+    "/location/{location_id}/config-cache",
+    summary="Invalidate Cached Location Config",
+    description="""Drop the cached configuration of a location.
+
+    Location configs are cached and re-validated against `updatedAt`; call this
+    after changes that do not touch `updatedAt` so the next forecast reloads it.
+    """
+)
+async def invalidate_location_config(location_id: str) -> dict:
+    """Invalidate one location's cached config"""
+    return {
+        "location_id": location_id,
+        "invalidated": location_cache.invalidate(location_id)
+    }
+
+
+@router.delete(
+    "/config-cache",
+    summary="Invalidate All Cached Location Configs"
+)
+async def invalidate_all_location_configs() -> dict:
+    """Invalidate every cached location config"""
+    return {"invalidated": location_cache.invalidate()}
+
+
 # Training data endpoint removed - business logic moved to SvelteKit
 # Use SvelteKit API for data extraction and formatting
 
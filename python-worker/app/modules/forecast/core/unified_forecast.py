@@ -33,6 +33,13 @@ from .shoulders_enhancement import enhance_forecast_shoulders
 from .performance_adjustment import apply_performance_adjustments
 from .feature_engineering import prepare_ml_features, select_features_for_model
 from .forecast_models import load_model, predict_with_uncertainty, create_ensemble_forecast
+from ..utils.time_resolution import (
+    is_on_grid,
+    mixed_resolution_segments,
+    resample_forecast,
+    resample_weather,
+    resolution_frequency
+)
 # Local utility for path resolution
 from pathlib import Path
 
@@ -52,7 +59,8 @@ def run_unified_forecast(
     weather_data: pd.DataFrame,
     config: Dict[str, Any],
     forecast_type: str = "hybrid",
-    client_id: Optional[str] = None
+    client_id: Optional[str] = None,
+    target_resolution: Optional[str] = None
 ) -> pd.DataFrame:
     """
     PURPOSE: SINGLE unified forecasting function for ALL scenarios
@@ -69,6 +77,9 @@ def run_unified_forecast(
     - config: Client configuration with location, plant, performance settings
     - forecast_type: "physics", "ml", or "hybrid" (default: "hybrid")
     - client_id: Optional client identifier for loading ML models
+    - target_resolution: Optional ResolutionType name (FIVE_MINUTES, FIFTEEN_MINUTES,
+      HOURLY). Weather is resampled onto that grid only if it is not already on it,
+      and the output is guaranteed to be on it. None keeps the weather timestamps.
 
     OUTPUT:
     - pd.DataFrame with standardized forecast columns:
@@ -114,6 +125,22 @@ def run_unified_forecast(
         raise ValueError(f"forecast_type must be 'physics', 'ml', or 'hybrid', got: {forecast_type}")
     #%% INPUT_VALIDATION END
 
+    #%% TARGET_RESOLUTION
+    """
+    PURPOSE: Put weather on the requested output grid before any modelling
+    INPUT: weather_data and target_resolution
+    OUTPUT: Weather data on the target grid (unchanged when already on it)
+    ROLE: The engine computes every step at the output resolution, so its
+    result needs no second resampling pass
+    """
+    target_freq = resolution_frequency(target_resolution) if target_resolution else None
+    if target_freq and not is_on_grid(weather_data.index, target_freq):
+        logger.info(f"Resampling weather to {target_freq} grid")
+        weather_data = resample_weather(weather_data, target_freq)
+        if weather_data.empty:
+            raise ValueError(f"Weather data does not span a single {target_freq} interval")
+    #%% TARGET_RESOLUTION END
+
     #%% PVLIB_INITIALIZATION
     """
     PURPOSE: Create PVLIB location and system objects from configuration
@@ -220,6 +247,11 @@ def run_unified_forecast(
     adjusted_forecast = _apply_capacity_constraints(adjusted_forecast, plant_capacity_kw)
     #%% CAPACITY_CONSTRAINTS END
 
+    # Steps that drop or shift rows must not break the output grid guarantee
+    if target_freq and not is_on_grid(adjusted_forecast.index, target_freq):
+        logger.warning(f"Forecast left the {target_freq} grid, resampling output")
+        adjusted_forecast = resample_forecast(adjusted_forecast, target_freq)
+
     logger.info(f"✅ Unified forecast complete: {len(adjusted_forecast)} records, "
                f"peak {adjusted_forecast['prediction'].max():.3f} MW")
 
@@ -227,6 +259,54 @@ def run_unified_forecast(
 #%% UNIFIED_FORECAST_MAIN END
 
 
+#%% MIXED_RESOLUTION_FORECAST
+def run_mixed_resolution_forecast(
+    weather_data: pd.DataFrame,
+    config: Dict[str, Any],
+    forecast_type: str = "hybrid",
+    client_id: Optional[str] = None,
+    fine_resolution: str = "FIFTEEN_MINUTES",
+    coarse_resolution: str = "HOURLY",
+    cutover_hours: float = 48
+) -> pd.DataFrame:
+    """
+    PURPOSE: Forecast at fine resolution up to a cut-over horizon and coarse after it
+
+    INPUT:
+    - weather_data, config, forecast_type, client_id: as for run_unified_forecast
+    - fine_resolution / coarse_resolution: ResolutionType names of the two grids
+    - cutover_hours: Horizon (from the first weather timestamp) where the coarse grid starts
+
+    OUTPUT: Forecast DataFrame with a 'resolution' column naming each row's grid
+
+    ROLE: Week-ahead runs only need hourly values after the first days, so the
+    engine is run once per segment on a uniform grid (shoulder smoothing and
+    ML features assume uniform spacing) instead of on the fine grid throughout
+    """
+    segments = []
+    for resolution, segment_weather, start, end in mixed_resolution_segments(
+        weather_data, fine_resolution, coarse_resolution, cutover_hours
+    ):
+        forecast = run_unified_forecast(
+            segment_weather,
+            config,
+            forecast_type=forecast_type,
+            client_id=client_id,
+            target_resolution=resolution
+        )
+        forecast = forecast[(forecast.index >= start) & (forecast.index < end)].copy()
+        forecast['resolution'] = resolution
+        segments.append(forecast)
+
+    logger.info(
+        "Mixed-resolution forecast: "
+        + ", ".join(f"{len(segment)} {segment['resolution'].iloc[0]}" for segment in segments if len(segment))
+        + " points"
+    )
+    return pd.concat(segments)
+#%% MIXED_RESOLUTION_FORECAST END
+
+
 #%% PHYSICS_FORECAST_CREATION
 def _create_physics_forecast(enhanced_forecast: pd.DataFrame) -> pd.DataFrame:
     """
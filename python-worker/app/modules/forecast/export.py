@@ -0,0 +1,192 @@
+"""Arrow IPC / Parquet export of forecast and production ranges"""
+
+from typing import AsyncIterator, List, Optional
+from datetime import datetime
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from .repositories import (
+    ForecastRepository,
+    FORECAST_EXPORT_COLUMNS,
+    PRODUCTION_EXPORT_COLUMNS
+)
+
+# pyarrow is optional (pip install solar-forecast-worker[export])
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DATASETS = {
+    "forecasts": FORECAST_EXPORT_COLUMNS,
+    "production": PRODUCTION_EXPORT_COLUMNS
+}
+
+EXPORT_MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+# Arrow IPC only supports buffer compression with lz4/zstd
+EXPORT_COMPRESSION = {
+    "arrow": {"none", "lz4", "zstd"},
+    "parquet": {"none", "snappy", "gzip", "zstd", "lz4", "brotli"}
+}
+
+# Columns not listed here are float64
+_STRING_COLUMNS = {"model_type", "model_version"}
+_INTEGER_COLUMNS = {"horizon_minutes"}
+
+
+def resolve_export_columns(
+    dataset: str,
+    fmt: str,
+    compression: str,
+    columns: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Validate export options and return the projected column names.
+
+    `time` is always exported first since pages are cut on it. Raises ValueError
+    for unknown datasets, formats, compressions or columns.
+    """
+    if dataset not in EXPORT_DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}', expected one of {sorted(EXPORT_DATASETS)}")
+    if fmt not in EXPORT_MEDIA_TYPES:
+        raise ValueError(f"Unknown format '{fmt}', expected one of {sorted(EXPORT_MEDIA_TYPES)}")
+    if compression not in EXPORT_COMPRESSION[fmt]:
+        raise ValueError(
+            f"Compression '{compression}' not supported for {fmt}, "
+            f"expected one of {sorted(EXPORT_COMPRESSION[fmt])}"
+        )
+
+    available = EXPORT_DATASETS[dataset]
+    if not columns:
+        return list(available)
+
+    unknown = [name for name in columns if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown {dataset} columns: {', '.join(unknown)}")
+
+    return ["time"] + [name for name in dict.fromkeys(columns) if name != "time"]
+
+
+def export_schema(columns: List[str]) -> "pa.Schema":
+    """Arrow schema of projected export columns"""
+    fields = []
+    for name in columns:
+        if name == "time":
+            arrow_type = pa.timestamp("us")
+        elif name in _STRING_COLUMNS:
+            arrow_type = pa.string()
+        elif name in _INTEGER_COLUMNS:
+            arrow_type = pa.int32()
+        else:
+            arrow_type = pa.float64()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class _ChunkSink:
+    """Write-only file object whose bytes are handed out after every batch"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+async def export_range(
+    dataset: str,
+    location_id: str,
+    start_time: datetime,
+    end_time: datetime,
+    columns: List[str],
+    fmt: str = "arrow",
+    compression: str = "zstd",
+    model_type: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export of a range, yielded one record batch / row group at a time.
+
+    Rows are fetched in EXPORT_CHUNK_ROWS keyset slices as column arrays and
+    turned straight into Arrow arrays. Uses its own session because the
+    streamed response outlives the request-scoped one.
+    """
+    schema = export_schema(columns)
+    sink = _ChunkSink()
+    codec = None if compression == "none" else compression
+
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression=codec or "none")
+    else:
+        writer = pa_ipc.new_stream(sink, schema, options=pa_ipc.IpcWriteOptions(compression=codec))
+
+    after = None
+    total = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            repo = ForecastRepository(db)
+            while True:
+                if dataset == "production":
+                    chunk = await repo.get_production_columns(
+                        location_id, start_time, end_time, columns,
+                        after=after, limit=settings.EXPORT_CHUNK_ROWS
+                    )
+                else:
+                    chunk = await repo.get_forecast_columns(
+                        location_id, start_time, end_time, columns,
+                        model_type=model_type, run_id=run_id,
+                        after=after, limit=settings.EXPORT_CHUNK_ROWS
+                    )
+
+                count = len(chunk["time"])
+                if count == 0:
+                    break
+
+                batch = pa.record_batch(
+                    [pa.array(chunk[field.name], type=field.type) for field in schema],
+                    schema=schema
+                )
+                writer.write_batch(batch)
+                total += count
+                yield sink.drain()
+
+                if count < settings.EXPORT_CHUNK_ROWS:
+                    break
+                after = chunk["time"][-1]
+    finally:
+        writer.close()
+
+    # Parquet footer / Arrow end-of-stream marker
+    tail = sink.drain()
+    if tail:
+        yield tail
+
+    logger.info(f"Exported {total} {dataset} rows for location {location_id} as {fmt}")
@@ -0,0 +1,140 @@
+"""Fingerprints of last-written forecast values, used to skip unchanged upserts"""
+
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from datetime import datetime, timedelta
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Numeric values that decide whether a re-run changed a row (compared within
+# FORECAST_UNCHANGED_TOLERANCE_MW); together with the labels below these are
+# every column an upsert updates except runId
+FINGERPRINT_COLUMNS = [
+    "powerMW", "powerOutputMW", "energyMWh", "capacityFactor",
+    "powerMWQ10", "powerMWQ25", "powerMWQ75", "powerMWQ90", "horizonMinutes",
+    "temperature", "ghi", "dni", "cloudCover", "windSpeed", "qualityScore"
+]
+# Non-numeric values, compared for equality. resolution relabels rows a
+# mixed-resolution run moves to the other grid even when their power is unchanged
+FINGERPRINT_LABEL_COLUMNS = ["modelType", "modelVersion", "resolution"]
+
+
+class ForecastFingerprintCache:
+    """
+    Per-location row values as last committed by this worker.
+
+    Hourly re-runs usually reproduce the far horizon exactly; rows whose values
+    are within FORECAST_UNCHANGED_TOLERANCE_MW of the cached fingerprint are not
+    sent to the ON CONFLICT upsert at all. Entries expire after
+    FORECAST_FINGERPRINT_TTL_SECONDS so writes from other replicas cannot keep a
+    stale fingerprint alive indefinitely.
+    """
+
+    def __init__(self):
+        # location_id -> (stored_at monotonic, DataFrame indexed by timestamp)
+        self._locations: "OrderedDict[str, Tuple[float, pd.DataFrame]]" = OrderedDict()
+
+    def split_unchanged(self, columns: Dict[str, list]) -> Tuple[Dict[str, list], int]:
+        """Drop rows matching the cached fingerprint; returns (rows to write, unchanged count)"""
+        if not self._enabled() or not columns:
+            return columns, 0
+
+        frame = _fingerprint_frame(columns)
+        keep = np.ones(len(frame), dtype=bool)
+
+        for location_id, rows in frame.groupby("locationId", sort=False):
+            cached = self._get(location_id)
+            if cached is None:
+                continue
+
+            previous = cached.reindex(rows["timestamp"])
+            same = np.isclose(
+                rows[FINGERPRINT_COLUMNS].to_numpy(float),
+                previous[FINGERPRINT_COLUMNS].to_numpy(float),
+                rtol=0, atol=settings.FORECAST_UNCHANGED_TOLERANCE_MW, equal_nan=True
+            ).all(axis=1)
+            # Timestamps missing from the cache reindex to NaN labels and never match
+            same &= (
+                rows[FINGERPRINT_LABEL_COLUMNS].to_numpy(object) == previous[FINGERPRINT_LABEL_COLUMNS].to_numpy(object)
+            ).all(axis=1)
+            keep[rows.index[same]] = False
+
+        unchanged = int((~keep).sum())
+        if unchanged == 0:
+            return columns, 0
+
+        positions = np.flatnonzero(keep)
+        return {name: [values[i] for i in positions] for name, values in columns.items()}, unchanged
+
+    def remember(self, columns: Dict[str, list]) -> None:
+        """Record values after they were committed"""
+        if not self._enabled() or not columns or not columns["id"]:
+            return
+
+        frame = _fingerprint_frame(columns)
+        horizon_start = datetime.utcnow() - timedelta(seconds=settings.FORECAST_FINGERPRINT_TTL_SECONDS)
+
+        for location_id, rows in frame.groupby("locationId", sort=False):
+            latest = rows.set_index("timestamp")[FINGERPRINT_COLUMNS + FINGERPRINT_LABEL_COLUMNS]
+            cached = self._get(location_id)
+            if cached is not None:
+                latest = pd.concat([cached, latest])
+                latest = latest[~latest.index.duplicated(keep="last")]
+            # Timestamps long in the past are not re-forecast; keep the cache bounded
+            latest = latest[latest.index >= horizon_start]
+
+            self._locations[location_id] = (time.monotonic(), latest)
+            self._locations.move_to_end(location_id)
+
+        while len(self._locations) > settings.FORECAST_FINGERPRINT_MAX_LOCATIONS:
+            self._locations.popitem(last=False)
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        """Forget one location (or all) so its next save writes every row"""
+        if location_id is None:
+            self._locations.clear()
+        else:
+            self._locations.pop(location_id, None)
+
+    def _enabled(self) -> bool:
+        # Append-only runs keep every row of every run, so nothing is skipped
+        return settings.FORECAST_SKIP_UNCHANGED and settings.FORECAST_STORAGE_MODE != "append"
+
+    def _get(self, location_id: str) -> Optional[pd.DataFrame]:
+        entry = self._locations.get(location_id)
+        if entry is None:
+            return None
+
+        stored_at, values = entry
+        if time.monotonic() - stored_at > settings.FORECAST_FINGERPRINT_TTL_SECONDS:
+            self._locations.pop(location_id, None)
+            return None
+
+        self._locations.move_to_end(location_id)
+        return values
+
+
+def _fingerprint_frame(columns: Dict[str, list]) -> pd.DataFrame:
+    """locationId, timestamp and fingerprint values (numeric NULL -> NaN) on a positional index"""
+    count = len(columns["id"])
+    frame = pd.DataFrame({
+        "locationId": columns["locationId"],
+        "timestamp": pd.to_datetime(columns["timestamp"])
+    })
+    for name in FINGERPRINT_COLUMNS:
+        values = columns.get(name, [None] * count)
+        frame[name] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").astype(float)
+    for name in FINGERPRINT_LABEL_COLUMNS:
+        frame[name] = pd.Series(columns.get(name, [None] * count), dtype=object)
+    return frame
+
+
+# Global instance
+forecast_fingerprints = ForecastFingerprintCache()
@@ -0,0 +1,99 @@
+"""TTL + LRU cache of parsed location rows and their forecast configs"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from datetime import datetime
+import asyncio
+import copy
+import logging
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# load(location_id) -> (location dict, forecast config) or None if unknown
+LocationLoad = Callable[[str], Awaitable[Optional[Tuple[Dict[str, Any], Dict[str, Any]]]]]
+# updated_at(location_id) -> locations."updatedAt" or None if unknown
+LocationVersion = Callable[[str], Awaitable[Optional[datetime]]]
+
+
+@dataclass
+class _Entry:
+    location: Dict[str, Any]
+    config: Dict[str, Any]
+    updated_at: Optional[datetime]
+    loaded_at: float   # monotonic time of the full load
+    checked_at: float  # monotonic time of the last updatedAt check
+
+
+class LocationConfigCache:
+    """
+    Shares one parsed location + config between /generate validation and the
+    forecast task instead of re-reading and re-parsing the JSON columns.
+
+    - Younger than LOCATION_CACHE_CHECK_SECONDS since the last check: served as is.
+    - Older: a single-column "updatedAt" lookup decides whether to reload.
+    - Older than LOCATION_CACHE_TTL_SECONDS: always reloaded.
+    Callers get deep copies, so the forecast engine may mutate its config freely.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(
+        self,
+        location_id: str,
+        load: LocationLoad,
+        updated_at: LocationVersion
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """(location, config) for a location, or None when it does not exist"""
+        lock = self._locks.setdefault(location_id, asyncio.Lock())
+        async with lock:
+            entry = await self._current_entry(location_id, updated_at)
+
+            if entry is None:
+                loaded = await load(location_id)
+                if loaded is None:
+                    return None
+                location, config = loaded
+                now = time.monotonic()
+                entry = _Entry(location, config, location.get("updatedAt"), now, now)
+
+            self._entries[location_id] = entry
+            self._entries.move_to_end(location_id)
+            while len(self._entries) > settings.LOCATION_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+            return copy.deepcopy(entry.location), copy.deepcopy(entry.config)
+
+    def invalidate(self, location_id: Optional[str] = None) -> int:
+        """Drop one location (or all); returns the number of entries removed"""
+        if location_id is None:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+        return 1 if self._entries.pop(location_id, None) else 0
+
+    async def _current_entry(self, location_id: str, updated_at: LocationVersion) -> Optional[_Entry]:
+        entry = self._entries.get(location_id)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        if now - entry.loaded_at > settings.LOCATION_CACHE_TTL_SECONDS:
+            return None
+
+        if now - entry.checked_at > settings.LOCATION_CACHE_CHECK_SECONDS:
+            if await updated_at(location_id) != entry.updated_at:
+                logger.info(f"Location {location_id} changed, reloading configuration")
+                return None
+            entry.checked_at = now
+
+        return entry
+
+
+# Global instance
+location_cache = LocationConfigCache()
@@ -10,6 +10,7 @@ class ForecastRequest(BaseModel):
     location_id: str = Field(..., description="Location UUID from the locations table")
     horizon_hours: int = Field(48, description="Forecast horizon in hours (1-168, default: 48)", ge=1, le=168)
     model_type: str = Field("PHYSICS", description="Model type - Options: PHYSICS (physics-based PVLIB calculations), ML_ENSEMBLE (machine learning ensemble), HYBRID (combines ML and physics)", enum=["PHYSICS", "ML_ENSEMBLE", "HYBRID"])
+    resolution: Optional[str] = Field(None, description="Output resolution - Options: FIVE_MINUTES, FIFTEEN_MINUTES, HOURLY (default: FORECAST_RESOLUTION setting)", enum=["FIVE_MINUTES", "FIFTEEN_MINUTES", "HOURLY"])
 
     class Config:
         json_schema_extra = {
@@ -51,15 +52,54 @@ class ForecastResponse(BaseModel):
         from_attributes = True
 
 
+class BulkForecastRequest(BaseModel):
+    """Request model for reading forecasts of many locations at once"""
+    location_ids: List[str] = Field(..., description="Location UUIDs", min_length=1, max_length=1000)
+    start_time: Optional[datetime] = Field(None, description="Range start (UTC, default: now)")
+    end_time: Optional[datetime] = Field(None, description="Range end (UTC, default: start + 48h)")
+    model_type: Optional[str] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "location_ids": [
+                    "363019d2-5c56-402c-8c32-202786d252ca",
+                    "7a1f0c2e-8b4d-4e6a-9c3b-2d5e8f1a0b7c"
+                ],
+                "start_time": "2025-09-14T00:00:00",
+                "end_time": "2025-09-16T00:00:00"
+            }
+        }
+
+
+class ForecastSeries(BaseModel):
+    """Columnar forecast series for one location (all lists share one index)"""
+    time: List[datetime]
+    power_output_mw: List[float]
+    capacity_factor: List[Optional[float]]
+    power_mw_q10: List[Optional[float]]
+    power_mw_q25: List[Optional[float]]
+    power_mw_q75: List[Optional[float]]
+    power_mw_q90: List[Optional[float]]
+
+
+class BulkForecastResponse(BaseModel):
+    """Columnar forecasts keyed by location (locations without data are omitted)"""
+    start_time: datetime
+    end_time: datetime
+    locations: Dict[str, ForecastSeries]
+
+
 class ForecastTaskResponse(BaseModel):
     """Response model for forecast task status"""
     task_id: str
-    status: str = Field(..., description="Task status: queued, processing, completed, failed")
+    status: str = Field(..., description="Task status: queued, processing, completed, failed, cancelled")
     location_id: str  # String UUID
     progress: Optional[int] = Field(0, description="Progress percentage (0-100)")
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     estimated_time_seconds: Optional[int] = None
+    batch_id: Optional[str] = Field(None, description="Batch ID when queued through /batch")
     
     class Config:
         json_schema_extra = {
@@ -94,4 +134,8 @@ class ForecastAccuracyResponse(BaseModel):
                 "period_days": 7,
                 "model_type": "ML"
             }
-        }
\ No newline at end of file
+        }
+
+class WeatherSyncNotification(BaseModel):
+    """Webhook payload sent by SvelteKit once weather rows are stored"""
+    location_ids: List[str] = Field(..., description="Locations whose weather sync completed", min_length=1)
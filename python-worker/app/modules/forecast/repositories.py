@@ -1,22 +1,155 @@
 """Forecast repository - data access layer"""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, and_, text
 from sqlalchemy.sql import func
+import asyncio
 import json
+import numpy as np
 import pandas as pd
 from uuid import uuid4
 from datetime import datetime
 import logging
+import time
+
+from app.core.circuit_breaker import sveltekit_weather_breaker, sveltekit_weather_latency
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.http_client import http_client
+from app.core.metrics import WEATHER_READ_RESULTS, WEATHER_READ_SECONDS
+from .fingerprints import FINGERPRINT_COLUMNS, FINGERPRINT_LABEL_COLUMNS, forecast_fingerprints
+from .weather_cache import weather_cache
+from .weather_stream import decode_weather_json, decode_weather_ndjson
 
 logger = logging.getLogger(__name__)
 
 
+# Weather columns in the order _fetch_weather_frame selects them (PVLIB names)
+WEATHER_COLUMNS = ['temp_air', 'humidity', 'wind_speed', 'cloud_cover', 'ghi', 'dni', 'dhi']
+
+# Exportable columns: API name -> column expression (forecasts aliased f)
+FORECAST_EXPORT_COLUMNS = {
+    "time": "f.timestamp",
+    "power_output_mw": 'f."powerMW"',
+    "energy_mwh": 'f."energyMWh"',
+    "capacity_factor": 'f."capacityFactor"',
+    "power_mw_q10": 'f."powerMWQ10"',
+    "power_mw_q25": 'f."powerMWQ25"',
+    "power_mw_q75": 'f."powerMWQ75"',
+    "power_mw_q90": 'f."powerMWQ90"',
+    "model_type": 'f."modelType"::text',
+    "model_version": 'f."modelVersion"',
+    "horizon_minutes": 'f."horizonMinutes"',
+    "temperature": "f.temperature",
+    "ghi": "f.ghi",
+    "dni": "f.dni",
+    "cloud_cover": 'f."cloudCover"',
+    "wind_speed": 'f."windSpeed"',
+    "quality_score": 'f."qualityScore"'
+}
+
+PRODUCTION_EXPORT_COLUMNS = {
+    "time": "p.timestamp",
+    "power_output_mw": 'p."powerMW"',
+    "capacity_factor": 'p."capacityFactor"',
+    "availability": "p.availability"
+}
+
+# Read resolutions (ResolutionType names) served by time_bucket rollups
+ROLLUP_RESOLUTIONS = {"HOURLY": "1 hour", "DAILY": "1 day"}
+
+# Rollup aggregates over forecasts (aliased f); shared by the continuous
+# aggregates and the on-the-fly fallback so both return the same columns
+_FORECAST_ROLLUP_AGGREGATES = """
+    avg(f."powerMW") AS avg_power_mw,
+    sum(f."energyMWh") AS total_energy_mwh,
+    avg(f."capacityFactor") AS avg_capacity_factor,
+    avg(f."powerMWQ10") AS avg_power_mw_q10,
+    avg(f."powerMWQ25") AS avg_power_mw_q25,
+    avg(f."powerMWQ75") AS avg_power_mw_q75,
+    avg(f."powerMWQ90") AS avg_power_mw_q90,
+    avg(f.temperature) AS avg_temperature,
+    avg(f.ghi) AS avg_ghi,
+    avg(f."cloudCover") AS avg_cloud_cover,
+    avg(f."qualityScore") AS avg_quality_score,
+    count(*) AS sample_count"""
+
+_PRODUCTION_ROLLUP_AGGREGATES = """
+    avg(p."powerMW") AS avg_power_mw,
+    avg(p."capacityFactor") AS avg_capacity_factor,
+    avg(p.availability) AS avg_availability,
+    count(*) AS sample_count"""
+
+
+def _with_constant_columns(df: pd.DataFrame, constants: Dict[str, Any]) -> pd.DataFrame:
+    """Add constant columns that the frame does not already carry (no copy when all exist)"""
+    missing = {name: value for name, value in constants.items() if name not in df.columns}
+    return df.assign(**missing) if missing else df
+
+
+def _column(df: pd.DataFrame, name: str, default: Any) -> np.ndarray:
+    """Column values as an array; missing columns and values take the default"""
+    if name not in df.columns:
+        return np.full(len(df), default, dtype=object)
+    column = df[name]
+    if default is not None:
+        column = column.fillna(default)
+    return column.to_numpy()
+
+
+def _numeric(values) -> np.ndarray:
+    """Values as a float array (None and non-numeric become NaN)"""
+    return pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(float)
+
+
+def _nullable_floats(values) -> List[Optional[float]]:
+    """Floats with NaN/Inf/None mapped to None for database compatibility"""
+    numeric = _numeric(values)
+    result = numeric.astype(object)
+    result[~np.isfinite(numeric)] = None
+    return result.tolist()
+
+
+def _utc_naive(values) -> List[datetime]:
+    """Timestamps as timezone-naive UTC datetimes (naive input is assumed UTC)"""
+    index = pd.DatetimeIndex(values)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return list(index.to_pydatetime())
+
+
+
+def _forecast_row_dict(row) -> Dict[str, Any]:
+    """API dict of one forecast row selected by ForecastRepository._forecasts_range_query"""
+    return {
+        "time": row[0],  # timestamp
+        "location_id": row[1],  # locationId
+        "power_output_mw": row[2],  # powerMW
+        "energy_mwh": row[3],  # energyMWh
+        "capacity_factor": row[4],  # capacityFactor
+        "power_mw_q10": row[5],  # powerMWQ10
+        "power_mw_q25": row[6],  # powerMWQ25
+        "power_mw_q75": row[7],  # powerMWQ75
+        "power_mw_q90": row[8],  # powerMWQ90
+        "model_type": row[9],  # modelType
+        "model_version": row[10],  # modelVersion
+        "horizon_minutes": row[11],  # horizonMinutes
+        "temperature": row[12],  # temperature
+        "ghi": row[13],  # ghi
+        "dni": row[14],  # dni
+        "cloud_cover": row[15],  # cloudCover
+        "wind_speed": row[16],  # windSpeed
+        "quality_score": row[17]  # qualityScore
+    }
+
 class ForecastRepository:
     """Repository for forecast data access"""
 
+    # Continuous aggregates set up by ensure_rollups (process-wide)
+    rollup_views: set = set()
+
     def __init__(self, db: AsyncSession):
         self.db = db
 
@@ -60,99 +193,156 @@ class ForecastRepository:
         if not forecasts:
             return 0
 
-        import math
-
-        # Helper function to clean numeric values
-        def clean_numeric(val):
-            """Replace NaN and Inf values with None for database compatibility"""
-            if val is not None and isinstance(val, (float, int)):
-                if math.isnan(val) or math.isinf(val):
-                    return None
-            return val
-
-        # Convert to proper field names
-        values = []
-        skipped = 0  # Initialize skipped counter
-        for f in forecasts:
-            # Validate critical power value
-            power_mw = f.get("power_output_mw", 0)
-            if power_mw is None or (isinstance(power_mw, float) and (math.isnan(power_mw) or math.isinf(power_mw))):
-                logger.warning(f"Skipping forecast with invalid power: {power_mw} at {f.get('time')}")
-                skipped += 1
-                continue
+        df = pd.DataFrame(forecasts)
+        n = len(df)
 
-            values.append({
-                "timestamp": f["time"],  # Use primary field name
-                "locationId": f["location_id"],
-                "powerMW": clean_numeric(power_mw),  # Already validated above
-                "energyMWh": clean_numeric(f.get("energy_mwh")),
-                "confidence": clean_numeric(f.get("confidence")),
-                "modelType": f.get("model_type", "ML_ENSEMBLE"),
-                "modelVersion": f.get("model_version"),
-                "horizonMinutes": f.get("horizon_hours", 1) * 60,  # Convert to minutes
-                "temperature": clean_numeric(f.get("temperature")),
-                "ghi": clean_numeric(f.get("irradiance")),  # Correct field name
-                "cloudCover": clean_numeric(f.get("cloud_cover")),
-                "windSpeed": clean_numeric(f.get("wind_speed")),
-                "createdAt": datetime.utcnow()
-            })
+        # Validate critical power value (None/NaN/Inf rows are skipped)
+        power = _numeric(df["power_output_mw"] if "power_output_mw" in df.columns else np.zeros(n))
+        valid = np.isfinite(power)
+        skipped = int(n - valid.sum())
+        if skipped:
+            logger.warning(f"Skipping {skipped} forecasts with invalid power")
 
-        # Check if we have any valid values to insert
-        if not values:
+        if not valid.any():
             logger.warning(f"All {skipped} forecasts were invalid and skipped")
             return 0
 
-        # Use correct table name and field names
-        query = text("""
-            INSERT INTO forecasts (
-                timestamp, "locationId", "powerMW", "energyMWh",
-                confidence, "modelType", "modelVersion", "horizonMinutes",
-                temperature, ghi, "cloudCover", "windSpeed", "createdAt"
-            ) VALUES (
-                :timestamp, :locationId, :powerMW, :energyMWh,
-                :confidence, :modelType, :modelVersion, :horizonMinutes,
-                :temperature, :ghi, :cloudCover, :windSpeed, :createdAt
-            )
-            ON CONFLICT (timestamp, "locationId") DO UPDATE SET
-                "powerMW" = EXCLUDED."powerMW",
-                "energyMWh" = EXCLUDED."energyMWh",
-                confidence = EXCLUDED.confidence,
-                "modelType" = EXCLUDED."modelType",
-                "modelVersion" = EXCLUDED."modelVersion",
-                temperature = EXCLUDED.temperature,
-                ghi = EXCLUDED.ghi,
-                "cloudCover" = EXCLUDED."cloudCover",
-                "windSpeed" = EXCLUDED."windSpeed"
-        """)
+        # Last record wins for duplicate (time, location) pairs, as with row-by-row upserts
+        df = df.assign(_power=power)[valid]
+        df = df.loc[~df.duplicated(subset=["time", "location_id"], keep="last")]
+
+        horizon_hours = _numeric(_column(df, "horizon_hours", 1))
+        columns = {
+            "timestamp": _utc_naive(df["time"]),
+            "locationId": df["location_id"].tolist(),
+            "powerMW": df["_power"].tolist(),  # Already validated above
+            "energyMWh": _nullable_floats(_column(df, "energy_mwh", None)),
+            "confidence": _nullable_floats(_column(df, "confidence", None)),
+            "modelType": _column(df, "model_type", "ML_ENSEMBLE").tolist(),
+            "modelVersion": [None if pd.isna(v) else v for v in _column(df, "model_version", None)],
+            "horizonMinutes": (horizon_hours * 60).astype(int).tolist(),  # Convert to minutes
+            "temperature": _nullable_floats(_column(df, "temperature", None)),
+            "ghi": _nullable_floats(_column(df, "irradiance", None)),
+            "cloudCover": _nullable_floats(_column(df, "cloud_cover", None)),
+            "windSpeed": _nullable_floats(_column(df, "wind_speed", None)),
+            "createdAt": [datetime.utcnow()] * len(df)
+        }
 
-        for value in values:
-            await self.db.execute(query, value)
-
-        await self.db.commit()
+        saved = await self._copy_merge_forecasts(columns, update_columns=[
+            "powerMW", "energyMWh", "confidence", "modelType", "modelVersion",
+            "temperature", "ghi", "cloudCover", "windSpeed"
+        ])
 
         if skipped > 0:
-            logger.info(f"Saved {len(values)} forecasts, skipped {skipped} invalid records")
+            logger.info(f"Saved {saved} forecasts, skipped {skipped} invalid records")
+
+        return saved
 
-        return len(values)
+    async def _copy_merge_forecasts(self, columns: Dict[str, list], update_columns: List[str]) -> int:
+        """
+        Land prepared forecast columns with one COPY and one merge statement.
+
+        Rows are streamed with asyncpg COPY into a temp staging table (dropped at
+        commit), then upserted into forecasts with a single INSERT ... SELECT ...
+        ON CONFLICT instead of one round trip per row.
+        """
+        names = list(columns)
+        records = list(zip(*columns.values()))
+        column_list = ", ".join(f'"{name}"' for name in names)
+        updates = ", ".join(f'"{name}" = EXCLUDED."{name}"' for name in update_columns)
+
+        # Staging table copies the column types only (no constraints or defaults)
+        await self.db.execute(text(f"""
+            CREATE TEMP TABLE forecasts_staging ON COMMIT DROP AS
+            SELECT {column_list} FROM forecasts WITH NO DATA
+        """))
+
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "forecasts_staging", records=records, columns=names
+        )
+
+        await self.db.execute(text(f"""
+            INSERT INTO forecasts ({column_list})
+            SELECT {column_list} FROM forecasts_staging
+            ON CONFLICT (timestamp, "locationId") DO UPDATE SET {updates}
+        """))
+        await self.db.commit()
+
+        return len(records)
 
     async def get_forecasts_range(
         self,
         location_id: str,  # String UUID
         start_time: datetime,
         end_time: datetime,
-        model_type: Optional[str] = None
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        resolution: Optional[str] = None
     ) -> List[Dict]:
-        """Get forecasts within time range (using correct field names)"""
-        query_str = """
+        """
+        Get forecasts within time range (latest run, or the given run_id).
+
+        For keyset pagination pass the last timestamp of the previous page as
+        `after` together with a `limit`. `resolution` keeps only rows stored
+        on that grid (a mixed-resolution run stores two).
+        """
+        query_str, params = self._forecasts_range_query(
+            location_id, start_time, end_time, model_type, run_id, after, resolution
+        )
+
+        if limit is not None:
+            query_str += " LIMIT :limit"
+            params["limit"] = limit
+
+        result = await self.db.execute(text(query_str), params)
+        return [_forecast_row_dict(row) for row in result.fetchall()]
+
+    async def stream_forecasts_range(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """Yield forecasts in time order from a server-side cursor, FORECAST_STREAM_BATCH_ROWS at a time"""
+        query_str, params = self._forecasts_range_query(
+            location_id, start_time, end_time, model_type, run_id
+        )
+
+        result = await self.db.stream(
+            text(query_str),
+            params,
+            execution_options={"yield_per": settings.FORECAST_STREAM_BATCH_ROWS}
+        )
+        async for row in result:
+            yield _forecast_row_dict(row)
+
+    def _forecasts_range_query(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None,
+        after: Optional[datetime] = None,
+        resolution: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """SQL and parameters of a single-location range read, ordered by timestamp"""
+        query_str = f"""
             SELECT
-                timestamp, "locationId", "powerMW", "energyMWh", "capacityFactor",
-                "powerMWQ10", "powerMWQ25", "powerMWQ75", "powerMWQ90",
-                "modelType", "modelVersion", "horizonMinutes",
-                temperature, ghi, dni, "cloudCover", "windSpeed", "qualityScore"
-            FROM forecasts
-            WHERE "locationId" = :location_id
-                AND timestamp >= :start_time
-                AND timestamp <= :end_time
+                f.timestamp, f."locationId", f."powerMW", f."energyMWh", f."capacityFactor",
+                f."powerMWQ10", f."powerMWQ25", f."powerMWQ75", f."powerMWQ90",
+                f."modelType", f."modelVersion", f."horizonMinutes",
+                f.temperature, f.ghi, f.dni, f."cloudCover", f."windSpeed", f."qualityScore"
+            FROM {self._current_forecasts_source(run_id)}
+            WHERE f."locationId" = :location_id
+                AND f.timestamp >= :start_time
+                AND f.timestamp <= :end_time
         """
 
         params = {
@@ -161,54 +351,117 @@ class ForecastRepository:
             "end_time": end_time
         }
 
+        if after is not None:
+            query_str += " AND f.timestamp > :after"
+            params["after"] = after
+
+        if run_id:
+            query_str += ' AND f."runId" = :run_id'
+            params["run_id"] = run_id
+
         if model_type:
-            query_str += ' AND "modelType" = :model_type'
+            query_str += ' AND f."modelType" = :model_type'
             params["model_type"] = model_type
 
-        query_str += " ORDER BY timestamp ASC"
+        if resolution:
+            query_str += ' AND f.resolution = :resolution'
+            params["resolution"] = resolution
+
+        query_str += " ORDER BY f.timestamp ASC"
+        return query_str, params
+
+    async def get_forecasts_range_bulk(
+        self,
+        location_ids: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        model_type: Optional[str] = None
+    ) -> Dict[str, Dict[str, list]]:
+        """
+        Forecasts of many locations in one query, as column lists per location.
+
+        Rows are aggregated server-side (one array per column and location), so
+        no per-row dicts are built.
+        """
+        query_str = f"""
+            SELECT
+                f."locationId",
+                array_agg(f.timestamp ORDER BY f.timestamp),
+                array_agg(f."powerMW" ORDER BY f.timestamp),
+                array_agg(f."capacityFactor" ORDER BY f.timestamp),
+                array_agg(f."powerMWQ10" ORDER BY f.timestamp),
+                array_agg(f."powerMWQ25" ORDER BY f.timestamp),
+                array_agg(f."powerMWQ75" ORDER BY f.timestamp),
+                array_agg(f."powerMWQ90" ORDER BY f.timestamp)
+            FROM {self._current_forecasts_source()}
+            WHERE f."locationId" = ANY(:location_ids)
+                AND f.timestamp >= :start_time
+                AND f.timestamp <= :end_time
+        """
+
+        params = {
+            "location_ids": list(location_ids),
+            "start_time": start_time,
+            "end_time": end_time
+        }
+
+        if model_type:
+            query_str += ' AND f."modelType" = :model_type'
+            params["model_type"] = model_type
+
+        query_str += ' GROUP BY f."locationId"'
 
         result = await self.db.execute(text(query_str), params)
-        rows = result.fetchall()
 
-        return [
-            {
-                "time": row[0],  # timestamp
-                "location_id": row[1],  # locationId
-                "power_output_mw": row[2],  # powerMW
-                "energy_mwh": row[3],  # energyMWh
-                "capacity_factor": row[4],  # capacityFactor
-                "power_mw_q10": row[5],  # powerMWQ10
-                "power_mw_q25": row[6],  # powerMWQ25
-                "power_mw_q75": row[7],  # powerMWQ75
-                "power_mw_q90": row[8],  # powerMWQ90
-                "model_type": row[9],  # modelType
-                "model_version": row[10],  # modelVersion
-                "horizon_minutes": row[11],  # horizonMinutes
-                "temperature": row[12],  # temperature
-                "ghi": row[13],  # ghi
-                "dni": row[14],  # dni
-                "cloud_cover": row[15],  # cloudCover
-                "wind_speed": row[16],  # windSpeed
-                "quality_score": row[17]  # qualityScore
+        return {
+            row[0]: {
+                "time": row[1],
+                "power_output_mw": row[2],
+                "capacity_factor": row[3],
+                "power_mw_q10": row[4],
+                "power_mw_q25": row[5],
+                "power_mw_q75": row[6],
+                "power_mw_q90": row[7]
             }
-            for row in rows
-        ]
+            for row in result.fetchall()
+        }
 
     async def get_production_range(
         self,
         location_id: str,  # String UUID
         start_time: datetime,
-        end_time: datetime
+        end_time: datetime,
+        resolution: Optional[str] = None
     ) -> List[Dict]:
-        """Get actual production data within time range (optimized schema)"""
-        query = text("""
-            SELECT timestamp, "powerMW", "capacityFactor", availability
-            FROM production
-            WHERE "locationId" = :location_id
-                AND timestamp >= :start_time
-                AND timestamp <= :end_time
-            ORDER BY timestamp ASC
-        """)
+        """
+        Get actual production data within time range (optimized schema).
+
+        With a ROLLUP_RESOLUTIONS resolution, rows are hourly/daily averages
+        read from the production rollup (or bucketed on the fly).
+        """
+        if resolution in ROLLUP_RESOLUTIONS:
+            source = self._rollup_source(
+                "production", "p", _PRODUCTION_ROLLUP_AGGREGATES, resolution,
+                'p."locationId" = :location_id',
+                group_by='p."locationId"'
+            )
+            query = text(f"""
+                SELECT r.bucket, r.avg_power_mw, r.avg_capacity_factor, r.avg_availability
+                FROM {source}
+                WHERE r."locationId" = :location_id
+                    AND r.bucket >= time_bucket(INTERVAL '{ROLLUP_RESOLUTIONS[resolution]}', CAST(:start_time AS TIMESTAMP))
+                    AND r.bucket <= :end_time
+                ORDER BY r.bucket ASC
+            """)
+        else:
+            query = text("""
+                SELECT timestamp, "powerMW", "capacityFactor", availability
+                FROM production
+                WHERE "locationId" = :location_id
+                    AND timestamp >= :start_time
+                    AND timestamp <= :end_time
+                ORDER BY timestamp ASC
+            """)
 
         result = await self.db.execute(query, {
             "location_id": location_id,
@@ -228,34 +481,381 @@ class ForecastRepository:
             for row in rows
         ]
 
+    async def get_forecast_rollup(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        resolution: str,
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Forecasts bucketed to a ROLLUP_RESOLUTIONS resolution (hourly/daily).
+
+        Power, capacity factor, quantiles and weather are bucket averages and
+        energy_mwh is the bucket total. Served from the forecast continuous
+        aggregate when it is set up; bucketed on the fly otherwise (append
+        storage, a specific run_id, or no TimescaleDB).
+        """
+        where = 'f."locationId" = :location_id'
+        params = {"location_id": location_id, "start_time": start_time, "end_time": end_time}
+
+        if run_id:
+            where += ' AND f."runId" = :run_id'
+            params["run_id"] = run_id
+
+        source = self._rollup_source(
+            "forecast", "f", _FORECAST_ROLLUP_AGGREGATES, resolution, where,
+            group_by='f."locationId", f."modelType"', table=self._current_forecasts_source(run_id),
+            materialized=settings.FORECAST_STORAGE_MODE != "append" and not run_id
+        )
+
+        query_str = f"""
+            SELECT
+                r.bucket, r."locationId", r.avg_power_mw, r.total_energy_mwh, r.avg_capacity_factor,
+                r.avg_power_mw_q10, r.avg_power_mw_q25, r.avg_power_mw_q75, r.avg_power_mw_q90,
+                r."modelType"::text, r.avg_temperature, r.avg_ghi, r.avg_cloud_cover, r.avg_quality_score
+            FROM {source}
+            WHERE r."locationId" = :location_id
+                AND r.bucket >= time_bucket(INTERVAL '{ROLLUP_RESOLUTIONS[resolution]}', CAST(:start_time AS TIMESTAMP))
+                AND r.bucket <= :end_time
+        """
+
+        if model_type:
+            query_str += ' AND r."modelType" = :model_type'
+            params["model_type"] = model_type
+
+        query_str += " ORDER BY r.bucket ASC"
+
+        result = await self.db.execute(text(query_str), params)
+
+        return [
+            {
+                "time": row[0],
+                "location_id": row[1],
+                "power_output_mw": row[2],
+                "energy_mwh": row[3],
+                "capacity_factor": row[4],
+                "power_mw_q10": row[5],
+                "power_mw_q25": row[6],
+                "power_mw_q75": row[7],
+                "power_mw_q90": row[8],
+                "model_type": row[9],
+                "temperature": row[10],
+                "ghi": row[11],
+                "cloud_cover": row[12],
+                "quality_score": row[13]
+            }
+            for row in result.fetchall()
+        ]
+
+    def _rollup_source(
+        self,
+        dataset: str,
+        alias: str,
+        aggregates: str,
+        resolution: str,
+        where: str,
+        group_by: str,
+        table: Optional[str] = None,
+        materialized: bool = True
+    ) -> str:
+        """
+        FROM clause (aliased r, bucket column `bucket`) for a rollup read.
+
+        `where` holds the non-time filters. Bucketing on the fly reads whole
+        buckets from the one containing :start_time to the one containing
+        :end_time, so edge buckets match the continuous aggregate.
+        """
+        view = f"{dataset}_rollup_{resolution.lower()}"
+        if materialized and view in ForecastRepository.rollup_views:
+            return f"{view} r"
+
+        width = ROLLUP_RESOLUTIONS[resolution]
+        return f"""(
+                SELECT time_bucket(INTERVAL '{width}', {alias}.timestamp) AS bucket, {group_by}, {aggregates}
+                FROM {table or f"{dataset} {alias}"}
+                WHERE {where}
+                    AND {alias}.timestamp >= time_bucket(INTERVAL '{width}', CAST(:start_time AS TIMESTAMP))
+                    AND {alias}.timestamp < time_bucket(INTERVAL '{width}', CAST(:end_time AS TIMESTAMP)) + INTERVAL '{width}'
+                GROUP BY 1, {group_by}
+            ) r"""
+
+    async def get_forecast_columns(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        columns: List[str],
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None,
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, list]:
+        """
+        Forecast range as one list per requested column (names from FORECAST_EXPORT_COLUMNS).
+
+        Each column is aggregated server-side into a single array, so no
+        per-row objects are built. Page with `after` (last timestamp) + `limit`.
+        """
+        where = """f."locationId" = :location_id
+                AND f.timestamp >= :start_time
+                AND f.timestamp <= :end_time"""
+        params = {"location_id": location_id, "start_time": start_time, "end_time": end_time}
+
+        if run_id:
+            where += ' AND f."runId" = :run_id'
+            params["run_id"] = run_id
+
+        if model_type:
+            where += ' AND f."modelType" = :model_type'
+            params["model_type"] = model_type
+
+        return await self._range_columns(
+            self._current_forecasts_source(run_id), "f", FORECAST_EXPORT_COLUMNS,
+            columns, where, params, after, limit
+        )
+
+    async def get_production_columns(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        columns: List[str],
+        after: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> Dict[str, list]:
+        """Columnar counterpart of get_production_range (names from PRODUCTION_EXPORT_COLUMNS)"""
+        where = """p."locationId" = :location_id
+                AND p.timestamp >= :start_time
+                AND p.timestamp <= :end_time"""
+        params = {"location_id": location_id, "start_time": start_time, "end_time": end_time}
+
+        return await self._range_columns(
+            "production p", "p", PRODUCTION_EXPORT_COLUMNS,
+            columns, where, params, after, limit
+        )
+
+    async def _range_columns(
+        self,
+        source: str,
+        alias: str,
+        column_map: Dict[str, str],
+        columns: List[str],
+        where: str,
+        params: Dict[str, Any],
+        after: Optional[datetime],
+        limit: Optional[int]
+    ) -> Dict[str, list]:
+        """array_agg of the projected columns over a timestamp-ordered (keyset) slice"""
+        if after is not None:
+            where += f" AND {alias}.timestamp > :after"
+            params["after"] = after
+
+        # Project inside the slice, aggregate outside it
+        inner = ", ".join(f"{column_map[name]} AS c{i}" for i, name in enumerate(columns))
+        outer = ", ".join(f"array_agg(s.c{i} ORDER BY s.ts)" for i in range(len(columns)))
+        query_str = f"""
+            SELECT {outer}
+            FROM (
+                SELECT {alias}.timestamp AS ts, {inner}
+                FROM {source}
+                WHERE {where}
+                ORDER BY {alias}.timestamp ASC
+                {"LIMIT :limit" if limit is not None else ""}
+            ) s
+        """
+        if limit is not None:
+            params["limit"] = limit
+
+        result = await self.db.execute(text(query_str), params)
+        row = result.fetchone()
+
+        # array_agg over no rows is NULL
+        return {name: list(row[i] or []) if row else [] for i, name in enumerate(columns)}
+
     async def delete_forecasts_before(
         self,
         location_id: str,  # String UUID
         before_date: datetime
     ) -> int:
         """Delete forecasts before specified date (corrected field names)"""
-        query = text("""
+        table = "forecast_runs" if settings.FORECAST_STORAGE_MODE == "append" else "forecasts"
+        return await self.delete_rows_before(table, before_date, location_id=location_id)
+
+    async def delete_forecasts_off_grid(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        keep: pd.DatetimeIndex
+    ) -> int:
+        """
+        Delete forecasts in [start_time, end_time] whose timestamp is not in keep.
+
+        Used when a range switches to a coarser grid, so the finer rows earlier
+        runs stored there do not linger between the new ones.
+        """
+        result = await self.db.execute(text("""
             DELETE FROM forecasts
             WHERE "locationId" = :location_id
-                AND timestamp < :before_date
-        """)
-
-        result = await self.db.execute(query, {
+                AND timestamp >= :start_time
+                AND timestamp <= :end_time
+                AND NOT (timestamp = ANY(:keep))
+        """), {
             "location_id": location_id,
-            "before_date": before_date
+            "start_time": _utc_naive([start_time])[0],
+            "end_time": _utc_naive([end_time])[0],
+            "keep": _utc_naive(keep)
         })
-
         await self.db.commit()
+
+        if result.rowcount:
+            # Deleted rows must be written again if a later run produces them
+            forecast_fingerprints.invalidate(location_id)
+            logger.info(f"Deleted {result.rowcount} superseded forecast rows for location {location_id}")
         return result.rowcount
 
+    async def delete_rows_before(
+        self,
+        table: str,
+        before: datetime,
+        location_id: Optional[str] = None
+    ) -> int:
+        """
+        Delete rows with timestamp < before in RETENTION_DELETE_BATCH_ROWS batches.
+
+        Each batch commits on its own, so locks are short-lived and WAL is
+        spread out instead of one unbounded DELETE.
+        """
+        where = "timestamp < :before"
+        params: Dict[str, Any] = {"before": before, "batch": settings.RETENTION_DELETE_BATCH_ROWS}
+        if location_id is not None:
+            where += ' AND "locationId" = :location_id'
+            params["location_id"] = location_id
+
+        # The outer predicate repeats the filter so chunk exclusion applies to both scans
+        query = text(f"""
+            DELETE FROM {table}
+            WHERE {where}
+                AND id IN (SELECT id FROM {table} WHERE {where} LIMIT :batch)
+        """)
+
+        deleted = 0
+        while True:
+            result = await self.db.execute(query, params)
+            await self.db.commit()
+            deleted += result.rowcount
+            if result.rowcount < settings.RETENTION_DELETE_BATCH_ROWS:
+                break
+            await asyncio.sleep(0)
+
+        if deleted and table == "forecasts":
+            # Deleted rows must be written again if a later run produces them
+            forecast_fingerprints.invalidate(location_id)
+        return deleted
+
+    async def get_hypertables(self) -> Dict[str, bool]:
+        """Hypertable name -> compression enabled ({} without TimescaleDB)"""
+        timescale = await self.db.execute(text(
+            "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+        ))
+        if not timescale.fetchone():
+            return {}
+
+        result = await self.db.execute(text("""
+            SELECT hypertable_name, compression_enabled
+            FROM timescaledb_information.hypertables
+            WHERE hypertable_schema = current_schema()
+        """))
+        return {row[0]: row[1] for row in result.fetchall()}
+
+    async def get_chunks_before(self, table: str, before: datetime) -> List[Dict]:
+        """Chunks of a hypertable starting before `before`, with their on-disk size"""
+        result = await self.db.execute(text("""
+            SELECT c.chunk_name, c.range_start, c.range_end, c.is_compressed, s.total_bytes
+            FROM timescaledb_information.chunks c
+            LEFT JOIN chunks_detailed_size(CAST(:table AS regclass)) s
+                ON s.chunk_schema = c.chunk_schema AND s.chunk_name = c.chunk_name
+            WHERE c.hypertable_name = :table
+                AND c.range_start < :before
+            ORDER BY c.range_start
+        """), {"table": table, "before": before})
+
+        return [
+            {
+                "chunk_name": row[0],
+                "range_start": row[1],
+                "range_end": row[2],
+                "is_compressed": row[3],
+                "total_bytes": row[4] or 0
+            }
+            for row in result.fetchall()
+        ]
+
+    async def get_compression_ratio(self, table: str) -> Optional[float]:
+        """after/before size of already compressed chunks, None if nothing is compressed yet"""
+        result = await self.db.execute(text("""
+            SELECT before_compression_total_bytes, after_compression_total_bytes
+            FROM hypertable_compression_stats(CAST(:table AS regclass))
+        """), {"table": table})
+        row = result.fetchone()
+        if not row or not row[0]:
+            return None
+        return row[1] / row[0]
+
+    async def count_rows_before(self, table: str, before: datetime, since: Optional[datetime] = None) -> int:
+        """Rows with since <= timestamp < before"""
+        query_str = f"SELECT count(*) FROM {table} WHERE timestamp < :before"
+        params: Dict[str, Any] = {"before": before}
+        if since is not None:
+            query_str += " AND timestamp >= :since"
+            params["since"] = since
+        result = await self.db.execute(text(query_str), params)
+        return result.scalar() or 0
+
+    async def drop_chunks_before(self, table: str, before: datetime) -> List[str]:
+        """Drop every chunk of a hypertable lying entirely before `before`"""
+        result = await self.db.execute(text("""
+            SELECT drop_chunks(CAST(:table AS regclass), older_than => CAST(:before AS TIMESTAMP))
+        """), {"table": table, "before": before})
+        dropped = [row[0] for row in result.fetchall()]
+        await self.db.commit()
+        if dropped and table == "forecasts":
+            forecast_fingerprints.invalidate()
+        return dropped
+
+    async def enable_compression(self, table: str, compression_enabled: bool) -> None:
+        """
+        Turn on native compression (segmented by location, ordered by time) and
+        add a policy compressing chunks older than COMPRESS_AFTER_DAYS.
+        """
+        if not compression_enabled:
+            await self.db.execute(text(f"""
+                ALTER TABLE {table} SET (
+                    timescaledb.compress,
+                    timescaledb.compress_segmentby = '"locationId"',
+                    timescaledb.compress_orderby = 'timestamp DESC'
+                )
+            """))
+        await self.db.execute(text(f"""
+            SELECT add_compression_policy(
+                '{table}',
+                compress_after => INTERVAL '{settings.COMPRESS_AFTER_DAYS} days',
+                if_not_exists => TRUE
+            )
+        """))
+        await self.db.commit()
+
     async def get_latest_forecast(self, location_id: str) -> Optional[Dict]:
         """Get the most recent forecast for a location (corrected field names)"""
-        query = text("""
+        query = text(f"""
             SELECT
-                timestamp, "powerMW", "qualityScore", "modelType"
-            FROM forecasts
-            WHERE "locationId" = :location_id
-            ORDER BY timestamp DESC
+                f.timestamp, f."powerMW", f."qualityScore", f."modelType"
+            FROM {self._current_forecasts_source()}
+            WHERE f."locationId" = :location_id
+            ORDER BY f.timestamp DESC
             LIMIT 1
         """)
 
@@ -271,6 +871,15 @@ class ForecastRepository:
             }
         return None
 
+    def _current_forecasts_source(self, run_id: Optional[str] = None) -> str:
+        """FROM clause (aliased f) holding the current forecast per FORECAST_STORAGE_MODE"""
+        if settings.FORECAST_STORAGE_MODE != "append":
+            return "forecasts f"
+        if run_id:
+            return "forecast_runs f"
+        # Latest run per location: pointer lookup + (locationId, runId, timestamp) index scan
+        return 'forecast_runs f JOIN forecast_latest_runs l USING ("locationId", "runId")'
+
     async def get_location_full(self, location_id: str) -> Optional[Dict]:
         """Get location with all JSON fields parsed for forecast configuration"""
         query = text("""
@@ -278,7 +887,8 @@ class ForecastRepository:
                 id, name, code, latitude, longitude, timezone, altitude,
                 "capacityMW", "actualCapacityMW", "panelCount", "panelType",
                 "trackingSystem", "tiltAngle", "azimuthAngle",
-                "plantData", "performanceData", "calibrationSettings"
+                "plantData", "performanceData", "calibrationSettings",
+                "clientId", "updatedAt"
             FROM locations
             WHERE id = :location_id
         """)
@@ -305,10 +915,104 @@ class ForecastRepository:
                 # Handle JSON fields - they might already be dictionaries or JSON strings
                 "plantData": row[14] if isinstance(row[14], dict) else (json.loads(row[14]) if row[14] and isinstance(row[14], str) else {}),
                 "performanceData": row[15] if isinstance(row[15], dict) else (json.loads(row[15]) if row[15] and isinstance(row[15], str) else {}),
-                "calibrationSettings": row[16] if isinstance(row[16], dict) else (json.loads(row[16]) if row[16] and isinstance(row[16], str) else {})
+                "calibrationSettings": row[16] if isinstance(row[16], dict) else (json.loads(row[16]) if row[16] and isinstance(row[16], str) else {}),
+                "clientId": row[17],  # Fair-share key for the job scheduler
+                "updatedAt": row[18]  # Change marker for the location config cache
             }
         return None
 
+    async def get_location_updated_at(self, location_id: str) -> Optional[datetime]:
+        """Last modification time of a location (None if it does not exist)"""
+        result = await self.db.execute(text("""
+            SELECT "updatedAt" FROM locations WHERE id = :location_id
+        """), {"location_id": location_id})
+        row = result.fetchone()
+        return row[0] if row else None
+
+    async def get_location_client_ids(self, location_ids: List[str]) -> Dict[str, Any]:
+        """Map location IDs to their owning clientId (unknown IDs are omitted)"""
+        if not location_ids:
+            return {}
+
+        query = text("""
+            SELECT id, "clientId"
+            FROM locations
+            WHERE id = ANY(:location_ids)
+        """)
+
+        result = await self.db.execute(query, {"location_ids": list(location_ids)})
+        return {row[0]: row[1] for row in result.fetchall()}
+
+    async def ensure_job_checkpoint_table(self) -> None:
+        """Create the worker-owned forecast_job_checkpoints table if missing"""
+        await self.db.execute(text("""
+            CREATE TABLE IF NOT EXISTS forecast_job_checkpoints (
+                "taskId" TEXT PRIMARY KEY,
+                "locationId" TEXT NOT NULL,
+                "horizonHours" INTEGER NOT NULL,
+                "modelType" TEXT NOT NULL,
+                priority TEXT NOT NULL,
+                "clientId" TEXT,
+                "batchId" TEXT,
+                resolution TEXT,
+                "createdAt" TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """))
+        await self.db.commit()
+
+    async def save_job_checkpoints(self, jobs: List[Dict[str, Any]]) -> int:
+        """Persist unfinished job specs in one transaction"""
+        rows = [
+            {
+                "task_id": job["task_id"],
+                "location_id": job["location_id"],
+                "horizon_hours": job["horizon_hours"],
+                "model_type": job["model_type"],
+                "priority": job["priority"],
+                "client_id": None if job["client_id"] == "unknown" else job["client_id"],
+                "batch_id": job.get("batch_id"),
+                "resolution": job.get("resolution")
+            }
+            for job in jobs
+        ]
+
+        await self.db.execute(text("""
+            INSERT INTO forecast_job_checkpoints (
+                "taskId", "locationId", "horizonHours", "modelType",
+                priority, "clientId", "batchId", resolution
+            ) VALUES (
+                :task_id, :location_id, :horizon_hours, :model_type,
+                :priority, :client_id, :batch_id, :resolution
+            )
+            ON CONFLICT ("taskId") DO NOTHING
+        """), rows)
+        await self.db.commit()
+        return len(rows)
+
+    async def claim_job_checkpoints(self) -> List[Dict[str, Any]]:
+        """Delete and return all checkpointed jobs"""
+        result = await self.db.execute(text("""
+            DELETE FROM forecast_job_checkpoints
+            RETURNING "taskId", "locationId", "horizonHours", "modelType",
+                      priority, "clientId", "batchId", resolution
+        """))
+        rows = result.fetchall()
+        await self.db.commit()
+
+        return [
+            {
+                "task_id": row[0],
+                "location_id": row[1],
+                "horizon_hours": row[2],
+                "model_type": row[3],
+                "priority": row[4],
+                "client_id": row[5],
+                "batch_id": row[6],
+                "resolution": row[7]
+            }
+            for row in rows
+        ]
+
     async def get_future_weather(self, location_id: str, hours: int) -> pd.DataFrame:
         """Get FUTURE weather forecast data for solar power forecasting"""
         from datetime import timedelta
@@ -318,59 +1022,20 @@ class ForecastRepository:
             start_time = datetime.utcnow()
             end_time = start_time + timedelta(hours=hours)
 
-            # Query future weather data from database
-            query = text("""
-                SELECT
-                    timestamp,
-                    temperature as temp_air,
-                    humidity,
-                    "windSpeed" as wind_speed,
-                    "cloudCover" as cloud_cover,
-                    ghi,
-                    dni,
-                    dhi
-                FROM weather_data
-                WHERE "locationId" = :location_id
-                  AND timestamp >= :start_time
-                  AND timestamp <= :end_time
-                ORDER BY timestamp ASC
-            """)
+            # Repeated forecasts within the freshness window reuse the cached window
+            df = await weather_cache.get_window(location_id, start_time, end_time, self._fetch_weather_frame)
 
-            result = await self.db.execute(query, {
-                "location_id": location_id,
-                "start_time": start_time,
-                "end_time": end_time
-            })
-
-            rows = result.fetchall()
-
-            if not rows:
+            if df.empty:
                 logger.error(f"No future weather data found for location {location_id}")
                 # Return empty DataFrame - forecast should fail if no weather data
                 return pd.DataFrame()
 
-            # Convert to DataFrame
-            weather_data = []
-            for row in rows:
-                weather_data.append({
-                    'timestamp': row[0],
-                    'temp_air': row[1],
-                    'humidity': row[2],
-                    'wind_speed': row[3],
-                    'cloud_cover': row[4],
-                    'ghi': row[5],  # Real data only - no defaults
-                    'dni': row[6],
-                    'dhi': row[7]
-                })
-
-            df = pd.DataFrame(weather_data)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
-
             # Add PVLIB required fields
-            df['pressure'] = 1013.25
-            df['precipitable_water'] = 14.0
-            df['albedo'] = 0.2
+            df = _with_constant_columns(df, {
+                'pressure': 1013.25,
+                'precipitable_water': 14.0,
+                'albedo': 0.2
+            })
 
             logger.info(f"Retrieved {len(df)} future weather records for location {location_id}")
             return df
@@ -380,105 +1045,209 @@ class ForecastRepository:
             # No fallback - must have real weather data
             raise ValueError(f"Cannot generate forecast without weather data: {e}")
 
+    async def _fetch_weather_frame(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        after: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Weather rows in [start_time, end_time] as a timestamp-indexed DataFrame
+        (only rows with timestamp > after when given, for incremental reads).
 
-    async def get_recent_weather(self, location_id: str, hours: int) -> pd.DataFrame:
-        """Get HISTORICAL weather data for ML training/validation"""
-        import httpx
-        import os
-
-        # Get SvelteKit URL from environment
-        sveltekit_url = os.getenv('SVELTEKIT_URL', 'http://localhost:5173')
-
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"{sveltekit_url}/api/weather/dataframe",
-                    params={
-                        "location_id": location_id,
-                        "hours": hours
-                    }
-                )
-
-                if response.status_code != 200:
-                    logger.warning(f"SvelteKit API returned {response.status_code}, using database fallback")
-                    return await self._get_weather_from_database(location_id, hours)
-
-                api_data = response.json()
-
-                if not api_data.get('success'):
-                    logger.warning(f"API error: {api_data.get('error')}, using database fallback")
-                    return await self._get_weather_from_database(location_id, hours)
-
-                # Convert API response to DataFrame
-                weather_records = api_data['data']
+        The rows are aggregated server-side into one array per column, so the
+        frame is assembled from NumPy arrays without per-row Python objects
+        (matters for long training windows).
+        """
+        lower_bound = "timestamp > :after" if after is not None else "timestamp >= :start_time"
+        query = text(f"""
+            SELECT
+                array_agg(timestamp ORDER BY timestamp),
+                array_agg(temperature ORDER BY timestamp),
+                array_agg(humidity ORDER BY timestamp),
+                array_agg("windSpeed" ORDER BY timestamp),
+                array_agg("cloudCover" ORDER BY timestamp),
+                array_agg(ghi ORDER BY timestamp),
+                array_agg(dni ORDER BY timestamp),
+                array_agg(dhi ORDER BY timestamp)
+            FROM weather_data
+            WHERE "locationId" = :location_id
+              AND {lower_bound}
+              AND timestamp <= :end_time
+        """)
 
-                if not weather_records:
-                    # Return empty DataFrame with expected columns
-                    return pd.DataFrame(columns=[
-                        'timestamp', 'temp_air', 'humidity', 'wind_speed',
-                        'cloud_cover', 'ghi', 'dni', 'dhi'
-                    ])
+        params = {"location_id": location_id, "end_time": end_time}
+        if after is not None:
+            params["after"] = after
+        else:
+            params["start_time"] = start_time
 
-                # Create DataFrame from API response
-                df = pd.DataFrame(weather_records)
+        result = await self.db.execute(query, params)
+        arrays = result.fetchone()
 
-                # Convert timestamp to datetime and set as index
-                df['timestamp'] = pd.to_datetime(df['timestamp'])
-                df.set_index('timestamp', inplace=True)
+        # array_agg over zero rows yields NULL
+        if arrays is None or arrays[0] is None:
+            return pd.DataFrame(columns=WEATHER_COLUMNS, index=pd.DatetimeIndex([], name='timestamp'))
 
-                # Map SvelteKit field names to PVLIB/forecast expected names
-                column_mapping = {
-                    'temperature': 'temp_air',
-                    'windSpeed': 'wind_speed',
-                    'cloudCover': 'cloud_cover'
-                }
+        # NULL array elements become NaN in the float arrays
+        return pd.DataFrame(
+            {name: np.asarray(values, dtype=float) for name, values in zip(WEATHER_COLUMNS, arrays[1:])},
+            index=pd.DatetimeIndex(arrays[0], name='timestamp')
+        )
 
-                df = df.rename(columns=column_mapping)
+    async def get_recent_weather(self, location_id: str, hours: int) -> pd.DataFrame:
+        """
+        Get HISTORICAL weather data for ML training/validation.
 
-                # Ensure numeric columns
-                numeric_cols = ['temp_air', 'humidity', 'wind_speed', 'cloud_cover', 'ghi', 'dni', 'dhi']
-                for col in numeric_cols:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
+        Reads from SvelteKit. When that call outlives its latency budget (the
+        p95 of recent calls) a database read is hedged on its own session and
+        the first usable answer wins. Failed calls fall back to the database,
+        and after repeated failures the circuit breaker skips SvelteKit.
+        """
+        if not sveltekit_weather_breaker.allow():
+            WEATHER_READ_RESULTS.labels(source="database", reason="circuit_open").inc()
+            return await self._timed_weather_from_database(location_id, hours)
 
-                # Add missing PVLIB fields with reasonable defaults
-                if 'pressure' not in df.columns:
-                    df['pressure'] = 1013.25
+        api_task = asyncio.create_task(self._get_weather_from_sveltekit(location_id, hours))
+        try:
+            budget = sveltekit_weather_latency.budget() if settings.WEATHER_READ_HEDGE_ENABLED else None
+            done, _ = await asyncio.wait({api_task}, timeout=budget)
+            if not done:
+                return await self._hedged_weather_read(api_task, location_id, hours)
+
+            df = api_task.result()
+            if df is not None:
+                WEATHER_READ_RESULTS.labels(source="sveltekit", reason="ok").inc()
+                return df
 
-                if 'precipitable_water' not in df.columns:
-                    df['precipitable_water'] = 14.0
+            WEATHER_READ_RESULTS.labels(source="database", reason="sveltekit_failed").inc()
+            return await self._timed_weather_from_database(location_id, hours)
+        finally:
+            if not api_task.done():
+                api_task.cancel()
+                sveltekit_weather_breaker.record_failure()
 
-                if 'solar_zenith' not in df.columns:
-                    df['solar_zenith'] = 45
+    async def _hedged_weather_read(
+        self,
+        api_task: "asyncio.Task",
+        location_id: str,
+        hours: int
+    ) -> pd.DataFrame:
+        """Race the slow SvelteKit call against a database read"""
+        logger.info(f"SvelteKit weather read for location {location_id} over budget, hedging with database")
+        db_task = asyncio.create_task(self._weather_from_own_session(location_id, hours))
+        done, _ = await asyncio.wait({api_task, db_task}, return_when=asyncio.FIRST_COMPLETED)
+
+        if api_task in done and api_task.result() is not None:
+            db_task.cancel()
+            await asyncio.gather(db_task, return_exceptions=True)
+            WEATHER_READ_RESULTS.labels(source="sveltekit", reason="hedge_lost").inc()
+            return api_task.result()
+
+        df = await db_task
+        if df.empty and not api_task.done():
+            # Nothing stored locally; the SvelteKit answer is still worth waiting for
+            api_df = await api_task
+            if api_df is not None:
+                WEATHER_READ_RESULTS.labels(source="sveltekit", reason="hedge_empty").inc()
+                return api_df
+
+        if not api_task.done():
+            # Abandoned for being slow: counts towards opening the circuit
+            api_task.cancel()
+            await asyncio.gather(api_task, return_exceptions=True)
+            sveltekit_weather_breaker.record_failure()
+        WEATHER_READ_RESULTS.labels(source="hedged_database", reason="hedge_won").inc()
+        return df
+
+    async def _weather_from_own_session(self, location_id: str, hours: int) -> pd.DataFrame:
+        # The hedge may be cancelled mid-query, so it must not share the caller's session
+        started = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            df = await ForecastRepository(db)._get_weather_from_database(location_id, hours)
+        WEATHER_READ_SECONDS.labels(source="hedged_database").observe(time.monotonic() - started)
+        return df
+
+    async def _timed_weather_from_database(self, location_id: str, hours: int) -> pd.DataFrame:
+        started = time.monotonic()
+        df = await self._get_weather_from_database(location_id, hours)
+        WEATHER_READ_SECONDS.labels(source="database").observe(time.monotonic() - started)
+        return df
+
+    async def _get_weather_from_sveltekit(self, location_id: str, hours: int) -> Optional[pd.DataFrame]:
+        """Weather from the SvelteKit API; None when the call failed (recorded on the breaker)"""
+        started = time.monotonic()
+        try:
+            async with http_client.get().stream(
+                "GET",
+                f"{settings.SVELTEKIT_URL}/api/weather/dataframe",
+                params={
+                    "location_id": location_id,
+                    "hours": hours,
+                    "format": settings.WEATHER_READ_FORMAT
+                },
+                timeout=settings.WEATHER_READ_TIMEOUT
+            ) as response:
+                if response.status_code != 200:
+                    logger.warning(f"SvelteKit API returned {response.status_code}, using database fallback")
+                    sveltekit_weather_breaker.record_failure()
+                    return None
 
-                if 'solar_azimuth' not in df.columns:
-                    df['solar_azimuth'] = 180
+                # Records are decoded as they arrive straight into typed column buffers;
+                # SvelteKit versions without NDJSON support answer with the JSON envelope
+                if response.headers.get("content-type", "").startswith("application/x-ndjson"):
+                    buffers = await decode_weather_ndjson(response.aiter_lines())
+                else:
+                    envelope, buffers = await decode_weather_json(response.aiter_bytes())
+                    if not envelope.get('success'):
+                        logger.warning(f"API error: {envelope.get('error')}, using database fallback")
+                        sveltekit_weather_breaker.record_failure()
+                        return None
+
+            elapsed = time.monotonic() - started
+            sveltekit_weather_breaker.record_success()
+            sveltekit_weather_latency.observe(elapsed)
+            WEATHER_READ_SECONDS.labels(source="sveltekit").observe(elapsed)
+
+            if not len(buffers):
+                # Return empty DataFrame with expected columns
+                return pd.DataFrame(columns=[
+                    'timestamp', 'temp_air', 'humidity', 'wind_speed',
+                    'cloud_cover', 'ghi', 'dni', 'dhi'
+                ])
 
-                if 'albedo' not in df.columns:
-                    df['albedo'] = 0.2
+            # float64 columns under PVLIB names, indexed by UTC timestamp
+            df = buffers.to_frame()
 
-                # Fill any missing values with defaults
-                pvlib_defaults = {
-                    'wind_speed': 2.0,
-                    'temp_air': 20.0,
-                    'humidity': 60.0,
-                    'cloud_cover': 50.0,
-                    'ghi': 0,
-                    'dni': 0,
-                    'dhi': 0
-                }
+            # Add missing PVLIB fields with reasonable defaults
+            df = _with_constant_columns(df, {
+                'pressure': 1013.25,
+                'precipitable_water': 14.0,
+                'solar_zenith': 45,
+                'solar_azimuth': 180,
+                'albedo': 0.2
+            })
 
-                for field, default_value in pvlib_defaults.items():
-                    if field in df.columns:
-                        df[field] = df[field].fillna(default_value)
+            # Fill any missing values with defaults
+            pvlib_defaults = {
+                'wind_speed': 2.0,
+                'temp_air': 20.0,
+                'humidity': 60.0,
+                'cloud_cover': 50.0,
+                'ghi': 0,
+                'dni': 0,
+                'dhi': 0
+            }
+            df = df.fillna({field: value for field, value in pvlib_defaults.items() if field in df.columns})
 
-                logger.info(f"Retrieved {len(df)} weather records from SvelteKit for location {location_id}")
-                return df
+            logger.info(f"Retrieved {len(df)} weather records from SvelteKit for location {location_id}")
+            return df
 
         except Exception as e:
             logger.error(f"Failed to get weather data from SvelteKit for location {location_id}: {e}")
-            # Try database fallback
-            return await self._get_weather_from_database(location_id, hours)
+            sveltekit_weather_breaker.record_failure()
+            return None
 
     async def _get_weather_from_database(self, location_id: str, hours: int) -> pd.DataFrame:
         """Direct database query for weather data (fallback method)"""
@@ -489,33 +1258,9 @@ class ForecastRepository:
             end_time = datetime.utcnow()
             start_time = end_time - timedelta(hours=hours)
 
-            # Query weather data directly from database (using correct camelCase column names)
-            query = text("""
-                SELECT
-                    timestamp,
-                    temperature as temp_air,
-                    humidity,
-                    "windSpeed" as wind_speed,
-                    "cloudCover" as cloud_cover,
-                    ghi,
-                    dni,
-                    dhi
-                FROM weather_data
-                WHERE "locationId" = :location_id
-                  AND timestamp >= :start_time
-                  AND timestamp <= :end_time
-                ORDER BY timestamp ASC
-            """)
-
-            result = await self.db.execute(query, {
-                "location_id": location_id,
-                "start_time": start_time,
-                "end_time": end_time
-            })
+            df = await self._fetch_weather_frame(location_id, start_time, end_time)
 
-            rows = result.fetchall()
-
-            if not rows:
+            if df.empty:
                 logger.warning(f"No weather data found in database for location {location_id}")
                 # Return empty DataFrame with expected structure
                 return pd.DataFrame(columns=[
@@ -523,29 +1268,24 @@ class ForecastRepository:
                     'cloud_cover', 'ghi', 'dni', 'dhi'
                 ])
 
-            # Convert to DataFrame
-            weather_data = []
-            for row in rows:
-                weather_data.append({
-                    'timestamp': row[0],
-                    'temp_air': row[1] or 20.0,
-                    'humidity': row[2] or 60.0,
-                    'wind_speed': row[3] or 2.0,
-                    'cloud_cover': row[4] or 50.0,
-                    'ghi': row[5] or 0,
-                    'dni': row[6] or 0,
-                    'dhi': row[7] or 0
-                })
-
-            df = pd.DataFrame(weather_data)
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            df.set_index('timestamp', inplace=True)
+            # Missing readings get typical values
+            df = df.fillna({
+                'temp_air': 20.0,
+                'humidity': 60.0,
+                'wind_speed': 2.0,
+                'cloud_cover': 50.0,
+                'ghi': 0,
+                'dni': 0,
+                'dhi': 0
+            })
 
             # Add PVLIB required fields
-            df['albedo'] = 0.2
-            df['solar_zenith'] = 45
-            df['solar_azimuth'] = 180
-            df['precipitable_water'] = 14.0
+            df = _with_constant_columns(df, {
+                'albedo': 0.2,
+                'solar_zenith': 45,
+                'solar_azimuth': 180,
+                'precipitable_water': 14.0
+            })
 
             logger.info(f"Retrieved {len(df)} weather records from database for location {location_id}")
             return df
@@ -563,140 +1303,267 @@ class ForecastRepository:
         if forecasts.empty:
             return 0
 
-        import math
-        import numpy as np
+        columns, skipped = self.prepare_forecast_rows(location_id, forecasts)
+        if not columns:
+            return 0
 
-        # Helper function to clean numeric values
-        def clean_numeric(val):
-            """Replace NaN and Inf values with None for database compatibility"""
-            if val is None:
-                return None
-            if isinstance(val, (float, int)):
-                if math.isnan(val) or math.isinf(val):
-                    return None
-            elif isinstance(val, (np.floating, np.integer)):
-                if np.isnan(val) or np.isinf(val):
-                    return None
-            return val
-
-        values = []
-        skipped = 0  # Initialize skipped counter
-        for idx, row in forecasts.iterrows():
-            # Ensure timestamp is in UTC and timezone-naive for PostgreSQL
-            timestamp = row.get('timestamp', idx)
-
-            # Convert pandas Timestamp to timezone-naive UTC datetime
-            if hasattr(timestamp, 'tz_localize'):
-                # If timezone-naive, assume UTC
-                if timestamp.tz is None:
-                    timestamp = timestamp.tz_localize('UTC')
-                else:
-                    # Convert to UTC if timezone-aware
-                    timestamp = timestamp.tz_convert('UTC')
-                # Convert to naive datetime for PostgreSQL
-                timestamp = timestamp.tz_localize(None)
-            elif hasattr(timestamp, 'to_pydatetime'):
-                # Convert pandas timestamp to Python datetime
-                timestamp = timestamp.to_pydatetime()
-                if timestamp.tzinfo is not None:
-                    # Convert timezone-aware to UTC naive
-                    timestamp = timestamp.utctimetuple()
-                    timestamp = datetime(*timestamp[:6])
-            elif hasattr(timestamp, 'replace') and hasattr(timestamp, 'tzinfo'):
-                # Python datetime - remove timezone info if present
-                if timestamp.tzinfo is not None:
-                    timestamp = timestamp.replace(tzinfo=None)
-
-            # Validate critical power value
-            power_mw = clean_numeric(row.get('power_mw', 0.0))
-            if power_mw is None or power_mw < 0:
-                logger.warning(f"Skipping forecast with invalid power: {row.get('power_mw')} at {timestamp}")
-                skipped += 1
-                continue
+        written, unchanged = await self.merge_forecast_rows(columns)
 
-            values.append({
-                "id": str(uuid4()),
-                "timestamp": timestamp,  # Correct field name
-                # REMOVED 'time' field - it doesn't exist in database!
-                "locationId": location_id,  # String UUID
-                "powerMW": power_mw,  # Cleaned and validated
-                "powerOutputMW": power_mw,  # Required duplicate field
-                "energyMWh": clean_numeric(row.get('energy_mwh', 0.0)),
-                "capacityFactor": clean_numeric(row.get('capacity_factor', 0.0)),
-                "powerMWQ10": clean_numeric(row.get('p10_mw', None)),  # Confidence bands
-                "powerMWQ25": clean_numeric(row.get('p25_mw', None)),
-                "powerMWQ75": clean_numeric(row.get('p75_mw', None)),
-                "powerMWQ90": clean_numeric(row.get('p90_mw', None)),
-                "modelType": self._normalize_model_type(row.get('model_type', 'ENSEMBLE')),
-                "modelVersion": row.get('model_version', '2.0'),
-                "horizonMinutes": int(row.get('horizon_hours', 1) * 60),  # Convert to minutes
-                # Required enum fields with defaults
-                "resolution": "HOURLY",  # Valid ResolutionType enum value
-                "forecastType": "OPERATIONAL",  # Valid ForecastType enum value
-                "dataQuality": "GOOD",  # Valid DataQuality enum value
-                # Weather parameters
-                "temperature": clean_numeric(row.get('temp_air', None)),
-                "ghi": clean_numeric(row.get('ghi', None)),
-                "dni": clean_numeric(row.get('dni', None)),
-                "cloudCover": clean_numeric(row.get('cloud_cover', None)),
-                "windSpeed": clean_numeric(row.get('wind_speed', None)),
-                "qualityScore": clean_numeric(row.get('quality_score', 0.95)),
-                "isValidated": False,  # Default validation status
-                "createdAt": datetime.utcnow()
-            })
+        if skipped > 0:
+            logger.info(f"Saved {written} forecasts, skipped {skipped} invalid records")
 
-        # Check if we have any valid values to insert
-        if not values:
-            logger.warning(f"All {skipped} forecasts were invalid and skipped for location {location_id}")
-            return 0
+        # Unchanged rows are already stored with the same values
+        return written + unchanged
 
-        # Use COPY or multi-row INSERT for TimescaleDB optimization
-        # ON CONFLICT: Update existing forecasts for same timestamp and location
-        query = text("""
-            INSERT INTO forecasts (
-                id, timestamp, "locationId", "powerMW", "powerOutputMW", "energyMWh", "capacityFactor",
-                "powerMWQ10", "powerMWQ25", "powerMWQ75", "powerMWQ90",
-                "modelType", "modelVersion", "horizonMinutes",
-                resolution, "forecastType", "dataQuality",
-                temperature, ghi, dni, "cloudCover", "windSpeed",
-                "qualityScore", "isValidated", "createdAt"
-            ) VALUES (
-                :id, :timestamp, :locationId, :powerMW, :powerOutputMW, :energyMWh, :capacityFactor,
-                :powerMWQ10, :powerMWQ25, :powerMWQ75, :powerMWQ90,
-                :modelType, :modelVersion, :horizonMinutes,
-                :resolution, :forecastType, :dataQuality,
-                :temperature, :ghi, :dni, :cloudCover, :windSpeed,
-                :qualityScore, :isValidated, :createdAt
+    async def merge_forecast_rows(self, columns: Dict[str, list]) -> Tuple[int, int]:
+        """
+        Upsert rows prepared by prepare_forecast_rows (possibly several locations at once).
+
+        Rows whose values match the last committed ones are skipped;
+        returns (rows written, rows unchanged).
+        """
+        changed, unchanged = forecast_fingerprints.split_unchanged(columns)
+        if not changed or not changed["id"]:
+            return 0, unchanged
+
+        written = await self.write_forecast_rows(changed)
+        forecast_fingerprints.remember(changed)
+
+        if unchanged:
+            logger.info(f"Wrote {written} forecast rows, skipped {unchanged} unchanged")
+        return written, unchanged
+
+    async def write_forecast_rows(self, columns: Dict[str, list]) -> int:
+        """Write prepared rows unconditionally (upsert or append per FORECAST_STORAGE_MODE)"""
+        if settings.FORECAST_STORAGE_MODE == "append":
+            return await self._copy_append_runs(columns)
+
+        # ON CONFLICT: Update existing forecasts for same timestamp and location.
+        # Every updated column but runId is fingerprinted, so a skipped row
+        # already holds what this write would have stored
+        return await self._copy_merge_forecasts(
+            columns, update_columns=FINGERPRINT_COLUMNS + FINGERPRINT_LABEL_COLUMNS + ["runId"]
+        )
+
+    async def ensure_run_storage(self) -> None:
+        """
+        Create the append-only forecast_runs table and the forecast_latest_runs pointer.
+
+        forecast_runs has the forecasts column layout without the
+        (timestamp, locationId) unique key, so every run keeps its own rows.
+        """
+        await self.db.execute(text("""
+            CREATE TABLE IF NOT EXISTS forecast_runs (LIKE forecasts INCLUDING DEFAULTS)
+        """))
+        await self.db.execute(text("""
+            CREATE INDEX IF NOT EXISTS forecast_runs_location_run_time_idx
+            ON forecast_runs ("locationId", "runId", timestamp)
+        """))
+        await self.db.execute(text("""
+            CREATE TABLE IF NOT EXISTS forecast_latest_runs (
+                "locationId" TEXT PRIMARY KEY,
+                "runId" TEXT NOT NULL,
+                "startTime" TIMESTAMP NOT NULL,
+                "endTime" TIMESTAMP NOT NULL,
+                "rowCount" INTEGER NOT NULL,
+                "createdAt" TIMESTAMP NOT NULL
             )
-            ON CONFLICT (timestamp, "locationId") DO UPDATE SET
-                "powerMW" = EXCLUDED."powerMW",
-                "powerOutputMW" = EXCLUDED."powerOutputMW",
-                "energyMWh" = EXCLUDED."energyMWh",
-                "capacityFactor" = EXCLUDED."capacityFactor",
-                "powerMWQ10" = EXCLUDED."powerMWQ10",
-                "powerMWQ25" = EXCLUDED."powerMWQ25",
-                "powerMWQ75" = EXCLUDED."powerMWQ75",
-                "powerMWQ90" = EXCLUDED."powerMWQ90",
-                "modelType" = EXCLUDED."modelType",
-                "modelVersion" = EXCLUDED."modelVersion",
-                "horizonMinutes" = EXCLUDED."horizonMinutes",
-                temperature = EXCLUDED.temperature,
-                ghi = EXCLUDED.ghi,
-                dni = EXCLUDED.dni,
-                "cloudCover" = EXCLUDED."cloudCover",
-                "windSpeed" = EXCLUDED."windSpeed",
-                "qualityScore" = EXCLUDED."qualityScore"
-        """)
+        """))
+
+        timescale = await self.db.execute(text(
+            "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+        ))
+        if timescale.fetchone():
+            await self.db.execute(text("""
+                SELECT create_hypertable(
+                    'forecast_runs',
+                    'timestamp',
+                    chunk_time_interval => INTERVAL '1 day',
+                    if_not_exists => TRUE,
+                    migrate_data => TRUE
+                )
+            """))
+        await self.db.commit()
+
+    async def ensure_rollups(self) -> List[str]:
+        """
+        Create the hourly/daily forecast and production continuous aggregates
+        with their refresh policies; returns the views that are available.
 
-        for value in values:
-            await self.db.execute(query, value)
+        Must be the first statement of a fresh session: continuous aggregates
+        are created WITH DATA, which cannot run inside a transaction. Tables
+        that are not hypertables are skipped and keep the on-the-fly fallback.
+        """
+        conn = await self.db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+
+        timescale = await conn.execute(text(
+            "SELECT 1 FROM pg_extension WHERE extname = 'timescaledb'"
+        ))
+        if not timescale.fetchone():
+            logger.warning("TimescaleDB not installed, rollups are computed on the fly")
+            return []
+
+        hypertables = await conn.execute(text("""
+            SELECT hypertable_name FROM timescaledb_information.hypertables
+            WHERE hypertable_name IN ('forecasts', 'production')
+        """))
+        available = {row[0] for row in hypertables.fetchall()}
+
+        definitions = {
+            "forecasts": ("forecast", "f", _FORECAST_ROLLUP_AGGREGATES, 'f."locationId", f."modelType"'),
+            "production": ("production", "p", _PRODUCTION_ROLLUP_AGGREGATES, 'p."locationId"')
+        }
 
+        views = []
+        for table, (dataset, alias, aggregates, group_by) in definitions.items():
+            if table not in available:
+                logger.warning(f"{table} is not a hypertable, {dataset} rollups are computed on the fly")
+                continue
+
+            for resolution, width in ROLLUP_RESOLUTIONS.items():
+                view = f"{dataset}_rollup_{resolution.lower()}"
+                # materialized_only = false: buckets newer than the last refresh are
+                # aggregated at query time, so fresh forecasts show up immediately
+                await conn.execute(text(f"""
+                    CREATE MATERIALIZED VIEW IF NOT EXISTS {view}
+                    WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+                    SELECT time_bucket(INTERVAL '{width}', {alias}.timestamp) AS bucket, {group_by}, {aggregates}
+                    FROM {table} {alias}
+                    GROUP BY 1, {group_by}
+                    WITH DATA
+                """))
+                # Forecasts lie in the future and are re-written each run, so the
+                # refresh window has no upper bound
+                await conn.execute(text(f"""
+                    SELECT add_continuous_aggregate_policy(
+                        '{view}',
+                        start_offset => INTERVAL '{settings.ROLLUP_REFRESH_LOOKBACK_DAYS} days',
+                        end_offset => NULL,
+                        schedule_interval => INTERVAL '{settings.ROLLUP_REFRESH_MINUTES} minutes',
+                        if_not_exists => TRUE
+                    )
+                """))
+                views.append(view)
+
+        ForecastRepository.rollup_views = set(views)
+        logger.info(f"Rollups available: {', '.join(views) or 'none'}")
+        return views
+
+    async def _copy_append_runs(self, columns: Dict[str, list]) -> int:
+        """
+        Insert rows into forecast_runs with COPY (no upsert, no row locks on
+        existing data) and move each location's latest-run pointer forward.
+        """
+        frame = pd.DataFrame({
+            "locationId": columns["locationId"],
+            "runId": columns["runId"],
+            "timestamp": columns["timestamp"],
+            "createdAt": columns["createdAt"]
+        })
+        runs = frame.groupby(["locationId", "runId"], sort=False).agg(
+            startTime=("timestamp", "min"),
+            endTime=("timestamp", "max"),
+            rowCount=("timestamp", "size"),
+            createdAt=("createdAt", "max")
+        ).reset_index()
+
+        # A late write from an older run never replaces a newer pointer
+        await self.db.execute(text("""
+            INSERT INTO forecast_latest_runs (
+                "locationId", "runId", "startTime", "endTime", "rowCount", "createdAt"
+            ) VALUES (
+                :locationId, :runId, :startTime, :endTime, :rowCount, :createdAt
+            )
+            ON CONFLICT ("locationId") DO UPDATE SET
+                "runId" = EXCLUDED."runId",
+                "startTime" = EXCLUDED."startTime",
+                "endTime" = EXCLUDED."endTime",
+                "rowCount" = EXCLUDED."rowCount",
+                "createdAt" = EXCLUDED."createdAt"
+            WHERE forecast_latest_runs."createdAt" <= EXCLUDED."createdAt"
+        """), [
+            {
+                "locationId": run.locationId,
+                "runId": run.runId,
+                "startTime": run.startTime.to_pydatetime(),
+                "endTime": run.endTime.to_pydatetime(),
+                "rowCount": int(run.rowCount),
+                "createdAt": run.createdAt.to_pydatetime()
+            }
+            for run in runs.itertuples(index=False)
+        ])
+
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "forecast_runs", records=list(zip(*columns.values())), columns=list(columns)
+        )
         await self.db.commit()
 
-        if skipped > 0:
-            logger.info(f"Saved {len(values)} forecasts, skipped {skipped} invalid records")
+        return len(columns["id"])
 
-        return len(values)
+    def prepare_forecast_rows(
+        self,
+        location_id: str,
+        forecasts: pd.DataFrame,
+        run_id: Optional[str] = None
+    ) -> Tuple[Dict[str, list], int]:
+        """Engine output -> forecasts table columns; returns (columns, skipped rows)"""
+        n = len(forecasts)
+        timestamps = forecasts["timestamp"] if "timestamp" in forecasts.columns else forecasts.index
+
+        # Validate critical power value (NaN/Inf/negative rows are skipped)
+        power = _numeric(forecasts["power_mw"] if "power_mw" in forecasts.columns else np.zeros(n))
+        valid = np.isfinite(power) & (power >= 0)
+        skipped = int(n - valid.sum())
+        if skipped:
+            logger.warning(f"Skipping {skipped} forecasts with invalid power for location {location_id}")
+
+        if not valid.any():
+            logger.warning(f"All {skipped} forecasts were invalid and skipped for location {location_id}")
+            return {}, skipped
+
+        df = forecasts.reset_index(drop=True).assign(_timestamp=_utc_naive(timestamps), _power=power)[valid]
+        # Last row wins for duplicate timestamps, as with row-by-row upserts
+        df = df.loc[~df["_timestamp"].duplicated(keep="last")]
+        count = len(df)
+
+        model_types = pd.Series(_column(df, "model_type", "ENSEMBLE"))
+        model_type_map = {value: self._normalize_model_type(value) for value in model_types.unique()}
+        horizon_hours = _numeric(_column(df, "horizon_hours", 1))
+        power_mw = df["_power"].tolist()  # Already validated above
+
+        columns = {
+            "id": [str(uuid4()) for _ in range(count)],
+            "timestamp": _utc_naive(df["_timestamp"]),
+            "locationId": [location_id] * count,  # String UUID
+            "powerMW": power_mw,
+            "powerOutputMW": power_mw,  # Required duplicate field
+            "energyMWh": _nullable_floats(_column(df, "energy_mwh", 0.0)),
+            "capacityFactor": _nullable_floats(_column(df, "capacity_factor", 0.0)),
+            "powerMWQ10": _nullable_floats(_column(df, "p10_mw", None)),  # Confidence bands
+            "powerMWQ25": _nullable_floats(_column(df, "p25_mw", None)),
+            "powerMWQ75": _nullable_floats(_column(df, "p75_mw", None)),
+            "powerMWQ90": _nullable_floats(_column(df, "p90_mw", None)),
+            "modelType": model_types.map(model_type_map).tolist(),
+            "modelVersion": _column(df, "model_version", "2.0").tolist(),
+            "horizonMinutes": (horizon_hours * 60).astype(int).tolist(),  # Convert to minutes
+            # Required enum fields with defaults
+            "resolution": _column(df, "resolution", "HOURLY").tolist(),  # ResolutionType of the engine grid
+            "forecastType": ["OPERATIONAL"] * count,  # Valid ForecastType enum value
+            "dataQuality": ["GOOD"] * count,  # Valid DataQuality enum value
+            # Weather parameters
+            "temperature": _nullable_floats(_column(df, "temp_air", None)),
+            "ghi": _nullable_floats(_column(df, "ghi", None)),
+            "dni": _nullable_floats(_column(df, "dni", None)),
+            "cloudCover": _nullable_floats(_column(df, "cloud_cover", None)),
+            "windSpeed": _nullable_floats(_column(df, "wind_speed", None)),
+            "qualityScore": _nullable_floats(_column(df, "quality_score", 0.95)),
+            "isValidated": [False] * count,  # Default validation status
+            "runId": [run_id] * count,  # Forecast run that produced the rows
+            "createdAt": [datetime.utcnow()] * count
+        }
+        return columns, skipped
 
     def _normalize_model_type(self, model_type: str) -> str:
         """Normalize model type to match database enum values"""
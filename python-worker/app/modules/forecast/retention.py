@@ -0,0 +1,189 @@
+"""Chunk-aware retention and compression for forecast and weather hypertables"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from .repositories import ForecastRepository
+
+logger = logging.getLogger(__name__)
+
+
+class StorageMaintenance:
+    """
+    Keeps forecasts, forecast_runs and weather_data within their retention.
+
+    - Chunks lying entirely past the cutoff are removed with drop_chunks
+      (a metadata operation, no per-row WAL).
+    - Rows past the cutoff in the chunk straddling it are removed with
+      batched DELETEs. Tables that are not hypertables only get batched DELETEs.
+    - Cold chunks get native compression through a TimescaleDB policy.
+    run(dry_run=True) reports what would be reclaimed without changing anything.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_report: Optional[Dict[str, Any]] = None
+
+    async def start(self) -> None:
+        """Apply compression policies and start the periodic retention loop"""
+        if settings.COMPRESSION_ENABLED:
+            await self.ensure_compression()
+        if settings.RETENTION_ENABLED:
+            self._task = asyncio.create_task(self._run_loop())
+            logger.info("Storage retention job started")
+
+    async def stop(self) -> None:
+        """Stop the retention loop (a run in progress is cancelled between batches)"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def ensure_compression(self) -> List[str]:
+        """Enable compression + policy on the managed hypertables; returns the tables covered"""
+        covered = []
+        async with AsyncSessionLocal() as db:
+            repo = ForecastRepository(db)
+            hypertables = await repo.get_hypertables()
+            for table in self._retention_days():
+                if table not in hypertables:
+                    continue
+                try:
+                    await repo.enable_compression(table, hypertables[table])
+                    covered.append(table)
+                except Exception as e:
+                    await db.rollback()
+                    logger.warning(f"Could not enable compression on {table}: {e}")
+        logger.info(f"Compression policies active on: {', '.join(covered) or 'none'}")
+        return covered
+
+    async def run(self, dry_run: bool = True) -> Dict[str, Any]:
+        """Apply (or with dry_run only report) retention on every managed table"""
+        async with self._lock:
+            now = datetime.utcnow()
+            tables = []
+            async with AsyncSessionLocal() as db:
+                repo = ForecastRepository(db)
+                hypertables = await repo.get_hypertables()
+                for table, days in self._retention_days().items():
+                    cutoff = now - timedelta(days=days)
+                    if table in hypertables:
+                        tables.append(await self._hypertable_retention(repo, table, cutoff, now, dry_run))
+                    else:
+                        tables.append(await self._plain_retention(repo, table, cutoff, dry_run))
+
+            report = {
+                "dry_run": dry_run,
+                "generated_at": now.isoformat(),
+                "tables": tables,
+                "reclaimable_bytes": sum(t["droppable_bytes"] for t in tables),
+                "estimated_compression_savings_bytes": sum(
+                    t["estimated_compression_savings_bytes"] or 0 for t in tables
+                )
+            }
+            if not dry_run:
+                self.last_report = report
+                logger.info(
+                    f"Retention dropped {sum(len(t['dropped_chunks']) for t in tables)} chunks and "
+                    f"deleted {sum(t['rows_deleted'] for t in tables)} rows"
+                )
+            return report
+
+    async def _hypertable_retention(
+        self,
+        repo: ForecastRepository,
+        table: str,
+        cutoff: datetime,
+        now: datetime,
+        dry_run: bool
+    ) -> Dict[str, Any]:
+        compress_before = now - timedelta(days=settings.COMPRESS_AFTER_DAYS)
+        chunks = await repo.get_chunks_before(table, max(cutoff, compress_before))
+
+        droppable = [c for c in chunks if c["range_end"] <= cutoff]
+        straddling = next((c for c in chunks if c["range_start"] < cutoff < c["range_end"]), None)
+        compressible = [
+            c for c in chunks
+            if not c["is_compressed"] and c["range_end"] <= compress_before and c["range_end"] > cutoff
+        ]
+
+        ratio = await repo.get_compression_ratio(table)
+        compressible_bytes = sum(c["total_bytes"] for c in compressible)
+
+        entry = {
+            "table": table,
+            "hypertable": True,
+            "cutoff": cutoff.isoformat(),
+            "droppable_chunks": len(droppable),
+            "droppable_bytes": sum(c["total_bytes"] for c in droppable),
+            "partial_rows": (
+                await repo.count_rows_before(table, cutoff, since=straddling["range_start"])
+                if straddling else 0
+            ),
+            "compressible_chunks": len(compressible),
+            "compressible_bytes": compressible_bytes,
+            # Based on the ratio achieved by chunks compressed so far
+            "estimated_compression_savings_bytes": (
+                int(compressible_bytes * (1 - ratio)) if ratio is not None else None
+            ),
+            "dropped_chunks": [],
+            "rows_deleted": 0
+        }
+
+        if not dry_run:
+            entry["dropped_chunks"] = await repo.drop_chunks_before(table, cutoff)
+            if straddling:
+                entry["rows_deleted"] = await repo.delete_rows_before(table, cutoff)
+
+        return entry
+
+    async def _plain_retention(
+        self,
+        repo: ForecastRepository,
+        table: str,
+        cutoff: datetime,
+        dry_run: bool
+    ) -> Dict[str, Any]:
+        entry = {
+            "table": table,
+            "hypertable": False,
+            "cutoff": cutoff.isoformat(),
+            "droppable_chunks": 0,
+            "droppable_bytes": 0,
+            "partial_rows": await repo.count_rows_before(table, cutoff),
+            "compressible_chunks": 0,
+            "compressible_bytes": 0,
+            "estimated_compression_savings_bytes": None,
+            "dropped_chunks": [],
+            "rows_deleted": 0
+        }
+        if not dry_run:
+            entry["rows_deleted"] = await repo.delete_rows_before(table, cutoff)
+        return entry
+
+    def _retention_days(self) -> Dict[str, int]:
+        days = {
+            "forecasts": settings.FORECAST_RETENTION_DAYS,
+            "weather_data": settings.WEATHER_RETENTION_DAYS
+        }
+        # forecast_runs only exists in append storage mode
+        if settings.FORECAST_STORAGE_MODE == "append":
+            days["forecast_runs"] = settings.FORECAST_RETENTION_DAYS
+        return days
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.run(dry_run=False)
+            except Exception as e:
+                logger.error(f"Retention run failed: {e}", exc_info=True)
+            await asyncio.sleep(settings.RETENTION_INTERVAL_HOURS * 3600)
+
+
+# Global instance
+storage_maintenance = StorageMaintenance()
@@ -1,23 +1,32 @@
 """Forecast service - business logic layer"""
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
 import numpy as np
+import base64
+import json
 import uuid
 import asyncio
 import pandas as pd
 import logging
 
-from .repositories import ForecastRepository
+from .repositories import ForecastRepository, ROLLUP_RESOLUTIONS
+from .location_cache import location_cache
+from .sink import forecast_sink
+from .weather_sync import weather_sync_coordinator
 from .models_api import ForecastTaskResponse, ForecastAccuracyResponse
+from .utils.time_resolution import resolution_frequency
 from app.modules.ml_models.services import MLModelService
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.job_scheduler import job_scheduler, PRIORITY_CLASSES
 from app.core.task_manager import task_manager
 # Weather service removed - now using SvelteKit API via repository
 
 # Import the real forecast engine (NO CLASSES - pure functions)
 try:
-    from .core.unified_forecast import run_unified_forecast
+    from .core.unified_forecast import run_unified_forecast, run_mixed_resolution_forecast
     REAL_FORECAST_AVAILABLE = True
 except ImportError:
     REAL_FORECAST_AVAILABLE = False
@@ -25,6 +34,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Task states after which no further progress events are published
+TERMINAL_TASK_STATUSES = ("completed", "failed", "cancelled")
+
+# Resolutions read from stored rows; coarser ones come from the rollups
+STORED_READ_RESOLUTIONS = ("FIVE_MINUTES", "FIFTEEN_MINUTES")
+
 
 class ForecastService:
     """Service layer for forecast business logic"""
@@ -40,17 +55,46 @@ class ForecastService:
 
     async def validate_location(self, location_id: str) -> bool:
         """Validate if location exists and is active (database-driven)"""
+        # Warms the config cache so the queued task does not re-read the location
+        return await self.get_location_config(location_id) is not None
+
+    async def get_location_config(self, location_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Parsed location and its forecast config, shared through the location cache"""
+        return await location_cache.get(
+            location_id,
+            load=self._load_location_config,
+            updated_at=self.repo.get_location_updated_at
+        )
+
+    async def _load_location_config(self, location_id: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
         location = await self.repo.get_location_full(location_id)
-        return location is not None
+        if not location:
+            return None
+        return location, self.repo.build_config_from_location(location)
 
     async def queue_forecast_generation(
         self,
         location_id: str,
         horizon_hours: int = 48,
-        model_type: str = "PHYSICS"
+        model_type: str = "PHYSICS",
+        batch_id: Optional[str] = None,
+        priority: str = "interactive",
+        client_id: Optional[Any] = None,
+        task_id: Optional[str] = None,
+        resolution: Optional[str] = None
     ) -> str:
-        """Queue a forecast generation task"""
-        task_id = str(uuid.uuid4())
+        """Queue a forecast generation task on the priority job scheduler
+
+        task_id is only passed when resuming a checkpointed task, so clients
+        polling the original ID keep working after a restart.
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"priority must be one of {PRIORITY_CLASSES}, got: {priority}")
+
+        resolution = resolution or settings.FORECAST_RESOLUTION
+        resolution_frequency(resolution)
+
+        task_id = task_id or str(uuid.uuid4())
 
         task_data = {
             "id": task_id,
@@ -58,18 +102,36 @@ class ForecastService:
             "location_id": location_id,
             "horizon_hours": horizon_hours,
             "model_type": model_type,
+            "resolution": resolution,
             "created_at": datetime.utcnow(),
             "progress": 0,
             "result": None,
-            "error": None
+            "error": None,
+            "batch_id": batch_id,
+            "priority": priority,
+            "client_id": client_id
         }
 
         # Add to global task manager
         task_manager.add_task(task_id, task_data)
-        logger.info(f"Queued task {task_id} for location {location_id}")
+        await job_scheduler.submit(
+            task_id,
+            client_id=client_id,
+            priority=priority,
+            location_id=location_id,
+            horizon_hours=horizon_hours,
+            model_type=model_type,
+            resolution=resolution,
+            batch_id=batch_id
+        )
+        logger.info(f"Queued task {task_id} for location {location_id} ({priority})")
 
         return task_id
 
+    async def get_location_client_ids(self, location_ids: List[str]) -> Dict[str, Any]:
+        """Owning clientId per location (fair-share key for the scheduler)"""
+        return await self.repo.get_location_client_ids(location_ids)
+
     async def process_forecast_task(self, task_id: str) -> None:
         """Process forecast generation task using database-driven approach"""
         task = task_manager.get_task(task_id)
@@ -77,21 +139,25 @@ class ForecastService:
             logger.error(f"Task {task_id} not found in task manager")
             return
 
+        if task["status"] == "cancelled":
+            logger.info(f"Task {task_id} was cancelled before it started")
+            return
+
         try:
             # Update status
             task_manager.update_task(task_id, {"status": "processing", "progress": 10})
             logger.info(f"Starting forecast task {task_id} for location {task['location_id']}")
 
-            # 1. Get location from database (not YAML)
-            location = await self.repo.get_location_full(task["location_id"])
-            if not location:
+            # 1. Get location from database (not YAML), cached with its config
+            location_config = await self.get_location_config(task["location_id"])
+            if not location_config:
                 raise ValueError(f"Location {task['location_id']} not found in database")
+            location, config = location_config
 
             task_manager.update_task(task_id, {"progress": 20})
             logger.info(f"Location loaded: {location['name']} ({location['capacityMW']} MW)")
 
-            # 2. Build config from database fields
-            config = self.repo.build_config_from_location(location)
+            # 2. Config was built from database fields when the location was loaded
 
             task_manager.update_task(task_id, {"progress": 30})
 
@@ -101,6 +167,15 @@ class ForecastService:
                 hours=task["horizon_hours"]  # Get forecast horizon weather data
             )
 
+            # Missing/short weather: sync it (coalesced with other forecasts) and re-read
+            if settings.WEATHER_SYNC_ON_MISSING and _weather_window_short(weather_df, task["horizon_hours"]):
+                logger.info(f"Weather window short for location {task['location_id']}, requesting sync")
+                if await weather_sync_coordinator.request_sync(task["location_id"]):
+                    weather_df = await self.repo.get_future_weather(
+                        location_id=task["location_id"],
+                        hours=task["horizon_hours"]
+                    )
+
             if weather_df.empty:
                 raise ValueError(f"No weather data found for location {task['location_id']}")
 
@@ -138,24 +213,38 @@ class ForecastService:
                 else:
                     forecast_type = "physics"  # Default to physics
 
-                # Import time resolution utilities
-                from .utils.time_resolution import resample_weather_to_15min, resample_forecast_to_15min
-
-                # Resample weather data to 15-minute intervals
-                logger.info(f"Resampling weather data to 15-minute intervals")
-                weather_15min = resample_weather_to_15min(weather_df)
-
-                logger.info(f"Running {forecast_type} forecast with unified engine")
-                forecast_df = run_unified_forecast(
-                    weather_data=weather_15min,
-                    config=config,
-                    forecast_type=forecast_type,
-                    client_id=location_code
-                )
-
-                # Ensure forecast is at 15-minute intervals
-                if not forecast_df.empty:
-                    forecast_df = resample_forecast_to_15min(forecast_df)
+                # The engine resamples weather onto the output grid itself and
+                # guarantees its output is on that grid
+                resolution = task.get("resolution") or settings.FORECAST_RESOLUTION
+                mixed = _uses_mixed_resolution(resolution, task["horizon_hours"])
+
+                grid = resolution
+                if mixed:
+                    grid += f", {settings.FORECAST_COARSE_RESOLUTION} after {settings.FORECAST_MIXED_CUTOVER_HOURS}h"
+                logger.info(f"Running {forecast_type} forecast with unified engine ({grid})")
+                # CPU-bound engine runs off the event loop so concurrent jobs,
+                # status streams and interactive requests stay responsive
+                if mixed:
+                    forecast_df = await asyncio.to_thread(
+                        run_mixed_resolution_forecast,
+                        weather_data=weather_df,
+                        config=config,
+                        forecast_type=forecast_type,
+                        client_id=location_code,
+                        fine_resolution=resolution,
+                        coarse_resolution=settings.FORECAST_COARSE_RESOLUTION,
+                        cutover_hours=settings.FORECAST_MIXED_CUTOVER_HOURS
+                    )
+                else:
+                    forecast_df = await asyncio.to_thread(
+                        run_unified_forecast,
+                        weather_data=weather_df,
+                        config=config,
+                        forecast_type=forecast_type,
+                        client_id=location_code,
+                        target_resolution=resolution
+                    )
+                    forecast_df['resolution'] = resolution
 
                 # Add model metadata to forecast - use the ACTUAL model type requested
                 forecast_df['model_type'] = requested_model_type
@@ -224,16 +313,33 @@ class ForecastService:
                     )
 
             # 6. Save to database using TimescaleDB bulk operations
-            saved_count = await self.repo.bulk_save_forecasts(
-                location_id=task["location_id"],
-                forecasts=forecast_df
-            )
+            # The task ID doubles as runId so append-mode runs trace back to their task
+            columns, _ = self.repo.prepare_forecast_rows(task["location_id"], forecast_df, run_id=task_id)
+            if settings.FORECAST_SINK_ENABLED and task.get("priority") != "interactive":
+                # Write-behind: rows join other jobs' rows in one merge transaction and
+                # the task only completes once that flush has committed
+                task_manager.update_task(task_id, {"progress": 90})
+                rows_written, rows_unchanged = await forecast_sink.write(columns)
+            else:
+                rows_written, rows_unchanged = await self.repo.merge_forecast_rows(columns)
+            saved_count = rows_written + rows_unchanged
+
+            # Fine rows an earlier run stored past the cut-over are not overwritten
+            # by the coarse rows, so they are removed
+            coarse = forecast_df[forecast_df['resolution'] != resolution]
+            if len(coarse) and settings.FORECAST_STORAGE_MODE != "append":
+                await self.repo.delete_forecasts_off_grid(
+                    task["location_id"], coarse.index[0], coarse.index[-1], coarse.index
+                )
 
             task_manager.update_task(task_id, {
                 "progress": 100,
                 "status": "completed",
                 "result": {
                 "forecast_count": saved_count,
+                "rows_written": rows_written,
+                "rows_unchanged": rows_unchanged,
+                "run_id": task_id,
                 "start_time": forecast_df.index[0].isoformat() if len(forecast_df) > 0 else None,
                 "end_time": forecast_df.index[-1].isoformat() if len(forecast_df) > 0 else None,
                 "model_type": forecast_df.iloc[0]['model_type'] if len(forecast_df) > 0 else None,
@@ -242,8 +348,20 @@ class ForecastService:
                 }
             })
 
-            logger.info(f"Task {task_id} completed successfully: {saved_count} forecasts saved")
+            logger.info(
+                f"Task {task_id} completed successfully: {saved_count} forecasts saved "
+                f"({rows_written} written, {rows_unchanged} unchanged)"
+            )
 
+        except asyncio.CancelledError:
+            # Cancelled through the job scheduler (cancel or shutdown drain): report
+            # a terminal status so event subscribers are not left waiting
+            task_manager.update_task(task_id, {
+                "status": "cancelled",
+                "error": "Task cancelled while running"
+            })
+            logger.info(f"Task {task_id} cancelled while running")
+            raise
         except Exception as e:
             task_manager.update_task(task_id, {
                 "status": "failed",
@@ -260,6 +378,67 @@ class ForecastService:
             logger.warning(f"Task {task_id} not found when getting status")
             return None
 
+        return self._to_task_response(task)
+
+    async def stream_task_events(
+        self,
+        task_ids: List[str],
+        heartbeat_seconds: float = 15.0
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (event, payload) pairs for task progress transitions.
+
+        Emits the current state of every task first, then one "progress" event per
+        update pushed by the task manager, a "result" event when a task reaches
+        completed/failed, and a final "batch_complete" summary once every task is
+        terminal. Yields ("heartbeat", {}) when nothing happened for a while so
+        proxies keep the connection open.
+        """
+        queue = task_manager.subscribe(task_ids)
+        try:
+            pending = set()
+            summary = {"completed": 0, "failed": 0, "cancelled": 0, "missing": 0}
+
+            # Initial snapshot - subscribed first so no transition is missed
+            for task_id in task_ids:
+                task = task_manager.get_all_tasks().get(task_id)
+                if task is None:
+                    summary["missing"] += 1
+                    yield "error", {"task_id": task_id, "error": "Task not found"}
+                    continue
+                response = self._to_task_response(task).model_dump()
+                if task["status"] in TERMINAL_TASK_STATUSES:
+                    summary[task["status"]] += 1
+                    yield "result", response
+                else:
+                    pending.add(task_id)
+                    yield "progress", response
+
+            while pending:
+                try:
+                    task_id, task = await asyncio.wait_for(queue.get(), timeout=heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield "heartbeat", {}
+                    continue
+
+                if task_id not in pending:
+                    continue
+
+                response = self._to_task_response(task).model_dump()
+                if task["status"] in TERMINAL_TASK_STATUSES:
+                    pending.discard(task_id)
+                    summary[task["status"]] += 1
+                    yield "result", response
+                else:
+                    yield "progress", response
+
+            if len(task_ids) > 1:
+                yield "batch_complete", {"total": len(task_ids), **summary}
+        finally:
+            task_manager.unsubscribe(queue, task_ids)
+
+    def _to_task_response(self, task: Dict[str, Any]) -> ForecastTaskResponse:
+        """Convert a task manager entry to the API response model"""
         return ForecastTaskResponse(
             task_id=task["id"],
             status=task["status"],
@@ -267,7 +446,8 @@ class ForecastService:
             progress=task["progress"],
             result=task["result"],
             error=task["error"],
-            estimated_time_seconds=max(0, 30 - (task["progress"] / 100 * 30))
+            estimated_time_seconds=max(0, 30 - (task["progress"] / 100 * 30)),
+            batch_id=task.get("batch_id")
         )
 
     async def get_forecasts(
@@ -275,13 +455,111 @@ class ForecastService:
         location_id: str,
         start_time: datetime,
         end_time: datetime,
-        model_type: Optional[str] = None
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None
     ) -> List[Dict]:
-        """Get forecasts for a location within time range"""
+        """Get forecasts for a location within time range (latest run unless run_id is given)"""
         return await self.repo.get_forecasts_range(
             location_id=location_id,
             start_time=start_time,
             end_time=end_time,
+            model_type=model_type,
+            run_id=run_id
+        )
+
+    async def get_forecasts_at_resolution(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        resolution: str,
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get forecasts at a ResolutionType resolution.
+
+        FIVE_MINUTES and FIFTEEN_MINUTES return the rows stored on that grid
+        (by their resolution column); HOURLY/DAILY are read from the rollups.
+        Raises ValueError for other resolutions.
+        """
+        if resolution in STORED_READ_RESOLUTIONS:
+            return await self.repo.get_forecasts_range(
+                location_id=location_id,
+                start_time=start_time,
+                end_time=end_time,
+                model_type=model_type,
+                run_id=run_id,
+                resolution=resolution
+            )
+
+        if resolution not in ROLLUP_RESOLUTIONS:
+            raise ValueError(
+                f"Unsupported resolution '{resolution}', expected one of "
+                f"{sorted(STORED_READ_RESOLUTIONS + tuple(ROLLUP_RESOLUTIONS))}"
+            )
+
+        return await self.repo.get_forecast_rollup(
+            location_id=location_id,
+            start_time=start_time,
+            end_time=end_time,
+            resolution=resolution,
+            model_type=model_type,
+            run_id=run_id
+        )
+
+    async def get_forecasts_page(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        limit: int,
+        cursor: Optional[str] = None,
+        model_type: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resolution: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of forecasts in timestamp order, optionally only the rows
+        stored on a STORED_READ_RESOLUTIONS grid.
+
+        Returns (forecasts, next cursor); the cursor is None on the last page.
+        Raises ValueError for a malformed cursor or an unpageable resolution.
+        """
+        if resolution is not None and resolution not in STORED_READ_RESOLUTIONS:
+            raise ValueError(f"Pagination is only supported for {' and '.join(STORED_READ_RESOLUTIONS)} reads")
+        after = decode_forecast_cursor(cursor) if cursor else None
+
+        # One extra row tells whether another page exists
+        forecasts = await self.repo.get_forecasts_range(
+            location_id=location_id,
+            start_time=start_time,
+            end_time=end_time,
+            model_type=model_type,
+            run_id=run_id,
+            after=after,
+            limit=limit + 1,
+            resolution=resolution
+        )
+
+        if len(forecasts) <= limit:
+            return forecasts, None
+
+        forecasts = forecasts[:limit]
+        return forecasts, encode_forecast_cursor(forecasts[-1]["time"])
+
+    async def get_forecasts_bulk(
+        self,
+        location_ids: List[str],
+        start_time: datetime,
+        end_time: datetime,
+        model_type: Optional[str] = None
+    ) -> Dict[str, Dict[str, list]]:
+        """Get forecasts of many locations within a time range in one query"""
+        return await self.repo.get_forecasts_range_bulk(
+            location_ids=list(dict.fromkeys(location_ids)),
+            start_time=start_time,
+            end_time=end_time,
             model_type=model_type
         )
 
@@ -298,3 +576,121 @@ class ForecastService:
             location_id=location_id,
             before_date=before_date
         )
+
+
+async def run_forecast_task(task_id: str) -> None:
+    """Process a queued task with its own DB session (work started outside a request)"""
+    async with AsyncSessionLocal() as db:
+        await ForecastService(db).process_forecast_task(task_id)
+
+
+def _uses_mixed_resolution(resolution: str, horizon_hours: int) -> bool:
+    """Whether a run gets a coarse grid after FORECAST_MIXED_CUTOVER_HOURS"""
+    if not settings.FORECAST_MIXED_RESOLUTION or horizon_hours <= settings.FORECAST_MIXED_CUTOVER_HOURS:
+        return False
+    coarse = pd.Timedelta(resolution_frequency(settings.FORECAST_COARSE_RESOLUTION))
+    return coarse > pd.Timedelta(resolution_frequency(resolution))
+
+
+def _weather_window_short(weather_df: pd.DataFrame, horizon_hours: int) -> bool:
+    """True when weather covers less than WEATHER_SYNC_MIN_COVERAGE of the horizon"""
+    if weather_df.empty:
+        return True
+    covered_until = datetime.utcnow() + timedelta(hours=horizon_hours * settings.WEATHER_SYNC_MIN_COVERAGE)
+    return weather_df.index.max() < covered_until
+
+
+def encode_forecast_cursor(timestamp: datetime) -> str:
+    """Opaque keyset cursor pointing after the given forecast timestamp"""
+    payload = json.dumps({"after": timestamp.isoformat()}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_forecast_cursor(cursor: str) -> datetime:
+    """Timestamp of an encode_forecast_cursor token; ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["after"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+async def stream_forecasts(
+    location_id: str,
+    start_time: datetime,
+    end_time: datetime,
+    model_type: Optional[str] = None,
+    run_id: Optional[str] = None
+) -> AsyncIterator[Dict]:
+    """
+    Forecasts of a range from a server-side cursor.
+
+    Uses its own session: a streamed response outlives the request-scoped one.
+    """
+    async with AsyncSessionLocal() as db:
+        async for forecast in ForecastRepository(db).stream_forecasts_range(
+            location_id=location_id,
+            start_time=start_time,
+            end_time=end_time,
+            model_type=model_type,
+            run_id=run_id
+        ):
+            yield forecast
+
+
+async def checkpoint_jobs(jobs: List[Dict[str, Any]]) -> int:
+    """Persist unfinished job specs at shutdown so the next start can resume them"""
+    if not jobs:
+        return 0
+
+    async with AsyncSessionLocal() as db:
+        repo = ForecastRepository(db)
+        await repo.ensure_job_checkpoint_table()
+        saved = await repo.save_job_checkpoints(jobs)
+
+    logger.info(f"Checkpointed {saved} unfinished forecast jobs")
+    return saved
+
+
+async def resume_checkpointed_jobs() -> int:
+    """Claim checkpointed jobs and queue them again under their original task IDs"""
+    async with AsyncSessionLocal() as db:
+        repo = ForecastRepository(db)
+        await repo.ensure_job_checkpoint_table()
+        # Rows are deleted as they are claimed, so concurrently starting
+        # replicas never resume the same job twice
+        jobs = await repo.claim_job_checkpoints()
+
+        service = ForecastService(db)
+        failed = []
+        for job in jobs:
+            try:
+                await service.queue_forecast_generation(
+                    location_id=job["location_id"],
+                    horizon_hours=job["horizon_hours"],
+                    model_type=job["model_type"],
+                    batch_id=job["batch_id"],
+                    priority=job["priority"],
+                    client_id=job["client_id"],
+                    task_id=job["task_id"],
+                    resolution=job["resolution"]
+                )
+            except Exception as e:
+                logger.error(f"Failed to resume checkpointed job {job['task_id']}: {e}")
+                failed.append(job)
+
+        if failed:
+            # Claimed rows are gone: put back the jobs that did not make it into
+            # the queue so the next start retries them
+            try:
+                await repo.save_job_checkpoints(failed)
+            except Exception as e:
+                logger.error(
+                    f"Lost {len(failed)} checkpointed jobs: {[job['task_id'] for job in failed]} ({e})"
+                )
+
+    resumed = len(jobs) - len(failed)
+    if jobs:
+        logger.info(f"Resumed {resumed} checkpointed forecast jobs ({len(failed)} checkpointed again)")
+    return resumed
@@ -0,0 +1,155 @@
+"""Write-behind buffer that lands forecast rows from many jobs in one transaction"""
+
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from .fingerprints import forecast_fingerprints
+from .repositories import ForecastRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ForecastWriteSink:
+    """
+    Buffers prepared forecast rows and merges them in a single COPY + upsert.
+
+    Each writer awaits a future that resolves only after the flush containing
+    its rows has committed, so a task is never reported completed before its
+    forecasts are durable. A flush happens when FORECAST_SINK_MAX_ROWS rows are
+    buffered or every FORECAST_SINK_FLUSH_SECONDS, whichever comes first.
+    """
+
+    def __init__(self):
+        self._pending: List[Tuple[Dict[str, list], asyncio.Future]] = []
+        self._pending_rows = 0
+        self._flushing: List[Tuple[Dict[str, list], asyncio.Future]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start the periodic flusher"""
+        self._flusher = asyncio.create_task(self._run())
+        logger.info("Forecast write-behind sink started")
+
+    async def stop(self) -> None:
+        """Stop the flusher and land whatever is still buffered"""
+        if self._flusher:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    async def write(self, columns: Dict[str, list]) -> Tuple[int, int]:
+        """
+        Buffer rows from ForecastRepository.prepare_forecast_rows.
+
+        Returns (rows written, rows unchanged) once they are committed.
+        """
+        if not columns:
+            return 0, 0
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((columns, future))
+        self._pending_rows += len(columns["id"])
+        if self._pending_rows >= settings.FORECAST_SINK_MAX_ROWS:
+            self._wakeup.set()
+
+        return await future
+
+    def pending_rows(self) -> int:
+        """Rows buffered and not yet flushed"""
+        return self._pending_rows
+
+    def buffered_run_ids(self) -> Set[str]:
+        """
+        Run (task) IDs with rows buffered or in a flush still running.
+
+        Those rows are landed by stop(), so a drained job in this set must not
+        also be checkpointed and recomputed.
+        """
+        return {
+            columns["runId"][0]
+            for columns, _ in self._pending + self._flushing
+            if columns.get("runId")
+        }
+
+    async def flush(self) -> int:
+        """Merge all buffered rows in one transaction and acknowledge their writers"""
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            self._pending_rows = 0
+            if not batch:
+                return 0
+            self._flushing = batch
+            try:
+                return await self._merge(batch)
+            finally:
+                self._flushing = []
+
+    async def _merge(self, batch: List[Tuple[Dict[str, list], asyncio.Future]]) -> int:
+        """Write one flush batch and resolve its writers' futures"""
+        # Unchanged rows are acknowledged without being rewritten
+        splits = [forecast_fingerprints.split_unchanged(columns) for columns, _ in batch]
+        changed = [rows for rows, _ in splits if rows["id"]]
+
+        try:
+            saved = 0
+            if changed:
+                merged = _merge_columns(changed)
+                async with AsyncSessionLocal() as db:
+                    saved = await ForecastRepository(db).write_forecast_rows(merged)
+                forecast_fingerprints.remember(merged)
+        except Exception as e:
+            logger.error(f"Forecast sink flush of {len(batch)} writes failed: {e}", exc_info=True)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return 0
+
+        for (_, future), (rows, unchanged) in zip(batch, splits):
+            if not future.done():
+                future.set_result((len(rows["id"]), unchanged))
+
+        logger.info(f"Forecast sink flushed {saved} rows from {len(batch)} writes")
+        return saved
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.FORECAST_SINK_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+
+def _merge_columns(batches: List[Dict[str, list]]) -> Dict[str, list]:
+    """
+    Concatenate column batches; for a repeated row key the later write wins.
+
+    The key is (timestamp, location) in upsert mode. Append mode keeps every
+    run, so there the runId is part of the key.
+    """
+    merged = {name: [] for name in batches[0]}
+    for columns in batches:
+        for name, values in columns.items():
+            merged[name].extend(values)
+
+    if settings.FORECAST_STORAGE_MODE == "append" and "runId" in merged:
+        keys = list(zip(merged["runId"], merged["timestamp"], merged["locationId"]))
+    else:
+        keys = list(zip(merged["timestamp"], merged["locationId"]))
+    last_index = {key: i for i, key in enumerate(keys)}
+    if len(last_index) < len(keys):
+        keep = sorted(last_index.values())
+        merged = {name: [values[i] for i in keep] for name, values in merged.items()}
+
+    return merged
+
+
+# Global instance
+forecast_sink = ForecastWriteSink()
@@ -1,6 +1,13 @@
 """Forecast utilities module"""
 
+from .resampling import GridResampler, ResamplePlan, grid_resampler
 from .time_resolution import (
+    RESOLUTION_FREQUENCIES,
+    resolution_frequency,
+    is_on_grid,
+    mixed_resolution_segments,
+    resample_weather,
+    resample_forecast,
     resample_weather_to_15min,
     resample_forecast_to_15min,
     aggregate_15min_to_hourly,
@@ -8,6 +15,15 @@ from .time_resolution import (
 )
 
 __all__ = [
+    'GridResampler',
+    'ResamplePlan',
+    'grid_resampler',
+    'RESOLUTION_FREQUENCIES',
+    'resolution_frequency',
+    'is_on_grid',
+    'mixed_resolution_segments',
+    'resample_weather',
+    'resample_forecast',
     'resample_weather_to_15min',
     'resample_forecast_to_15min',
     'aggregate_15min_to_hourly',
@@ -0,0 +1,264 @@
+"""
+Whole-frame resampling with cached interpolation plans
+
+Every numeric column sharing an interpolation method is resampled at once
+as a 2-D array. The weights mapping a source grid onto a target grid are
+computed once per (method, source timestamps, target grid) and reused, so
+a batch of locations on the same hourly weather grid pays for them once.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.interpolate import CubicSpline
+
+from app.core.config import settings
+
+INTERPOLATION_METHODS = ("linear", "cubic", "ffill")
+
+# Above this many target x source weights cubic plans keep only the spline
+# knots and solve per call instead of caching a dense weight matrix
+_MAX_DENSE_WEIGHTS = 2_000_000
+
+
+class ResamplePlan:
+    """
+    Interpolation weights from one source grid onto one target grid.
+
+    Source timestamps may be irregular; interpolation happens in real time,
+    not on grid positions. Targets outside the source span, or inside a
+    source gap longer than max_gap, come out as NaN.
+    """
+
+    def __init__(
+        self,
+        method: str,
+        source: np.ndarray,
+        target: np.ndarray,
+        max_gap: Optional[np.int64] = None
+    ):
+        if method not in INTERPOLATION_METHODS:
+            raise ValueError(f"Unknown interpolation method '{method}'")
+        if method == "cubic" and len(source) < 4:
+            # A not-a-knot spline needs four points; pandas raises here
+            method = "linear"
+
+        self.method = method
+        x = (source - source[0]) / 1e9
+        t = (target - source[0]) / 1e9
+        self._x = x
+        self._t = t
+
+        # Source segment [left, right] around each target point
+        if len(x) > 1:
+            right = np.clip(np.searchsorted(x, t, side="right"), 1, len(x) - 1)
+            left = right - 1
+        else:
+            left = right = np.zeros(len(t), dtype=np.intp)
+
+        valid = (t >= x[0]) & (t <= x[-1])
+        if max_gap is not None and len(x) > 1:
+            gap = (source[right] - source[left]) > max_gap
+            on_point = (t == x[left]) | (t == x[right])
+            valid &= ~gap | on_point
+        self.valid = valid
+
+        if method == "ffill":
+            self.index = np.where(t >= x[-1], len(x) - 1, left)
+        elif method == "linear":
+            span = x[right] - x[left]
+            self.left = left
+            self.right = right
+            self.weight = np.divide(t - x[left], span, out=np.zeros_like(t), where=span > 0)
+        else:
+            self.matrix = None
+            if len(t) * len(x) <= _MAX_DENSE_WEIGHTS:
+                # Spline values are linear in the knot values: interpolating the
+                # identity yields the weight of every source point at every target
+                self.matrix = CubicSpline(x, np.eye(len(x)), axis=0)(t)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the plan's arrays (dominated by a dense cubic matrix)"""
+        arrays = [self._x, self._t, self.valid]
+        if self.method == "ffill":
+            arrays.append(self.index)
+        elif self.method == "linear":
+            arrays += [self.left, self.right, self.weight]
+        elif self.matrix is not None:
+            arrays.append(self.matrix)
+        return sum(array.nbytes for array in arrays)
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        """Resample a (source rows x columns) array onto the target grid"""
+        if self.method == "ffill":
+            result = values[self.index]
+        elif self.method == "linear":
+            w = self.weight[:, None]
+            result = values[self.left] * (1 - w) + values[self.right] * w
+        elif self.matrix is not None:
+            result = self.matrix @ values
+        else:
+            result = CubicSpline(self._x, values, axis=0)(self._t)
+
+        if not self.valid.all():
+            result = result.astype(float if result.dtype.kind != "O" else object, copy=True)
+            result[~self.valid] = np.nan
+        return result
+
+
+class GridResampler:
+    """
+    Resamples DataFrames onto regular grids through cached ResamplePlans.
+
+    Columns are grouped by method and, within a method, by which source rows
+    are missing, so each group is one array operation over a plan fitted to
+    the rows it actually has (as pandas interpolate does per column).
+
+    The plan cache is bounded by entry count and by the total bytes of the
+    plans (cubic plans hold a dense weight matrix of up to 16 MB); least
+    recently used plans go first, and a plan larger than the byte budget
+    is used once without being cached.
+    """
+
+    def __init__(self, max_plans: int = 256, max_bytes: Optional[int] = None):
+        self.max_plans = max_plans
+        self.max_bytes = max_bytes
+        self._plans: "OrderedDict[Tuple, ResamplePlan]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def target_grid(self, index: pd.DatetimeIndex, freq: str) -> pd.DatetimeIndex:
+        """Regular grid on freq boundaries covering the span of index"""
+        return pd.date_range(start=index[0].ceil(freq), end=index[-1].floor(freq), freq=freq)
+
+    def resample(
+        self,
+        df: pd.DataFrame,
+        methods: Dict[str, List[str]],
+        freq: str = "15min",
+        default_method: str = "linear",
+        max_gap: Optional[pd.Timedelta] = None,
+        target: Optional[pd.DatetimeIndex] = None
+    ) -> pd.DataFrame:
+        """
+        Resample df onto `target` (default: its span on a `freq` grid).
+
+        methods maps a method name to the columns using it; other numeric
+        columns use default_method and non-numeric columns are forward filled.
+        """
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        if target is None:
+            target = self.target_grid(df.index, freq)
+
+        source = df.index.asi8
+        target_ns = target.asi8
+        gap_ns = np.int64(max_gap.value) if max_gap is not None else None
+
+        column_methods = {}
+        for method, columns in methods.items():
+            for column in columns:
+                column_methods[column] = method
+
+        groups: Dict[str, List[str]] = {}
+        for column in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[column]):
+                method = "ffill"
+            else:
+                method = column_methods.get(column, default_method)
+            groups.setdefault(method, []).append(column)
+
+        resampled = {}
+        for method, columns in groups.items():
+            values = df[columns].to_numpy(dtype=None if method == "ffill" else float)
+            for mask, positions in self._missing_patterns(values, method):
+                rows = np.flatnonzero(~mask)
+                if len(rows) == 0:
+                    for position in positions:
+                        resampled[columns[position]] = np.full(len(target_ns), np.nan)
+                    continue
+                plan = self.plan(method, source[rows], target_ns, gap_ns)
+                block = plan.apply(values[np.ix_(rows, positions)])
+                for i, position in enumerate(positions):
+                    resampled[columns[position]] = block[:, i]
+
+        return pd.DataFrame(resampled, index=target, columns=list(df.columns))
+
+    def plan(
+        self,
+        method: str,
+        source: np.ndarray,
+        target: np.ndarray,
+        max_gap: Optional[np.int64] = None
+    ) -> ResamplePlan:
+        """Cached plan for (method, source timestamps, target grid)"""
+        key = (method, source.tobytes(), target.tobytes(), None if max_gap is None else int(max_gap))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        plan = ResamplePlan(method, source, target, max_gap)
+        max_bytes = self._max_bytes()
+        size = plan.nbytes
+        if size > max_bytes:
+            return plan
+
+        with self._lock:
+            previous = self._plans.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._plans[key] = plan
+            self._bytes += size
+            while len(self._plans) > self.max_plans or self._bytes > max_bytes:
+                _, evicted = self._plans.popitem(last=False)
+                self._bytes -= evicted.nbytes
+        return plan
+
+    def memory_bytes(self) -> int:
+        """Bytes held by cached plans"""
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _max_bytes(self) -> int:
+        return self.max_bytes if self.max_bytes is not None else settings.RESAMPLE_PLAN_CACHE_MAX_BYTES
+
+    def _missing_patterns(
+        self,
+        values: np.ndarray,
+        method: str
+    ) -> Iterable[Tuple[np.ndarray, List[int]]]:
+        """(missing-row mask, column positions) groups of columns missing the same rows"""
+        if method == "ffill":
+            # Forward fill carries missing values like pandas does
+            yield np.zeros(len(values), dtype=bool), list(range(values.shape[1]))
+            return
+
+        missing = np.isnan(values)
+        if not missing.any():
+            yield np.zeros(len(values), dtype=bool), list(range(values.shape[1]))
+            return
+
+        patterns: Dict[bytes, List[int]] = {}
+        for position in range(values.shape[1]):
+            patterns.setdefault(missing[:, position].tobytes(), []).append(position)
+        for positions in patterns.values():
+            yield missing[:, positions[0]], positions
+
+
+# Global instance
+grid_resampler = GridResampler()
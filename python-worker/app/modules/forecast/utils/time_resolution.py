@@ -5,132 +5,187 @@ Handles conversion between hourly and 15-minute intervals
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Literal
+from typing import List, Optional, Literal, Tuple
 from datetime import datetime, timedelta
 
-def resample_weather_to_15min(weather_df: pd.DataFrame) -> pd.DataFrame:
+from .resampling import grid_resampler
+
+# Weather variables by interpolation method (others are interpolated linearly)
+WEATHER_RESAMPLE_METHODS = {
+    # Meteorological variables
+    'linear': ['temp_air', 'temperature', 'humidity', 'pressure', 'wind_speed'],
+    # Solar radiation: cubic for smooth curves
+    'cubic': ['ghi', 'dni', 'dhi', 'gti'],
+    # Categorical-like variables
+    'ffill': ['cloud_cover']
+}
+SOLAR_VARS = ['ghi', 'dni', 'dhi', 'gti']
+
+# Forecast variables by interpolation method (metadata is forward filled)
+FORECAST_RESAMPLE_METHODS = {
+    # Power/energy, confidence bounds and quantiles: cubic for smooth power curves
+    'cubic': ['prediction', 'power_mw', 'power_kw', 'energy_mwh',
+              'p10', 'p25', 'p50', 'p75', 'p90',
+              'uncertainty_lower', 'uncertainty_upper',
+              'confidence_lower', 'confidence_upper'],
+    'ffill': ['model_type', 'model_version', 'location_id']
+}
+
+
+def _with_datetime_index(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    if not isinstance(df.index, pd.DatetimeIndex):
+        if 'timestamp' in df.columns:
+            return df.set_index('timestamp')
+        raise ValueError(f"{kind} data must have datetime index or timestamp column")
+    return df
+
+
+# Engine output resolutions (ResolutionType names) -> pandas frequency
+RESOLUTION_FREQUENCIES = {
+    'FIVE_MINUTES': '5min',
+    'FIFTEEN_MINUTES': '15min',
+    'HOURLY': '1h'
+}
+
+
+def resolution_frequency(resolution: str) -> str:
+    """pandas frequency of a ResolutionType name; ValueError if forecasts can't use it"""
+    if resolution not in RESOLUTION_FREQUENCIES:
+        raise ValueError(
+            f"Unsupported forecast resolution '{resolution}', expected one of {sorted(RESOLUTION_FREQUENCIES)}"
+        )
+    return RESOLUTION_FREQUENCIES[resolution]
+
+
+def is_on_grid(index: pd.Index, freq: str) -> bool:
+    """
+    Whether index is already a gap-free grid of `freq` on freq boundaries
+
+    Args:
+        index: Index to check
+        freq: pandas frequency string, e.g. '15min'
+
+    Returns:
+        True when resampling onto `freq` would not change the timestamps
+    """
+    if not isinstance(index, pd.DatetimeIndex) or len(index) == 0:
+        return False
+    step = pd.Timedelta(freq).value
+    values = index.asi8
+    if values[0] % step:
+        return False
+    return len(values) == 1 or bool((np.diff(values) == step).all())
+
+
+def resample_weather(weather_df: pd.DataFrame, freq: str) -> pd.DataFrame:
     """
-    Resample hourly weather data to 15-minute intervals using interpolation
+    Resample weather data onto a regular `freq` grid using interpolation
 
     Args:
-        weather_df: DataFrame with hourly weather data (index must be datetime)
+        weather_df: DataFrame with weather data (index must be datetime,
+            timestamps may be irregular or have gaps)
+        freq: Target pandas frequency, e.g. '5min', '15min' or '1h'
 
     Returns:
-        DataFrame with 15-minute interval weather data
+        DataFrame with weather data on the `freq` grid
     """
     if weather_df.empty:
         return weather_df
 
-    # Ensure datetime index
-    if not isinstance(weather_df.index, pd.DatetimeIndex):
-        if 'timestamp' in weather_df.columns:
-            weather_df = weather_df.set_index('timestamp')
-        else:
-            raise ValueError("Weather data must have datetime index or timestamp column")
-
-    # Create 15-minute range
-    start_time = weather_df.index[0]
-    end_time = weather_df.index[-1]
-    new_index = pd.date_range(start=start_time, end=end_time, freq='15min')
-
-    # Resample using different methods for different variables
-    resampled = pd.DataFrame(index=new_index)
-
-    # Variables that should be interpolated linearly
-    linear_vars = ['temp_air', 'temperature', 'humidity', 'pressure', 'wind_speed']
-
-    # Solar radiation requires special handling (cubic interpolation for smooth curves)
-    solar_vars = ['ghi', 'dni', 'dhi', 'gti']
-
-    # Binary/categorical variables (use forward fill)
-    categorical_vars = ['cloud_cover']
-
-    for col in weather_df.columns:
-        if col in linear_vars:
-            # Linear interpolation for meteorological variables
-            resampled[col] = weather_df[col].resample('15min').interpolate(method='linear')
-        elif col in solar_vars:
-            # Cubic interpolation for solar radiation (smoother curves)
-            # But ensure no negative values
-            interpolated = weather_df[col].resample('15min').interpolate(method='cubic')
-            resampled[col] = interpolated.clip(lower=0)
-        elif col in categorical_vars:
-            # Forward fill for categorical
-            resampled[col] = weather_df[col].resample('15min').ffill()
-        else:
-            # Default: linear interpolation
-            resampled[col] = weather_df[col].resample('15min').interpolate(method='linear')
-
-    # Ensure solar radiation is zero at night (sun below horizon)
-    # Simple check: if GHI is very low or zero, set all solar to zero
-    if 'ghi' in resampled.columns:
-        night_mask = resampled['ghi'] < 1  # Less than 1 W/m² is essentially night
-        for solar_var in ['ghi', 'dni', 'dhi', 'gti']:
-            if solar_var in resampled.columns:
-                resampled.loc[night_mask, solar_var] = 0
+    weather_df = _with_datetime_index(weather_df, "Weather")
+    resampled = grid_resampler.resample(weather_df, WEATHER_RESAMPLE_METHODS, freq=freq)
+
+    # No negative radiation, and zero at night (sun below horizon):
+    # GHI under 1 W/m² is essentially night
+    solar = [col for col in SOLAR_VARS if col in resampled.columns]
+    if solar:
+        values = resampled[solar].to_numpy(dtype=float).clip(min=0)
+        if 'ghi' in resampled.columns:
+            values[resampled['ghi'].to_numpy() < 1] = 0
+        resampled[solar] = values
 
     return resampled
 
 
-def resample_forecast_to_15min(forecast_df: pd.DataFrame) -> pd.DataFrame:
+def resample_forecast(forecast_df: pd.DataFrame, freq: str) -> pd.DataFrame:
     """
-    Resample hourly forecast data to 15-minute intervals
+    Resample forecast data onto a regular `freq` grid
 
     Args:
-        forecast_df: DataFrame with hourly forecast data
+        forecast_df: DataFrame with forecast data
+        freq: Target pandas frequency, e.g. '5min', '15min' or '1h'
 
     Returns:
-        DataFrame with 15-minute interval forecast data
+        DataFrame with forecast data on the `freq` grid
     """
     if forecast_df.empty:
         return forecast_df
 
-    # Ensure datetime index
-    if not isinstance(forecast_df.index, pd.DatetimeIndex):
-        if 'timestamp' in forecast_df.columns:
-            forecast_df = forecast_df.set_index('timestamp')
-        else:
-            raise ValueError("Forecast data must have datetime index or timestamp column")
-
-    # Create 15-minute range
-    start_time = forecast_df.index[0]
-    end_time = forecast_df.index[-1]
-    new_index = pd.date_range(start=start_time, end=end_time, freq='15min')
-
-    # Resample forecast values
-    resampled = pd.DataFrame(index=new_index)
-
-    # Power/energy variables - use cubic interpolation for smooth curves
-    power_vars = ['prediction', 'power_mw', 'power_kw', 'energy_mwh']
-
-    # Confidence bounds and quantiles
-    quantile_vars = ['p10', 'p25', 'p50', 'p75', 'p90',
-                     'uncertainty_lower', 'uncertainty_upper',
-                     'confidence_lower', 'confidence_upper']
-
-    # Metadata (forward fill)
-    metadata_vars = ['model_type', 'model_version', 'location_id']
-
-    for col in forecast_df.columns:
-        if col in power_vars + quantile_vars:
-            # Cubic interpolation for smooth power curves
-            interpolated = forecast_df[col].resample('15min').interpolate(method='cubic')
-            # Ensure non-negative power
-            resampled[col] = interpolated.clip(lower=0)
-        elif col in metadata_vars:
-            # Forward fill metadata
-            resampled[col] = forecast_df[col].resample('15min').ffill()
-        else:
-            # Default: linear interpolation
-            resampled[col] = forecast_df[col].resample('15min').interpolate(method='linear')
-
-    # Adjust energy values for 15-minute intervals (divide by 4 since original was hourly)
-    if 'energy_mwh' in resampled.columns:
-        resampled['energy_mwh'] = resampled['energy_mwh'] / 4
+    forecast_df = _with_datetime_index(forecast_df, "Forecast")
+    resampled = grid_resampler.resample(forecast_df, FORECAST_RESAMPLE_METHODS, freq=freq)
+
+    # Ensure non-negative power
+    power = [col for col in FORECAST_RESAMPLE_METHODS['cubic'] if col in resampled.columns]
+    if power:
+        resampled[power] = resampled[power].to_numpy(dtype=float).clip(min=0)
+
+    # Energy is per interval: scale by target / source interval length
+    if 'energy_mwh' in resampled.columns and len(forecast_df) > 1:
+        source_step = pd.Series(forecast_df.index).diff().median()
+        resampled['energy_mwh'] = resampled['energy_mwh'] * (pd.Timedelta(freq) / source_step)
 
     return resampled
 
 
+def mixed_resolution_segments(
+    weather_df: pd.DataFrame,
+    fine_resolution: str,
+    coarse_resolution: str,
+    cutover_hours: float
+) -> List[Tuple[str, pd.DataFrame, pd.Timestamp, pd.Timestamp]]:
+    """
+    Split a horizon into a fine segment up to the cut-over and a coarse one after it
+
+    Args:
+        weather_df: Weather data for the whole horizon (datetime index)
+        fine_resolution: ResolutionType before the cut-over, e.g. FIFTEEN_MINUTES
+        coarse_resolution: ResolutionType after the cut-over, e.g. HOURLY
+        cutover_hours: Hours after the first weather timestamp where the coarse
+            grid starts (rounded up to a coarse grid boundary)
+
+    Returns:
+        (resolution, weather, start, end) per segment; the segment's forecast
+        rows are those with start <= timestamp < end. Each weather slice
+        includes the boundary sample so interpolation reaches the cut-over.
+        A single fine segment is returned when the coarse one would be too
+        short to forecast.
+    """
+    weather_df = _with_datetime_index(weather_df, "Weather").sort_index()
+    start = weather_df.index[0]
+    end = weather_df.index[-1] + pd.Timedelta(resolution_frequency(fine_resolution))
+    coarse_freq = resolution_frequency(coarse_resolution)
+    cutover = (start + pd.Timedelta(hours=cutover_hours)).ceil(coarse_freq)
+
+    coarse_weather = weather_df[weather_df.index >= cutover]
+    if len(coarse_weather) < 2 or cutover <= start:
+        return [(fine_resolution, weather_df, start, end)]
+
+    return [
+        (fine_resolution, weather_df[weather_df.index <= cutover], start, cutover),
+        (coarse_resolution, coarse_weather, cutover, end)
+    ]
+
+
+def resample_weather_to_15min(weather_df: pd.DataFrame) -> pd.DataFrame:
+    """Resample hourly weather data to 15-minute intervals using interpolation"""
+    return resample_weather(weather_df, '15min')
+
+
+def resample_forecast_to_15min(forecast_df: pd.DataFrame) -> pd.DataFrame:
+    """Resample hourly forecast data to 15-minute intervals"""
+    return resample_forecast(forecast_df, '15min')
+
+
 def aggregate_15min_to_hourly(df_15min: pd.DataFrame,
                               aggregation: Literal['mean', 'sum', 'max'] = 'mean') -> pd.DataFrame:
     """
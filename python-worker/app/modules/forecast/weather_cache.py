@@ -0,0 +1,137 @@
+"""Per-location in-process cache of the future weather window"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+import pandas as pd
+
+from app.core.config import settings
+from app.core.metrics import WEATHER_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# fetch(location_id, start_time, end_time, after) -> timestamp-indexed frame;
+# with `after` set only rows with timestamp > after are returned
+WeatherFetch = Callable[[str, datetime, datetime, Optional[datetime]], Awaitable[pd.DataFrame]]
+
+
+@dataclass
+class _Entry:
+    frame: pd.DataFrame
+    window_start: datetime
+    window_end: datetime
+    loaded_at: float   # monotonic time of the last full load
+    checked_at: float  # monotonic time of the last database check
+
+
+class WeatherCache:
+    """
+    Keeps each location's forecast window as float arrays between forecasts.
+
+    - Within WEATHER_FRESHNESS_MINUTES of the last check, a covered window is
+      served without touching the database.
+    - A longer horizon inside that time only fetches rows past the cached
+      timestamp high-water mark (weather_data has no createdAt, so new rows
+      are detected by timestamp).
+    - Past the freshness time the whole window is re-read: syncs upsert
+      revised values for timestamps already cached, and not every sync calls
+      invalidate() (those started by SvelteKit only do so through sync events).
+    - Entries are evicted least-recently-used once WEATHER_CACHE_MAX_BYTES is
+      exceeded; a location's lock goes with its entry.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get_window(
+        self,
+        location_id: str,
+        start_time: datetime,
+        end_time: datetime,
+        fetch: WeatherFetch
+    ) -> pd.DataFrame:
+        """Weather rows in [start_time, end_time], loading or extending the cache as needed"""
+        if not settings.WEATHER_CACHE_ENABLED:
+            return await fetch(location_id, start_time, end_time, None)
+
+        lock = self._locks.setdefault(location_id, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            entry = self._entries.get(location_id)
+
+            if entry and (
+                entry.window_start > start_time
+                or now - entry.loaded_at > settings.WEATHER_CACHE_MAX_AGE_MINUTES * 60
+            ):
+                entry = None
+
+            if entry is None:
+                WEATHER_CACHE_REQUESTS.labels(result="miss").inc()
+                frame = await fetch(location_id, start_time, end_time, None)
+                entry = _Entry(frame, start_time, end_time, now, now)
+            elif now - entry.checked_at > settings.WEATHER_FRESHNESS_MINUTES * 60:
+                # Cached timestamps may have been revised since the last check
+                WEATHER_CACHE_REQUESTS.labels(result="refresh").inc()
+                frame = await fetch(location_id, start_time, end_time, None)
+                entry = _Entry(frame, start_time, end_time, now, now)
+            elif entry.window_end < end_time:
+                WEATHER_CACHE_REQUESTS.labels(result="incremental").inc()
+                high_water = entry.frame.index.max() if len(entry.frame) else start_time
+                newer = await fetch(location_id, start_time, end_time, high_water)
+                # Drop rows that slid out of the window while appending new ones
+                kept = entry.frame.loc[entry.frame.index >= start_time]
+                entry.frame = pd.concat([kept, newer]) if len(newer) else kept
+                entry.window_start = start_time
+                entry.window_end = max(entry.window_end, end_time)
+                entry.checked_at = now
+            else:
+                WEATHER_CACHE_REQUESTS.labels(result="hit").inc()
+
+            self._entries[location_id] = entry
+            self._entries.move_to_end(location_id)
+            self._evict()
+
+            window = entry.frame.loc[(entry.frame.index >= start_time) & (entry.frame.index <= end_time)]
+            return window.copy()
+
+    def invalidate(self, location_id: Optional[str] = None) -> None:
+        """Drop one location (or all) so the next read reloads from the database"""
+        for location_id in list(self._entries) if location_id is None else [location_id]:
+            self._drop(location_id)
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by cached frames"""
+        return sum(int(entry.frame.memory_usage(deep=False).sum()) for entry in self._entries.values())
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        max_age = settings.WEATHER_CACHE_MAX_AGE_MINUTES * 60
+        for location_id in [
+            location_id for location_id, entry in self._entries.items()
+            if now - entry.loaded_at > max_age
+        ]:
+            self._drop(location_id)
+
+        total = self.memory_bytes()
+        while len(self._entries) > 1 and total > settings.WEATHER_CACHE_MAX_BYTES:
+            location_id = next(iter(self._entries))
+            total -= int(self._entries[location_id].frame.memory_usage(deep=False).sum())
+            self._drop(location_id)
+            logger.debug(f"Evicted weather cache entry for location {location_id}")
+
+    def _drop(self, location_id: str) -> None:
+        self._entries.pop(location_id, None)
+        lock = self._locks.get(location_id)
+        # A held lock stays so readers queued on it keep serialising
+        if lock is not None and not lock.locked():
+            del self._locks[location_id]
+
+
+# Global instance
+weather_cache = WeatherCache()
@@ -0,0 +1,142 @@
+"""Weather sync completion events (Postgres LISTEN/NOTIFY and webhook callbacks)"""
+
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import logging
+
+import asyncpg
+
+from app.core.config import settings
+from .weather_cache import weather_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between reconnect attempts of the LISTEN connection
+_RECONNECT_DELAY = 5
+
+
+class WeatherSyncEvents:
+    """
+    Wakes callers waiting for a location's weather sync to land.
+
+    Completions arrive either from a NOTIFY trigger on weather_data upserts
+    (WEATHER_SYNC_LISTEN_ENABLED) or from SvelteKit calling the sync webhook.
+    Waiters register before checking current status, so a completion between
+    the check and the wait is not missed. Every completion also drops the
+    location's cached weather window.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._connection: Optional[asyncpg.Connection] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._connection_lost = asyncio.Event()
+        self._webhook_seen = False
+
+    @property
+    def active(self) -> bool:
+        """True when completions can arrive (LISTEN connected or webhook in use)"""
+        return self._connection is not None or self._webhook_seen
+
+    async def start(self) -> None:
+        """Install the NOTIFY trigger and keep a LISTEN connection open"""
+        if settings.WEATHER_SYNC_LISTEN_ENABLED:
+            self._listener = asyncio.create_task(self._listen_loop())
+
+    async def stop(self) -> None:
+        """Close the LISTEN connection and cancel pending waiters"""
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self._close_connection()
+        for waiters in self._waiters.values():
+            for future in waiters:
+                future.cancel()
+        self._waiters.clear()
+
+    def register(self, location_id: str) -> asyncio.Future:
+        """Future resolved on the location's next sync completion"""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(location_id, []).append(future)
+        return future
+
+    def discard(self, location_id: str, future: asyncio.Future) -> None:
+        """Forget a waiter that timed out or is no longer needed"""
+        waiters = self._waiters.get(location_id, [])
+        if future in waiters:
+            waiters.remove(future)
+        if not waiters:
+            self._waiters.pop(location_id, None)
+
+    def notify(self, location_ids: Iterable[str], from_webhook: bool = False) -> int:
+        """Record completions; returns the number of waiters woken"""
+        if from_webhook:
+            self._webhook_seen = True
+
+        woken = 0
+        for location_id in set(location_ids):
+            weather_cache.invalidate(location_id)
+            for future in self._waiters.pop(location_id, []):
+                if not future.done():
+                    future.set_result(True)
+                    woken += 1
+        return woken
+
+    async def _listen_loop(self) -> None:
+        while True:
+            try:
+                await self._connect()
+                # Returns when the connection is lost; reconnect after a pause
+                await self._connection_lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Weather sync LISTEN connection failed: {e}")
+            await self._close_connection()
+            await asyncio.sleep(_RECONNECT_DELAY)
+
+    async def _connect(self) -> None:
+        self._connection_lost.clear()
+        connection = await asyncpg.connect(settings.DATABASE_URL)
+        await self._ensure_trigger(connection)
+        connection.add_termination_listener(lambda _: self._connection_lost.set())
+        await connection.add_listener(settings.WEATHER_SYNC_CHANNEL, self._on_notification)
+        self._connection = connection
+        logger.info(f"Listening for weather sync completions on {settings.WEATHER_SYNC_CHANNEL}")
+
+    async def _ensure_trigger(self, connection: asyncpg.Connection) -> None:
+        # Identical payloads within one transaction are delivered once, so a
+        # bulk upsert of a location's rows produces a single notification.
+        # UPDATE is included: SvelteKit upserts, so a sync that only revises
+        # existing rows updates them. CREATE OR REPLACE TRIGGER needs
+        # PostgreSQL 14; drop and create run as one implicit transaction.
+        await connection.execute(f"""
+            CREATE OR REPLACE FUNCTION notify_weather_data_synced() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{settings.WEATHER_SYNC_CHANNEL}', NEW."locationId");
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        await connection.execute("""
+            DROP TRIGGER IF EXISTS weather_data_synced_notify ON weather_data;
+            CREATE TRIGGER weather_data_synced_notify
+            AFTER INSERT OR UPDATE ON weather_data
+            FOR EACH ROW EXECUTE FUNCTION notify_weather_data_synced();
+        """)
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.notify([payload])
+
+    async def _close_connection(self) -> None:
+        if self._connection is not None:
+            try:
+                await self._connection.close()
+            except Exception:
+                pass
+            self._connection = None
+
+
+# Global instance
+weather_sync_events = WeatherSyncEvents()
@@ -0,0 +1,233 @@
+"""Incremental decoding of SvelteKit weather dataframe responses into typed columns"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import codecs
+import json
+import math
+
+import numpy as np
+import pandas as pd
+
+# Record fields -> PVLIB column names (SvelteKit sends either spelling)
+WEATHER_FIELD_ALIASES = {
+    "temp_air": "temp_air",
+    "temperature": "temp_air",
+    "humidity": "humidity",
+    "wind_speed": "wind_speed",
+    "windSpeed": "wind_speed",
+    "cloud_cover": "cloud_cover",
+    "cloudCover": "cloud_cover",
+    "ghi": "ghi",
+    "dni": "dni",
+    "dhi": "dhi",
+    "pressure": "pressure"
+}
+
+_WHITESPACE = " \t\r\n"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Returned by the decoder while a value may still be incomplete
+_INCOMPLETE = object()
+
+
+class WeatherColumnBuffers:
+    """
+    Append-only typed buffers for weather records.
+
+    Timestamps are kept as int64 microseconds and values as float64
+    (missing or non-numeric -> NaN), so a record costs 8 bytes per column
+    instead of a dict of Python objects.
+    """
+
+    def __init__(self):
+        self._timestamps = array("q")
+        self._columns: Dict[str, array] = {}
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        timestamp = datetime.fromisoformat(record["timestamp"])
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        row = len(self._timestamps)
+        self._timestamps.append((timestamp - _EPOCH) // _MICROSECOND)
+
+        for field, value in record.items():
+            column = WEATHER_FIELD_ALIASES.get(field)
+            if column is None:
+                continue
+            buffer = self._columns.get(column)
+            if buffer is None:
+                # Column first seen mid-stream: earlier rows are missing
+                buffer = self._columns[column] = array("d", [math.nan]) * row
+            buffer.append(_as_float(value))
+
+        for column, buffer in self._columns.items():
+            if len(buffer) == row:
+                buffer.append(math.nan)
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame indexed by UTC timestamp with one float64 column per field seen"""
+        index = pd.DatetimeIndex(
+            pd.to_datetime(np.frombuffer(self._timestamps, dtype=np.int64), unit="us", utc=True),
+            name="timestamp"
+        )
+        return pd.DataFrame(
+            {column: np.frombuffer(buffer, dtype=np.float64) for column, buffer in self._columns.items()},
+            index=index,
+            dtype=float
+        )
+
+
+class WeatherEnvelopeDecoder:
+    """
+    Incremental decoder of {"success": ..., "data": [records...], ...} bodies.
+
+    feed() takes text as it arrives and returns the records completed so
+    far; the other top-level keys are collected in `envelope`. Only one
+    record (or one small top-level value) is held in memory at a time.
+    """
+
+    def __init__(self, records_key: str = "data"):
+        self.records_key = records_key
+        self.envelope: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = 0
+        self._state = "start"
+        self._key: Optional[str] = None
+
+    def feed(self, text: str, final: bool = False) -> List[Dict[str, Any]]:
+        self._buffer = self._buffer[self._position:] + text
+        self._position = 0
+        records: List[Dict[str, Any]] = []
+        while self._step(records, final):
+            pass
+        return records
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Decode what is left; raises ValueError for a truncated body"""
+        records = self.feed("", final=True)
+        if self._state != "done":
+            raise ValueError(f"Truncated weather response (stopped in state '{self._state}')")
+        return records
+
+    def _step(self, records: List[Dict[str, Any]], final: bool) -> bool:
+        """Advance one token; False when more input is needed"""
+        char = self._next_char()
+        if char is None:
+            return False
+
+        if self._state == "start":
+            self._expect(char, "{")
+            self._state = "key"
+        elif self._state == "key":
+            if char == "}":
+                self._position += 1
+                self._state = "done"
+                return True
+            if char == ",":
+                self._position += 1
+                return True
+            key = self._decode_value(final)
+            if key is _INCOMPLETE:
+                return False
+            self._key = key
+            self._state = "colon"
+        elif self._state == "colon":
+            self._expect(char, ":")
+            self._state = "value"
+        elif self._state == "value":
+            if self._key == self.records_key and char == "[":
+                self._position += 1
+                self._state = "records"
+                return True
+            value = self._decode_value(final)
+            if value is _INCOMPLETE:
+                return False
+            self.envelope[self._key] = value
+            self._state = "key"
+        elif self._state == "records":
+            if char == "]":
+                self._position += 1
+                self._state = "key"
+                return True
+            if char == ",":
+                self._position += 1
+                return True
+            record = self._decode_value(final)
+            if record is _INCOMPLETE:
+                return False
+            records.append(record)
+        else:
+            raise ValueError(f"Unexpected data after weather response: {char!r}")
+        return True
+
+    def _next_char(self) -> Optional[str]:
+        while self._position < len(self._buffer) and self._buffer[self._position] in _WHITESPACE:
+            self._position += 1
+        if self._position >= len(self._buffer):
+            return None
+        return self._buffer[self._position]
+
+    def _expect(self, char: str, expected: str) -> None:
+        if char != expected:
+            raise ValueError(f"Malformed weather response: expected {expected!r}, got {char!r}")
+        self._position += 1
+
+    def _decode_value(self, final: bool) -> Any:
+        """
+        Decode the value at the cursor, or return _INCOMPLETE (cursor unchanged) when
+        it may still be incomplete. A value ending exactly at the buffer end is
+        only accepted on the final feed, since a number could continue.
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._position)
+        except json.JSONDecodeError:
+            if final:
+                raise ValueError("Malformed weather response")
+            return _INCOMPLETE
+        if end >= len(self._buffer) and not final:
+            return _INCOMPLETE
+        self._position = end
+        return value
+
+
+async def decode_weather_json(chunks: AsyncIterator[bytes]) -> Tuple[Dict[str, Any], WeatherColumnBuffers]:
+    """Stream a JSON envelope body into column buffers; returns (envelope, buffers)"""
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    decoder = WeatherEnvelopeDecoder()
+    buffers = WeatherColumnBuffers()
+
+    async for chunk in chunks:
+        for record in decoder.feed(text_decoder.decode(chunk)):
+            buffers.append(record)
+    for record in decoder.feed(text_decoder.decode(b"", final=True)):
+        buffers.append(record)
+    for record in decoder.close():
+        buffers.append(record)
+
+    return decoder.envelope, buffers
+
+
+async def decode_weather_ndjson(lines: AsyncIterator[str]) -> WeatherColumnBuffers:
+    """Stream an NDJSON body (one record per line) into column buffers"""
+    buffers = WeatherColumnBuffers()
+    async for line in lines:
+        if line.strip():
+            buffers.append(json.loads(line))
+    return buffers
+
+
+def _as_float(value: Any) -> float:
+    if value is None or isinstance(value, bool):
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
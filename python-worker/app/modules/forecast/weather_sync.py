@@ -0,0 +1,124 @@
+"""Coalesces weather sync requests from concurrent forecasts into bulk syncs"""
+
+from typing import Dict, List, Optional
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.core.metrics import WEATHER_SYNC_CALLS, WEATHER_SYNC_REQUESTS
+from .weather_events import weather_sync_events
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherSyncCoordinator:
+    """
+    Collects locations needing a weather sync for WEATHER_SYNC_COALESCE_SECONDS
+    and syncs them with trigger_bulk_weather_sync, WEATHER_SYNC_BULK_MAX at a time.
+
+    Every forecast asking for the same location shares one future: requests
+    arriving while the location is queued or already being synced join it
+    instead of issuing another call. A scheduled run of N stale locations
+    therefore costs ceil(N / WEATHER_SYNC_BULK_MAX) sync calls.
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._timer: Optional[asyncio.Task] = None
+
+    async def request_sync(self, location_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait until the location's weather was synced; False on failure or timeout"""
+        future = self._in_flight.get(location_id) or self._pending.get(location_id)
+        if future is not None:
+            WEATHER_SYNC_REQUESTS.labels(result="joined").inc()
+        else:
+            WEATHER_SYNC_REQUESTS.labels(result="queued").inc()
+            future = asyncio.get_running_loop().create_future()
+            self._pending[location_id] = future
+            if len(self._pending) >= settings.WEATHER_SYNC_BULK_MAX:
+                self._flush_now()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_after_window())
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.shield(future),
+                timeout=timeout if timeout is not None else settings.WEATHER_SYNC_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out waiting for weather sync of location {location_id}")
+            return False
+
+    async def stop(self) -> None:
+        """Cancel the pending window; queued waiters are released with False"""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(False)
+        self._pending.clear()
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(settings.WEATHER_SYNC_COALESCE_SECONDS)
+        self._timer = None
+        self._flush_now()
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+
+        location_ids = list(batch)
+        for i in range(0, len(location_ids), settings.WEATHER_SYNC_BULK_MAX):
+            chunk = location_ids[i:i + settings.WEATHER_SYNC_BULK_MAX]
+            asyncio.create_task(self._sync({location_id: batch[location_id] for location_id in chunk}))
+
+    async def _sync(self, batch: Dict[str, asyncio.Future]) -> None:
+        # Imported here: the SvelteKit client imports this package's weather cache
+        from app.integrations.sveltekit import sveltekit_client
+
+        location_ids: List[str] = list(batch)
+        completions: Dict[str, asyncio.Future] = {}
+        if weather_sync_events.active:
+            # Registered before the call: rows can land (and notify) before it returns
+            for location_id in location_ids:
+                completion = weather_sync_events.register(location_id)
+                completion.add_done_callback(
+                    lambda done, location_id=location_id: self._landed(location_id, batch[location_id], done)
+                )
+                completions[location_id] = completion
+
+        succeeded = False
+        try:
+            await sveltekit_client.trigger_bulk_weather_sync(location_ids)
+            succeeded = True
+            WEATHER_SYNC_CALLS.labels(outcome="success").inc()
+            logger.info(f"Bulk weather sync finished for {len(location_ids)} locations")
+        except Exception as e:
+            WEATHER_SYNC_CALLS.labels(outcome="failure").inc()
+            logger.error(f"Bulk weather sync of {len(location_ids)} locations failed: {e}")
+        finally:
+            for location_id, completion in completions.items():
+                weather_sync_events.discard(location_id, completion)
+            for location_id, future in batch.items():
+                if self._in_flight.get(location_id) is future:
+                    del self._in_flight[location_id]
+                if not future.done():
+                    future.set_result(succeeded)
+
+    def _landed(self, location_id: str, future: asyncio.Future, completion: asyncio.Future) -> None:
+        """Release a location's waiters once its sync completion event arrived"""
+        if completion.cancelled() or future.done():
+            return
+        if self._in_flight.get(location_id) is future:
+            del self._in_flight[location_id]
+        future.set_result(True)
+
+
+# Global instance
+weather_sync_coordinator = WeatherSyncCoordinator()
@@ -1,69 +1,103 @@
 """Pipeline API controllers"""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Dict, Any
-from datetime import datetime
+from fastapi import APIRouter, Body, HTTPException
+from typing import List, Dict, Any, Optional
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.job_scheduler import PRIORITY_CLASSES
+from .scheduler import pipeline_scheduler
 
 router = APIRouter()
 
 @router.post("/run")
 async def run_pipeline(
-    location_ids: List[int],
-    db: AsyncSession = Depends(get_db)
+    location_ids: Optional[List[str]] = Body(None, description="Location UUIDs (omit for all ACTIVE locations)"),
+    horizon_hours: int = 48,
+    model_type: str = "PHYSICS",
+    spread_seconds: int = 0,
+    priority: str = "scheduled"
 ) -> Dict[str, Any]:
-    """Run data processing pipeline for multiple locations"""
+    """Run forecast pipeline for multiple locations, spreading starts over spread_seconds"""
+
+    if priority not in PRIORITY_CLASSES:
+        raise HTTPException(status_code=400, detail=f"priority must be one of {PRIORITY_CLASSES}")
+
+    run = await pipeline_scheduler.start_run(
+        location_ids=location_ids,
+        horizon_hours=horizon_hours,
+        model_type=model_type,
+        spread_seconds=spread_seconds,
+        priority=priority
+    )
 
     return {
         "status": "started",
-        "location_ids": location_ids,
-        "pipeline_id": f"pipeline_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-        "started_at": datetime.utcnow().isoformat()
+        "location_ids": run["location_ids"],
+        "pipeline_id": run["pipeline_id"],
+        "started_at": run["started_at"].isoformat()
     }
 
 @router.get("/status/{pipeline_id}")
-async def get_pipeline_status(
-    pipeline_id: str,
-    db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
-    """Get pipeline execution status"""
+async def get_pipeline_status(pipeline_id: str) -> Dict[str, Any]:
+    """Get pipeline execution status (runs) or next/last run (schedules)"""
 
-    return {
-        "pipeline_id": pipeline_id,
-        "status": "running",
-        "progress": 50,
-        "current_step": "forecast_generation",
-        "steps_completed": 2,
-        "total_steps": 4
-    }
+    status = pipeline_scheduler.get_run_status(pipeline_id)
+    if status:
+        return status
+
+    schedule = pipeline_scheduler.get_schedule(pipeline_id)
+    if schedule:
+        last_run = None
+        if schedule["last_pipeline_id"]:
+            last_run = pipeline_scheduler.get_run_status(schedule["last_pipeline_id"])
+        return {
+            "schedule_id": pipeline_id,
+            "status": schedule["status"],
+            "cron_expression": schedule["cron_expression"],
+            "next_run": schedule["next_run"].isoformat(),
+            "last_run": last_run
+        }
+
+    raise HTTPException(status_code=404, detail="Pipeline not found")
 
 @router.post("/schedule")
 async def schedule_pipeline(
-    location_ids: List[int],
+    location_ids: Optional[List[str]] = Body(None, description="Location UUIDs (omit for all ACTIVE locations)"),
     cron_expression: str = "0 */6 * * *",
-    db: AsyncSession = Depends(get_db)
+    horizon_hours: int = 48,
+    model_type: str = "PHYSICS",
+    spread_seconds: int = settings.PIPELINE_SPREAD_SECONDS
 ) -> Dict[str, Any]:
-    """Schedule recurring pipeline execution"""
+    """Schedule recurring pipeline execution (cron evaluated in UTC)"""
+    if not settings.PIPELINE_SCHEDULER_ENABLED:
+        raise HTTPException(status_code=503, detail="Pipeline scheduler is disabled on this worker")
+
+    try:
+        schedule = await pipeline_scheduler.add_schedule(
+            cron_expression=cron_expression,
+            location_ids=location_ids,
+            horizon_hours=horizon_hours,
+            model_type=model_type,
+            spread_seconds=spread_seconds
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     return {
-        "schedule_id": f"schedule_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
-        "location_ids": location_ids,
-        "cron_expression": cron_expression,
-        "next_run": datetime.utcnow().isoformat(),
-        "status": "scheduled"
+        "schedule_id": schedule["schedule_id"],
+        "location_ids": schedule["location_ids"],
+        "cron_expression": schedule["cron_expression"],
+        "spread_seconds": schedule["spread_seconds"],
+        "next_run": schedule["next_run"].isoformat(),
+        "status": schedule["status"]
     }
 
 @router.delete("/cancel/{pipeline_id}")
-async def cancel_pipeline(
-    pipeline_id: str,
-    db: AsyncSession = Depends(get_db)
-) -> Dict[str, Any]:
-    """Cancel a running pipeline"""
+async def cancel_pipeline(pipeline_id: str) -> Dict[str, Any]:
+    """Cancel a running pipeline or deactivate a schedule"""
 
-    return {
-        "pipeline_id": pipeline_id,
-        "status": "cancelled",
-        "cancelled_at": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    result = await pipeline_scheduler.cancel(pipeline_id)
+    if not result:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+
+    return result
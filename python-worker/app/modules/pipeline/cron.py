@@ -0,0 +1,128 @@
+"""
+Cron expression parsing for scheduled pipeline runs
+Standard 5-field syntax (minute hour day-of-month month day-of-week), evaluated in UTC
+"""
+
+from typing import Set, Tuple
+from datetime import datetime, timedelta
+
+# (min, max) for each of the five fields
+FIELD_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0, 59),   # minute
+    (0, 23),   # hour
+    (1, 31),   # day of month
+    (1, 12),   # month
+    (0, 7),    # day of week (0 and 7 = Sunday)
+)
+
+MACROS = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# Upper bound for next-run search (covers Feb 29 schedules)
+MAX_SEARCH_DAYS = 366 * 5
+
+
+def _parse_field(field: str, low: int, high: int) -> Set[int]:
+    """Expand one cron field (*, */n, a-b, a-b/n, lists) to the set of allowed values"""
+    values: Set[int] = set()
+
+    for part in field.split(","):
+        step = 1
+        stepped = "/" in part
+        if stepped:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step < 1:
+                raise ValueError(f"Invalid step in cron field: {field}")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            # "a/n" means "from a to the end of the range every n"
+            end = high if stepped else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field value out of range {low}-{high}: {field}")
+
+        values.update(range(start, end + 1, step))
+
+    return values
+
+
+class CronExpression:
+    """Parsed cron expression with next-run calculation"""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = MACROS.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Cron expression must have 5 fields (minute hour day month weekday): {expression}"
+            )
+
+        try:
+            parsed = [
+                _parse_field(field, low, high)
+                for field, (low, high) in zip(fields, FIELD_RANGES)
+            ]
+        except ValueError as e:
+            raise ValueError(f"Invalid cron expression '{expression}': {e}")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+
+        # Vixie cron semantics: when both day fields are restricted, either may match
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = fields[4] != "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        """Check day-of-month / day-of-week constraints"""
+        # Python weekday(): Monday=0 ... Sunday=6 -> cron: Sunday=0
+        cron_weekday = (dt.weekday() + 1) % 7
+        day_ok = dt.day in self.days
+        weekday_ok = cron_weekday in self.weekdays
+
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """First matching minute strictly after the given (naive UTC) datetime"""
+        candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        deadline = after + timedelta(days=MAX_SEARCH_DAYS)
+
+        while candidate <= deadline:
+            if candidate.month not in self.months:
+                # Jump to the first day of next month
+                year = candidate.year + (candidate.month // 12)
+                month = candidate.month % 12 + 1
+                candidate = datetime(year, month, 1)
+                continue
+
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+
+            return candidate
+
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
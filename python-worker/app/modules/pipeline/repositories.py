@@ -0,0 +1,157 @@
+"""Pipeline repository - schedule persistence"""
+
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineRepository:
+    """Repository for pipeline schedules (worker-owned table, not managed by Prisma)"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def ensure_schema(self) -> None:
+        """Create the pipeline_schedules table if it does not exist"""
+        await self.db.execute(text("""
+            CREATE TABLE IF NOT EXISTS pipeline_schedules (
+                id TEXT PRIMARY KEY,
+                "cronExpression" TEXT NOT NULL,
+                "locationIds" TEXT[],
+                "horizonHours" INTEGER NOT NULL DEFAULT 48,
+                "modelType" TEXT NOT NULL DEFAULT 'PHYSICS',
+                "spreadSeconds" INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'scheduled',
+                "nextRunAt" TIMESTAMP NOT NULL,
+                "lastRunAt" TIMESTAMP,
+                "lastPipelineId" TEXT,
+                "createdAt" TIMESTAMP NOT NULL DEFAULT NOW()
+            )
+        """))
+        await self.db.commit()
+
+    async def create_schedule(self, schedule: Dict[str, Any]) -> None:
+        """Persist a new schedule"""
+        await self.db.execute(text("""
+            INSERT INTO pipeline_schedules (
+                id, "cronExpression", "locationIds", "horizonHours", "modelType",
+                "spreadSeconds", status, "nextRunAt", "createdAt"
+            ) VALUES (
+                :id, :cron_expression, :location_ids, :horizon_hours, :model_type,
+                :spread_seconds, :status, :next_run, :created_at
+            )
+        """), {
+            "id": schedule["schedule_id"],
+            "cron_expression": schedule["cron_expression"],
+            "location_ids": schedule["location_ids"],  # None = all active locations
+            "horizon_hours": schedule["horizon_hours"],
+            "model_type": schedule["model_type"],
+            "spread_seconds": schedule["spread_seconds"],
+            "status": schedule["status"],
+            "next_run": schedule["next_run"],
+            "created_at": schedule["created_at"]
+        })
+        await self.db.commit()
+
+    async def get_active_schedules(self) -> List[Dict[str, Any]]:
+        """Load all schedules that have not been cancelled"""
+        result = await self.db.execute(text("""
+            SELECT id, "cronExpression", "locationIds", "horizonHours", "modelType",
+                   "spreadSeconds", status, "nextRunAt", "lastRunAt", "lastPipelineId",
+                   "createdAt"
+            FROM pipeline_schedules
+            WHERE status = 'scheduled'
+        """))
+
+        return [
+            {
+                "schedule_id": row[0],
+                "cron_expression": row[1],
+                "location_ids": list(row[2]) if row[2] is not None else None,
+                "horizon_hours": row[3],
+                "model_type": row[4],
+                "spread_seconds": row[5],
+                "status": row[6],
+                "next_run": row[7],
+                "last_run": row[8],
+                "last_pipeline_id": row[9],
+                "created_at": row[10]
+            }
+            for row in result.fetchall()
+        ]
+
+    async def claim_schedule_run(
+        self,
+        schedule_id: str,
+        expected_next_run: datetime,
+        next_run: datetime,
+        pipeline_id: str
+    ) -> bool:
+        """
+        Advance a schedule to its next run time.
+
+        Only succeeds if nextRunAt still holds the expected value, so when several
+        worker replicas share the table exactly one of them starts each run.
+        """
+        result = await self.db.execute(text("""
+            UPDATE pipeline_schedules
+            SET "nextRunAt" = :next_run,
+                "lastRunAt" = :expected_next_run,
+                "lastPipelineId" = :pipeline_id
+            WHERE id = :schedule_id
+              AND status = 'scheduled'
+              AND "nextRunAt" = :expected_next_run
+        """), {
+            "schedule_id": schedule_id,
+            "expected_next_run": expected_next_run,
+            "next_run": next_run,
+            "pipeline_id": pipeline_id
+        })
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def update_next_run(self, schedule_id: str, next_run: datetime) -> None:
+        """Move nextRunAt forward without starting a run (missed runs on startup)"""
+        await self.db.execute(text("""
+            UPDATE pipeline_schedules SET "nextRunAt" = :next_run WHERE id = :schedule_id
+        """), {"schedule_id": schedule_id, "next_run": next_run})
+        await self.db.commit()
+
+    async def set_schedule_status(self, schedule_id: str, status: str) -> bool:
+        """Update schedule status (e.g. cancelled)"""
+        result = await self.db.execute(text("""
+            UPDATE pipeline_schedules SET status = :status WHERE id = :schedule_id
+        """), {"schedule_id": schedule_id, "status": status})
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def get_active_location_ids(self) -> List[str]:
+        """IDs of all ACTIVE locations (fleet-wide runs)"""
+        result = await self.db.execute(text("""
+            SELECT id FROM locations WHERE status = 'ACTIVE' ORDER BY id
+        """))
+        return [row[0] for row in result.fetchall()]
+
+    async def get_schedule(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Get one schedule by ID regardless of status"""
+        result = await self.db.execute(text("""
+            SELECT id, "cronExpression", status, "nextRunAt", "lastRunAt", "lastPipelineId"
+            FROM pipeline_schedules
+            WHERE id = :schedule_id
+        """), {"schedule_id": schedule_id})
+        row = result.fetchone()
+
+        if row:
+            return {
+                "schedule_id": row[0],
+                "cron_expression": row[1],
+                "status": row[2],
+                "next_run": row[3],
+                "last_run": row[4],
+                "last_pipeline_id": row[5]
+            }
+        return None
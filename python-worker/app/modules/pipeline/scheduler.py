@@ -0,0 +1,379 @@
+"""In-process cron scheduler and run tracker for fleet forecast pipelines"""
+
+from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+import asyncio
+import logging
+import random
+import uuid
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.job_scheduler import job_scheduler
+from app.core.task_manager import task_manager
+from app.modules.forecast.services import ForecastService
+from .cron import CronExpression
+from .repositories import PipelineRepository
+
+logger = logging.getLogger(__name__)
+
+
+def compute_run_offsets(count: int, spread_seconds: float) -> List[float]:
+    """
+    Start offsets (seconds) for each location of a run.
+
+    The window is split into equal slots and every location starts at a random
+    point inside its own slot, so hundreds of plants never hit the DB and CPU
+    pool in the same second while the run still finishes inside the window.
+    """
+    if count == 0:
+        return []
+    if spread_seconds <= 0:
+        return [0.0] * count
+
+    slot = spread_seconds / count
+    return [i * slot + random.uniform(0, slot) for i in range(count)]
+
+
+class PipelineScheduler:
+    """Runs persisted cron schedules and tracks pipeline runs in memory"""
+
+    def __init__(self):
+        self._schedules: Dict[str, Dict[str, Any]] = {}
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        self._dispatchers: Dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._flush = asyncio.Event()  # Set at shutdown: dispatch remaining locations now
+        self._schema_ready = False
+
+    async def _ensure_schema(self, repo: PipelineRepository) -> None:
+        if not self._schema_ready:
+            await repo.ensure_schema()
+            self._schema_ready = True
+
+    async def start(self) -> None:
+        """Create the schedule table, load active schedules and start the cron loop"""
+        async with AsyncSessionLocal() as db:
+            repo = PipelineRepository(db)
+            await self._ensure_schema(repo)
+            schedules = await repo.get_active_schedules()
+
+            now = datetime.utcnow()
+            for schedule in schedules:
+                if schedule["next_run"] < now:
+                    # Runs missed while the worker was down are skipped, not replayed
+                    next_run = CronExpression(schedule["cron_expression"]).next_after(now)
+                    logger.warning(
+                        f"Schedule {schedule['schedule_id']} missed run at {schedule['next_run']}, "
+                        f"next run {next_run}"
+                    )
+                    await repo.update_next_run(schedule["schedule_id"], next_run)
+                    schedule["next_run"] = next_run
+                self._schedules[schedule["schedule_id"]] = schedule
+
+        self._flush.clear()
+        self._loop_task = asyncio.create_task(self._run_loop())
+        logger.info(f"Pipeline scheduler started with {len(self._schedules)} active schedules")
+
+    async def stop(self, flush_pending: bool = False) -> None:
+        """
+        Stop the cron loop and any run still dispatching locations.
+
+        With flush_pending, runs still inside their spread window queue their
+        remaining locations immediately instead, so a draining worker can
+        checkpoint them rather than lose them.
+        """
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+        dispatchers = list(self._dispatchers.values())
+        if flush_pending:
+            self._flush.set()
+            await asyncio.gather(*dispatchers, return_exceptions=True)
+        else:
+            for dispatcher in dispatchers:
+                dispatcher.cancel()
+        logger.info("Pipeline scheduler stopped")
+
+    async def add_schedule(
+        self,
+        cron_expression: str,
+        location_ids: Optional[List[str]],
+        horizon_hours: int,
+        model_type: str,
+        spread_seconds: int
+    ) -> Dict[str, Any]:
+        """Validate, persist and activate a new schedule"""
+        cron = CronExpression(cron_expression)  # Raises ValueError on bad syntax
+        now = datetime.utcnow()
+
+        schedule = {
+            "schedule_id": f"schedule_{uuid.uuid4().hex[:12]}",
+            "cron_expression": cron.expression,
+            "location_ids": location_ids or None,
+            "horizon_hours": horizon_hours,
+            "model_type": model_type,
+            "spread_seconds": spread_seconds,
+            "status": "scheduled",
+            "next_run": cron.next_after(now),
+            "last_run": None,
+            "last_pipeline_id": None,
+            "created_at": now
+        }
+
+        async with AsyncSessionLocal() as db:
+            repo = PipelineRepository(db)
+            await self._ensure_schema(repo)
+            await repo.create_schedule(schedule)
+
+        self._schedules[schedule["schedule_id"]] = schedule
+        self._wakeup.set()
+        logger.info(f"Schedule {schedule['schedule_id']} created: '{cron_expression}', next run {schedule['next_run']}")
+        return schedule
+
+    async def start_run(
+        self,
+        location_ids: Optional[List[str]],
+        horizon_hours: int = 48,
+        model_type: str = "PHYSICS",
+        spread_seconds: int = 0,
+        schedule_id: Optional[str] = None,
+        pipeline_id: Optional[str] = None,
+        priority: str = "scheduled"
+    ) -> Dict[str, Any]:
+        """Start a fleet forecast run; locations are dispatched over the spread window"""
+        if not location_ids:
+            async with AsyncSessionLocal() as db:
+                location_ids = await PipelineRepository(db).get_active_location_ids()
+
+        self._prune_runs()
+        pipeline_id = pipeline_id or f"pipeline_{uuid.uuid4().hex[:12]}"
+        run = {
+            "pipeline_id": pipeline_id,
+            "schedule_id": schedule_id,
+            "status": "running",
+            "location_ids": list(location_ids),
+            "horizon_hours": horizon_hours,
+            "model_type": model_type,
+            "spread_seconds": spread_seconds,
+            "priority": priority,
+            "task_ids": [],
+            "started_at": datetime.utcnow(),
+            "finished_at": None
+        }
+        self._runs[pipeline_id] = run
+        self._dispatchers[pipeline_id] = asyncio.create_task(self._dispatch_run(run))
+
+        logger.info(
+            f"Pipeline {pipeline_id} started: {len(location_ids)} locations "
+            f"spread over {spread_seconds}s"
+        )
+        return run
+
+    def _prune_runs(self, max_age_hours: int = 24) -> None:
+        """Forget finished runs older than max_age_hours"""
+        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        for pipeline_id in [
+            pid for pid, run in self._runs.items()
+            if run["finished_at"] and run["finished_at"] < cutoff
+        ]:
+            self._runs.pop(pipeline_id, None)
+
+    async def _dispatch_run(self, run: Dict[str, Any]) -> None:
+        """Queue each location's forecast at its jittered offset"""
+        pipeline_id = run["pipeline_id"]
+        offsets = compute_run_offsets(len(run["location_ids"]), run["spread_seconds"])
+        loop = asyncio.get_running_loop()
+        run_start = loop.time()
+
+        try:
+            # Short session: nothing holds a pooled connection through the spread window
+            async with AsyncSessionLocal() as db:
+                client_ids = await ForecastService(db).get_location_client_ids(run["location_ids"])
+
+            # Queueing does not touch the database
+            service = ForecastService(db=None)
+            for location_id, offset in zip(run["location_ids"], offsets):
+                delay = run_start + offset - loop.time()
+                if delay > 0 and not self._flush.is_set():
+                    try:
+                        await asyncio.wait_for(self._flush.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+
+                # The pipeline ID doubles as batch ID so /batch/{id}/events streams the run
+                task_id = await service.queue_forecast_generation(
+                    location_id=location_id,
+                    horizon_hours=run["horizon_hours"],
+                    model_type=run["model_type"],
+                    batch_id=pipeline_id,
+                    priority=run["priority"],
+                    client_id=client_ids.get(location_id)
+                )
+                run["task_ids"].append(task_id)
+        except asyncio.CancelledError:
+            logger.info(f"Pipeline {pipeline_id} dispatch cancelled after {len(run['task_ids'])} locations")
+            raise
+        finally:
+            self._dispatchers.pop(pipeline_id, None)
+
+    async def _reload_schedules(self) -> None:
+        """
+        Replace the in-memory schedules with the active rows of the table.
+
+        Picks up schedules created or cancelled on other replicas. On a DB
+        error the current schedules are kept.
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                schedules = await PipelineRepository(db).get_active_schedules()
+        except Exception as e:
+            logger.warning(f"Failed to reload pipeline schedules: {e}")
+            return
+        self._schedules = {schedule["schedule_id"]: schedule for schedule in schedules}
+
+    async def _run_loop(self) -> None:
+        """Sleep until the earliest schedule is due, then start its run"""
+        while True:
+            self._wakeup.clear()
+            await self._reload_schedules()
+            now = datetime.utcnow()
+
+            due = [s for s in self._schedules.values() if s["next_run"] <= now]
+            for schedule in due:
+                await self._fire_schedule(schedule, now)
+
+            upcoming = [s["next_run"] for s in self._schedules.values()]
+            sleep_seconds = settings.PIPELINE_SCHEDULER_MAX_SLEEP
+            if upcoming:
+                until_next = (min(upcoming) - datetime.utcnow()).total_seconds()
+                sleep_seconds = max(0.0, min(sleep_seconds, until_next))
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire_schedule(self, schedule: Dict[str, Any], now: datetime) -> None:
+        """Claim a due schedule and start its run"""
+        due_at = schedule["next_run"]
+        next_run = CronExpression(schedule["cron_expression"]).next_after(now)
+        pipeline_id = f"pipeline_{uuid.uuid4().hex[:12]}"
+
+        try:
+            async with AsyncSessionLocal() as db:
+                claimed = await PipelineRepository(db).claim_schedule_run(
+                    schedule["schedule_id"], due_at, next_run, pipeline_id
+                )
+        except Exception as e:
+            # Back off instead of retrying a still-due schedule in a tight loop;
+            # the next reload restores the persisted run time
+            schedule["next_run"] = now + timedelta(seconds=settings.PIPELINE_SCHEDULER_RETRY_SECONDS)
+            logger.error(f"Failed to claim schedule {schedule['schedule_id']}: {e}")
+            return
+
+        schedule["next_run"] = next_run
+        if not claimed:
+            # Another replica already started this run (or the schedule was cancelled)
+            logger.info(f"Schedule {schedule['schedule_id']} run at {due_at} claimed elsewhere")
+            return
+
+        schedule["last_run"] = due_at
+        schedule["last_pipeline_id"] = pipeline_id
+        try:
+            await self.start_run(
+                location_ids=schedule["location_ids"],
+                horizon_hours=schedule["horizon_hours"],
+                model_type=schedule["model_type"],
+                spread_seconds=schedule["spread_seconds"],
+                schedule_id=schedule["schedule_id"],
+                pipeline_id=pipeline_id
+            )
+        except Exception as e:
+            logger.error(f"Failed to start run for schedule {schedule['schedule_id']}: {e}", exc_info=True)
+
+    def get_run_status(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """Run status derived from the task manager state of its forecast tasks"""
+        run = self._runs.get(pipeline_id)
+        if not run:
+            return None
+
+        counts = {"queued": 0, "processing": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        tasks = task_manager.get_all_tasks()
+        for task_id in run["task_ids"]:
+            status = tasks.get(task_id, {}).get("status")
+            if status in counts:
+                counts[status] += 1
+
+        total = len(run["location_ids"])
+        finished = counts["completed"] + counts["failed"] + counts["cancelled"]
+        dispatching = pipeline_id in self._dispatchers
+
+        if run["status"] == "running" and not dispatching and finished == len(run["task_ids"]):
+            run["status"] = "completed_with_errors" if counts["failed"] else "completed"
+            run["finished_at"] = datetime.utcnow()
+
+        return {
+            "pipeline_id": pipeline_id,
+            "schedule_id": run["schedule_id"],
+            "status": run["status"],
+            "progress": round(finished / total * 100) if total else 100,
+            "total_locations": total,
+            "dispatched": len(run["task_ids"]),
+            "tasks": counts,
+            "started_at": run["started_at"].isoformat(),
+            "finished_at": run["finished_at"].isoformat() if run["finished_at"] else None
+        }
+
+    async def cancel(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a run (stop dispatch and unfinished tasks) or deactivate a schedule"""
+        if pipeline_id in self._runs:
+            run = self._runs[pipeline_id]
+
+            dispatcher = self._dispatchers.get(pipeline_id)
+            if dispatcher:
+                dispatcher.cancel()
+
+            for task_id in run["task_ids"]:
+                task = task_manager.get_all_tasks().get(task_id)
+                if task and task["status"] in ("queued", "processing"):
+                    await job_scheduler.cancel(task_id)
+                    task_manager.update_task(task_id, {"status": "cancelled", "error": "Pipeline cancelled"})
+
+            run["status"] = "cancelled"
+            run["finished_at"] = datetime.utcnow()
+            logger.info(f"Pipeline {pipeline_id} cancelled")
+            return {
+                "pipeline_id": pipeline_id,
+                "status": "cancelled",
+                "cancelled_at": run["finished_at"].isoformat()
+            }
+
+        async with AsyncSessionLocal() as db:
+            updated = await PipelineRepository(db).set_schedule_status(pipeline_id, "cancelled")
+
+        if updated:
+            self._schedules.pop(pipeline_id, None)
+            self._wakeup.set()
+            logger.info(f"Schedule {pipeline_id} cancelled")
+            return {
+                "pipeline_id": pipeline_id,
+                "status": "cancelled",
+                "cancelled_at": datetime.utcnow().isoformat()
+            }
+
+        return None
+
+    def get_schedule(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Active schedule from memory"""
+        return self._schedules.get(schedule_id)
+
+
+# Global instance
+pipeline_scheduler = PipelineScheduler()
@@ -0,0 +1,88 @@
+"""Shared fixtures for the worker test suite"""
+
+import pytest
+
+
+class RecordingResult:
+    """Stands in for a SQLAlchemy Result over in-memory rows"""
+
+    def __init__(self, rows=(), rowcount=None):
+        self._rows = list(rows)
+        self.rowcount = len(self._rows) if rowcount is None else rowcount
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self._rows:
+            yield row
+
+
+class RecordingSession:
+    """Stands in for AsyncSession: records every statement and answers from memory
+
+    Each statement returns `rows` unless `respond(sql, params)` is set; it returns
+    the rows for that statement, or an int rowcount for DML. COPY payloads sent
+    through the raw asyncpg connection are captured in `copied`.
+    """
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.respond = None
+        self.queries = []
+        self.execution_options = None
+        self.copied = None
+        self.commits = 0
+
+    @property
+    def committed(self):
+        return self.commits > 0
+
+    def _result(self, sql, params):
+        answer = self.respond(sql, params) if self.respond else self.rows
+        if isinstance(answer, int):
+            return RecordingResult(rowcount=answer)
+        return RecordingResult(answer)
+
+    async def execute(self, statement, params=None):
+        self.queries.append((str(statement), params))
+        return self._result(str(statement), params)
+
+    async def stream(self, statement, params=None, execution_options=None):
+        self.queries.append((str(statement), params))
+        self.execution_options = execution_options
+        return self._result(str(statement), params)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def connection(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    @property
+    def driver_connection(self):
+        return self
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied = {"table": table, "columns": columns, "records": records}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def recording_session():
+    """A fresh RecordingSession; set `rows` or `respond` to shape its answers"""
+    return RecordingSession()
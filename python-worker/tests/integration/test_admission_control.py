@@ -0,0 +1,67 @@
+"""Tests for admission control on forecast submissions"""
+
+import pytest
+
+from app.core.admission import AdmissionController, AdmissionRejected
+from app.core.config import settings
+from app.core.job_scheduler import job_scheduler
+
+
+@pytest.fixture
+def controller(monkeypatch):
+    """Controller with a small queue limit and an idle DB pool"""
+    monkeypatch.setattr(settings, "ADMISSION_MAX_QUEUE_DEPTH", 10)
+    monkeypatch.setattr(settings, "ADMISSION_INTERACTIVE_HEADROOM", 5)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_ESTIMATED_WAIT_SECONDS", 10_000)
+    monkeypatch.setattr(AdmissionController, "pool_saturation", lambda self: 0.1)
+    monkeypatch.setattr(job_scheduler, "queue_depth",
+                        lambda: {"interactive": 0, "scheduled": 8, "backfill": 0})
+    return AdmissionController()
+
+
+def test_batch_over_queue_limit_is_rejected_with_retry_after(controller):
+    """A batch that would overflow the queue gets 429 and a Retry-After hint"""
+    with pytest.raises(AdmissionRejected) as rejection:
+        controller.check("scheduled", job_count=5)
+
+    assert rejection.value.status_code == 429
+    assert rejection.value.reason == "queue_depth"
+    assert rejection.value.retry_after >= settings.ADMISSION_RETRY_AFTER_SECONDS
+
+
+def test_interactive_jobs_use_reserved_headroom(controller):
+    """Operators can still submit when batches are being shed"""
+    assert controller.check("interactive", job_count=3) == {"admitted": 3}
+
+
+def test_saturated_db_pool_returns_503(controller, monkeypatch):
+    """DB pool saturation is transient overload -> 503"""
+    monkeypatch.setattr(AdmissionController, "pool_saturation", lambda self: 0.95)
+
+    with pytest.raises(AdmissionRejected) as rejection:
+        controller.check("interactive")
+
+    assert rejection.value.status_code == 503
+    assert rejection.value.reason == "db_pool"
+
+
+def test_long_estimated_wait_is_rejected(controller, monkeypatch):
+    """Jobs that would wait longer than the configured bound are turned away"""
+    monkeypatch.setattr(settings, "ADMISSION_MAX_ESTIMATED_WAIT_SECONDS", 60)
+    monkeypatch.setattr(job_scheduler, "average_job_seconds", lambda: 30.0)
+
+    with pytest.raises(AdmissionRejected) as rejection:
+        controller.check("scheduled", job_count=2)
+
+    assert rejection.value.reason == "estimated_wait"
+
+
+def test_draining_worker_rejects_everything(controller):
+    """After stop_admitting() every lane gets 503 until resumed"""
+    controller.stop_admitting()
+    with pytest.raises(AdmissionRejected) as rejection:
+        controller.check("interactive")
+    assert rejection.value.status_code == 503
+
+    controller.resume_admitting()
+    assert controller.check("interactive") == {"admitted": 1}
@@ -0,0 +1,88 @@
+"""Tests for engine output resolutions and grid detection"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.job_scheduler import job_scheduler
+from app.core.task_manager import task_manager
+from app.modules.forecast.services import ForecastService
+from app.modules.forecast.utils.time_resolution import (
+    is_on_grid,
+    resample_forecast,
+    resample_weather,
+    resolution_frequency
+)
+
+
+def _hourly(hours=24, **columns):
+    index = pd.date_range("2025-06-01", periods=hours, freq="h", tz="UTC")
+    ghi = np.clip(800 * np.sin((index.hour.values - 6) / 12 * np.pi), 0, None)
+    data = {"ghi": ghi, "temp_air": 15 + index.hour.values * 0.5}
+    data.update(columns)
+    return pd.DataFrame(data, index=index)
+
+
+def test_grid_detection():
+    """Only gap-free, boundary-aligned indexes count as on the grid"""
+    grid = pd.date_range("2025-06-01", periods=8, freq="15min", tz="UTC")
+
+    assert is_on_grid(grid, "15min")
+    assert not is_on_grid(grid, "5min")
+    assert not is_on_grid(grid.delete(3), "15min")
+    assert not is_on_grid(grid + pd.Timedelta(minutes=1), "15min")
+    assert is_on_grid(grid[::4], "1h")
+
+
+@pytest.mark.parametrize("resolution,points", [("FIVE_MINUTES", 277), ("FIFTEEN_MINUTES", 93), ("HOURLY", 24)])
+def test_weather_resampled_onto_each_resolution(resolution, points):
+    """Hourly weather lands on the requested grid; an hourly target is a no-op"""
+    hourly = _hourly()
+    freq = resolution_frequency(resolution)
+    weather = resample_weather(hourly, freq)
+
+    assert len(weather) == points
+    assert is_on_grid(weather.index, freq)
+    # Source hours keep their values
+    on_the_hour = weather[weather.index.minute == 0]
+    np.testing.assert_allclose(on_the_hour["temp_air"], hourly["temp_air"])
+
+
+def test_forecast_energy_scales_with_interval_length():
+    """Energy per interval follows the target / source interval ratio"""
+    hourly = _hourly(energy_mwh=np.full(24, 4.0), prediction=np.full(24, 4000.0))
+
+    quarter = resample_forecast(hourly, "15min")
+    assert np.allclose(quarter["energy_mwh"], 1.0)
+    assert np.allclose(quarter["prediction"], 4000.0)
+
+    # Already on the grid: energy is left alone
+    assert np.allclose(resample_forecast(quarter, "15min")["energy_mwh"], 1.0)
+
+
+def test_unknown_resolution_is_rejected():
+    with pytest.raises(ValueError):
+        resolution_frequency("DAILY")
+
+
+@pytest.mark.asyncio
+async def test_queued_task_carries_its_resolution(monkeypatch):
+    """Resolution defaults to the setting and invalid values never reach the queue"""
+    submitted = []
+
+    async def submit(task_id, **spec):
+        submitted.append(spec)
+
+    monkeypatch.setattr(job_scheduler, "submit", submit)
+    service = ForecastService(db=None)
+
+    five = await service.queue_forecast_generation("loc-1", resolution="FIVE_MINUTES")
+    default = await service.queue_forecast_generation("loc-2")
+
+    assert task_manager.get_task(five)["resolution"] == "FIVE_MINUTES"
+    assert task_manager.get_task(default)["resolution"] == "FIFTEEN_MINUTES"
+    assert [spec["resolution"] for spec in submitted] == ["FIVE_MINUTES", "FIFTEEN_MINUTES"]
+
+    with pytest.raises(ValueError):
+        await service.queue_forecast_generation("loc-3", resolution="WEEKLY")
+    assert len(submitted) == 2
@@ -0,0 +1,100 @@
+"""Tests for the write-behind forecast sink"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast import sink as sink_module
+from app.modules.forecast.sink import ForecastWriteSink
+
+
+def _rows(location_id: str, hours):
+    return {
+        "id": [f"{location_id}-{h}" for h in hours],
+        "timestamp": [datetime(2025, 6, 1, h) for h in hours],
+        "locationId": [location_id] * len(hours),
+        "powerMW": [float(h) for h in hours]
+    }
+
+
+@pytest.fixture
+def merges(monkeypatch):
+    """Capture merged batches instead of writing to the database"""
+    captured = []
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def fake_write(self, columns):
+        captured.append(columns)
+        return len(columns["id"])
+
+    monkeypatch.setattr(sink_module, "AsyncSessionLocal", fake_session)
+    monkeypatch.setattr(sink_module.ForecastRepository, "write_forecast_rows", fake_write)
+    monkeypatch.setattr(settings, "FORECAST_SINK_FLUSH_SECONDS", 0.05)
+    return captured
+
+
+@pytest.mark.asyncio
+async def test_writes_from_several_jobs_land_in_one_merge(merges):
+    """Writers are acknowledged only after the shared flush committed"""
+    sink = ForecastWriteSink()
+    await sink.start()
+
+    saved = await asyncio.wait_for(
+        asyncio.gather(sink.write(_rows("a", [0, 1, 2])), sink.write(_rows("b", [0, 1]))),
+        timeout=2
+    )
+    await sink.stop()
+
+    assert saved == [(3, 0), (2, 0)]
+    assert len(merges) == 1
+    assert len(merges[0]["id"]) == 5
+
+
+@pytest.mark.asyncio
+async def test_later_write_wins_for_repeated_location_timestamp(merges):
+    """Two runs for the same location in one flush do not collide in the upsert"""
+    sink = ForecastWriteSink()
+    first = asyncio.create_task(sink.write(_rows("a", [0, 1])))
+    second = asyncio.create_task(sink.write({**_rows("a", [1, 2]), "powerMW": [10.0, 20.0]}))
+    await asyncio.sleep(0)
+
+    await sink.flush()
+
+    assert await first == (2, 0) and await second == (2, 0)
+    assert merges[0]["powerMW"] == [0.0, 10.0, 20.0]
+
+
+@pytest.mark.asyncio
+async def test_rows_of_a_cancelled_writer_stay_buffered_for_stop(merges):
+    """A job cancelled while awaiting its write is still reported and landed at stop"""
+    sink = ForecastWriteSink()
+    writer = asyncio.create_task(sink.write({**_rows("a", [0, 1]), "runId": ["task-1", "task-1"]}))
+    await asyncio.sleep(0)
+
+    writer.cancel()
+    await asyncio.gather(writer, return_exceptions=True)
+
+    assert sink.buffered_run_ids() == {"task-1"}
+    await sink.stop()
+    assert len(merges[0]["id"]) == 2 and sink.buffered_run_ids() == set()
+
+
+@pytest.mark.asyncio
+async def test_append_mode_keeps_both_runs_of_a_location(merges, monkeypatch):
+    """Runs are stored side by side in append mode, so one flush must keep both"""
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "append")
+    sink = ForecastWriteSink()
+    first = asyncio.create_task(sink.write({**_rows("a", [0, 1]), "runId": ["run-1"] * 2}))
+    second = asyncio.create_task(sink.write({**_rows("a", [0, 1]), "runId": ["run-2"] * 2}))
+    await asyncio.sleep(0)
+
+    await sink.flush()
+
+    assert await first == (2, 0) and await second == (2, 0)
+    assert merges[0]["runId"] == ["run-1", "run-1", "run-2", "run-2"]
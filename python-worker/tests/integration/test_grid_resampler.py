@@ -0,0 +1,94 @@
+"""Tests for whole-frame resampling with cached interpolation plans"""
+
+import numpy as np
+import pandas as pd
+
+from app.modules.forecast.utils.resampling import GridResampler
+from app.modules.forecast.utils.time_resolution import resample_weather_to_15min
+
+
+def _hourly_weather(start="2025-06-01", hours=48):
+    index = pd.date_range(start, periods=hours, freq="h", tz="UTC")
+    ghi = np.clip(800 * np.sin((index.hour.values - 6) / 12 * np.pi), 0, None)
+    return pd.DataFrame({
+        "temp_air": 15 + index.hour.values * 0.5,
+        "ghi": ghi,
+        "dni": ghi * 0.7,
+        "cloud_cover": (index.hour.values % 3) * 10.0
+    }, index=index)
+
+
+def test_matches_per_column_pandas_interpolation():
+    """Cubic and linear columns agree with pandas resample().interpolate()"""
+    weather = _hourly_weather()
+    resampler = GridResampler()
+
+    result = resampler.resample(weather, {"cubic": ["ghi", "dni"], "ffill": ["cloud_cover"]})
+
+    expected_ghi = weather["ghi"].resample("15min").interpolate(method="cubic")
+    expected_temp = weather["temp_air"].resample("15min").interpolate(method="linear")
+    np.testing.assert_allclose(result["ghi"], expected_ghi, atol=1e-9)
+    np.testing.assert_allclose(result["temp_air"], expected_temp, atol=1e-9)
+    assert result["cloud_cover"].tolist() == weather["cloud_cover"].resample("15min").ffill().tolist()
+
+
+def test_plans_are_reused_across_locations_on_the_same_grid():
+    """A batch of locations on one weather grid builds each plan once"""
+    resampler = GridResampler()
+    for offset in range(5):
+        frame = _hourly_weather() + offset
+        resampler.resample(frame, {"cubic": ["ghi", "dni"]})
+
+    # One linear (temp_air, cloud_cover) and one cubic (ghi, dni) plan
+    assert resampler.misses == 2
+    assert resampler.hits == 8
+
+
+def test_irregular_and_gappy_source_timestamps():
+    """Off-grid samples interpolate in real time; long gaps can be left empty"""
+    index = pd.DatetimeIndex(
+        ["2025-06-01 00:00", "2025-06-01 00:50", "2025-06-01 02:10", "2025-06-01 08:00", "2025-06-01 08:30"],
+        tz="UTC"
+    )
+    frame = pd.DataFrame({"temp_air": [10.0, 15.0, 23.0, 30.0, 31.0]}, index=index)
+
+    result = GridResampler().resample(frame, {}, max_gap=pd.Timedelta(hours=2))
+
+    assert result.index[0] == index[0] and result.index[-1] == pd.Timestamp("2025-06-01 08:30", tz="UTC")
+    assert result.loc["2025-06-01 00:30", "temp_air"].item() == 13.0
+    assert result.loc["2025-06-01 01:30", "temp_air"].item() == 19.0
+    # 02:10 -> 08:00 is longer than max_gap
+    assert result.loc["2025-06-01 02:15":"2025-06-01 07:45", "temp_air"].isna().all()
+    assert result.loc["2025-06-01 08:15", "temp_air"].item() == 30.5
+
+
+def test_columns_with_missing_rows_use_their_own_plan():
+    """NaN rows are skipped per column like pandas does"""
+    weather = _hourly_weather()
+    weather.loc[weather.index[10], "temp_air"] = np.nan
+
+    result = resample_weather_to_15min(weather)
+
+    assert not result["temp_air"].isna().any()
+    assert (result[["ghi", "dni"]] >= 0).all().all()
+    assert (result.loc[result["ghi"] < 1, "dni"] == 0).all()
+
+
+def test_plan_cache_is_bounded_by_bytes():
+    """Dense cubic plans are evicted by size, and a plan over the budget is not kept"""
+    weather = _hourly_weather(hours=168)
+    probe = GridResampler()
+    probe.resample(weather[["ghi"]], {"cubic": ["ghi"]}, freq="5min")
+    plan_bytes = probe.memory_bytes()
+
+    resampler = GridResampler(max_bytes=int(plan_bytes * 2.5))
+    for day in range(1, 5):
+        shifted = _hourly_weather(start=f"2025-06-0{day}", hours=168)
+        resampler.resample(shifted[["ghi"]], {"cubic": ["ghi"]}, freq="5min")
+
+    assert len(resampler._plans) == 2
+    assert resampler.memory_bytes() <= plan_bytes * 2.5
+
+    tiny = GridResampler(max_bytes=plan_bytes // 2)
+    tiny.resample(weather[["ghi"]], {"cubic": ["ghi"]}, freq="5min")
+    assert tiny.memory_bytes() == 0 and len(tiny._plans) == 0
@@ -0,0 +1,43 @@
+"""Tests for the shared pooled HTTP client"""
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.http_client import HTTP2_AVAILABLE, SharedHttpClient
+from app.core.metrics import HTTP_CLIENT_REQUESTS
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_until_stopped():
+    """Every caller gets the same pooled client; stop() closes it"""
+    shared = SharedHttpClient()
+    await shared.start()
+    client = shared.get()
+
+    assert shared.get() is client
+    assert client.timeout.connect == settings.HTTP_CLIENT_CONNECT_TIMEOUT
+
+    await shared.stop()
+    assert client.is_closed
+    assert shared.get() is not client
+    await shared.stop()
+
+
+@pytest.mark.asyncio
+async def test_responses_are_counted_per_host():
+    """The response hook records request counts by host and status"""
+    shared = SharedHttpClient()
+    before = HTTP_CLIENT_REQUESTS.labels(host="sveltekit.test", status="200")._value.get()
+
+    request = httpx.Request("GET", "http://sveltekit.test/api/health")
+    await shared._on_request(request)
+    await shared._on_response(httpx.Response(200, request=request))
+
+    assert HTTP_CLIENT_REQUESTS.labels(host="sveltekit.test", status="200")._value.get() == before + 1
+
+
+def test_http2_only_with_h2_installed(monkeypatch):
+    """HTTP/2 is requested only when the optional h2 package is present"""
+    monkeypatch.setattr(settings, "HTTP_CLIENT_HTTP2", True)
+    assert SharedHttpClient()._client_http2() is HTTP2_AVAILABLE
@@ -0,0 +1,157 @@
+"""Tests for priority lanes, per-client fair queuing, drain and resume of forecast jobs"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core.config import settings
+from app.core.job_scheduler import ForecastJobScheduler, job_scheduler
+from app.modules.forecast import services as forecast_services
+from app.modules.forecast.repositories import ForecastRepository
+
+
+@pytest.fixture
+def single_worker(monkeypatch):
+    """One worker, no reserved capacity - makes dispatch order deterministic"""
+    monkeypatch.setattr(settings, "SCHEDULER_WORKERS", 1)
+    monkeypatch.setattr(settings, "SCHEDULER_INTERACTIVE_RESERVED_WORKERS", 0)
+    monkeypatch.setattr(settings, "SCHEDULER_CLIENT_WEIGHTS", {})
+
+
+async def _run_all(scheduler: ForecastJobScheduler, jobs, expected: int):
+    """Submit jobs before starting the worker and return execution order"""
+    order = []
+    done = asyncio.Event()
+
+    async def runner(task_id: str):
+        order.append(task_id)
+        if len(order) == expected:
+            done.set()
+
+    for task_id, client_id, priority in jobs:
+        await scheduler.submit(task_id, client_id=client_id, priority=priority)
+
+    await scheduler.start(runner=runner)
+    await asyncio.wait_for(done.wait(), timeout=2)
+    await scheduler.stop()
+    return order
+
+
+@pytest.mark.asyncio
+async def test_interactive_jobs_run_before_queued_batches(single_worker):
+    """An operator request jumps ahead of scheduled and backfill work"""
+    scheduler = ForecastJobScheduler()
+    jobs = [(f"batch-{i}", 1, "scheduled") for i in range(5)]
+    jobs += [("backfill-0", 1, "backfill"), ("operator", 2, "interactive")]
+
+    order = await _run_all(scheduler, jobs, expected=7)
+
+    assert order[0] == "operator"
+    assert order[-1] == "backfill-0"
+
+
+@pytest.mark.asyncio
+async def test_clients_share_a_lane_fairly(single_worker):
+    """A client with a large batch does not starve a client with a small one"""
+    scheduler = ForecastJobScheduler()
+    jobs = [(f"big-{i}", 1, "scheduled") for i in range(6)]
+    jobs += [(f"small-{i}", 2, "scheduled") for i in range(2)]
+
+    order = await _run_all(scheduler, jobs, expected=8)
+
+    # Round-robin while both clients have work queued
+    assert order[:4] == ["big-0", "small-0", "big-1", "small-1"]
+
+
+@pytest.mark.asyncio
+async def test_client_weights_scale_share(single_worker, monkeypatch):
+    """A client with weight 2 gets two slots per slot of a weight-1 client"""
+    monkeypatch.setattr(settings, "SCHEDULER_CLIENT_WEIGHTS", {"1": 2.0})
+    scheduler = ForecastJobScheduler()
+    jobs = [(f"heavy-{i}", 1, "scheduled") for i in range(4)]
+    jobs += [(f"light-{i}", 2, "scheduled") for i in range(2)]
+
+    order = await _run_all(scheduler, jobs, expected=6)
+
+    assert order[:3].count("light-0") == 1
+    assert [job for job in order[:3] if job.startswith("heavy")] == ["heavy-0", "heavy-1"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_removes_queued_job(single_worker):
+    """Cancelled jobs never reach the runner"""
+    scheduler = ForecastJobScheduler()
+    await scheduler.submit("keep", client_id=1, priority="scheduled")
+    await scheduler.submit("drop", client_id=1, priority="scheduled")
+
+    assert await scheduler.cancel("drop") is True
+    assert scheduler.queue_depth()["scheduled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_priority_is_rejected():
+    """Only interactive/scheduled/backfill lanes exist"""
+    with pytest.raises(ValueError):
+        await ForecastJobScheduler().submit("x", priority="urgent")
+
+
+@pytest.mark.asyncio
+async def test_drain_returns_unfinished_jobs(single_worker):
+    """Drain waits for the running job, cancels it at the deadline and hands back everything unfinished"""
+    scheduler = ForecastJobScheduler()
+    started = asyncio.Event()
+
+    async def runner(task_id: str):
+        started.set()
+        await asyncio.sleep(10)
+
+    await scheduler.submit("running", client_id=1, priority="scheduled", location_id="loc-1")
+    await scheduler.submit("queued", client_id=2, priority="backfill", location_id="loc-2")
+    await scheduler.start(runner=runner)
+    await asyncio.wait_for(started.wait(), timeout=2)
+
+    unfinished = await scheduler.drain(timeout=0.1)
+
+    assert sorted(job["task_id"] for job in unfinished) == ["queued", "running"]
+    assert {job["location_id"] for job in unfinished} == {"loc-1", "loc-2"}
+    assert scheduler.in_flight() == 0
+    assert sum(scheduler.queue_depth().values()) == 0
+
+
+@pytest.mark.asyncio
+async def test_jobs_that_fail_to_resume_are_checkpointed_again(monkeypatch):
+    """Claimed checkpoints are not lost when queueing some of them fails"""
+    jobs = [
+        {"task_id": task_id, "location_id": "loc-1", "horizon_hours": 48, "model_type": "PHYSICS",
+         "priority": "backfill", "client_id": None, "batch_id": None, "resolution": None}
+        for task_id in ("resumed", "rejected")
+    ]
+    saved = []
+
+    @asynccontextmanager
+    async def fake_session():
+        yield None
+
+    async def ensure_table(self):
+        pass
+
+    async def claim(self):
+        return jobs
+
+    async def save(self, failed):
+        saved.extend(failed)
+        return len(failed)
+
+    async def submit(task_id, **spec):
+        if task_id == "rejected":
+            raise RuntimeError("queue full")
+
+    monkeypatch.setattr(forecast_services, "AsyncSessionLocal", fake_session)
+    monkeypatch.setattr(ForecastRepository, "ensure_job_checkpoint_table", ensure_table)
+    monkeypatch.setattr(ForecastRepository, "claim_job_checkpoints", claim)
+    monkeypatch.setattr(ForecastRepository, "save_job_checkpoints", save)
+    monkeypatch.setattr(job_scheduler, "submit", submit)
+
+    assert await forecast_services.resume_checkpointed_jobs() == 1
+    assert [job["task_id"] for job in saved] == ["rejected"]
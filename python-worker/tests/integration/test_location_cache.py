@@ -0,0 +1,68 @@
+"""Tests for the location config cache"""
+
+from datetime import datetime
+
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast.location_cache import LocationConfigCache
+
+
+class _Locations:
+    def __init__(self):
+        self.updated_at = datetime(2025, 6, 1)
+        self.loads = 0
+        self.checks = 0
+
+    async def load(self, location_id):
+        self.loads += 1
+        if location_id == "missing":
+            return None
+        location = {"id": location_id, "updatedAt": self.updated_at, "plantData": {"panels": {"tilt": 30}}}
+        return location, {"plant": {"panels": {"tilt": 30}}}
+
+    async def version(self, location_id):
+        self.checks += 1
+        return self.updated_at
+
+
+@pytest.mark.asyncio
+async def test_validation_and_task_share_one_load():
+    """Second lookup is served from the cache and returns an independent copy"""
+    cache, db = LocationConfigCache(), _Locations()
+
+    _, config = await cache.get("loc-1", db.load, db.version)
+    config["plant"]["panels"]["tilt"] = 0  # engine-side mutation must not leak
+    _, config_again = await cache.get("loc-1", db.load, db.version)
+
+    assert db.loads == 1
+    assert config_again["plant"]["panels"]["tilt"] == 30
+
+
+@pytest.mark.asyncio
+async def test_updated_at_change_triggers_reload(monkeypatch):
+    """Past the check interval a changed updatedAt reloads the location"""
+    monkeypatch.setattr(settings, "LOCATION_CACHE_CHECK_SECONDS", 0)
+    cache, db = LocationConfigCache(), _Locations()
+
+    await cache.get("loc-1", db.load, db.version)
+    await cache.get("loc-1", db.load, db.version)
+    assert (db.loads, db.checks) == (1, 1)
+
+    db.updated_at = datetime(2025, 6, 2)
+    location, _ = await cache.get("loc-1", db.load, db.version)
+    assert db.loads == 2
+    assert location["updatedAt"] == datetime(2025, 6, 2)
+
+
+@pytest.mark.asyncio
+async def test_unknown_location_and_invalidate():
+    """Unknown locations are not cached; invalidate forces a reload"""
+    cache, db = LocationConfigCache(), _Locations()
+
+    assert await cache.get("missing", db.load, db.version) is None
+    await cache.get("loc-1", db.load, db.version)
+    assert cache.invalidate("loc-1") == 1
+    await cache.get("loc-1", db.load, db.version)
+
+    assert db.loads == 3
@@ -0,0 +1,114 @@
+"""Tests for cron parsing, run spreading and schedule claiming in the pipeline scheduler"""
+
+import pytest
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.modules.pipeline import scheduler as scheduler_module
+from app.modules.pipeline.cron import CronExpression
+from app.modules.pipeline.scheduler import PipelineScheduler, compute_run_offsets
+
+
+@pytest.mark.parametrize("expression,after,expected", [
+    ("0 */6 * * *", datetime(2025, 9, 14, 13, 5), datetime(2025, 9, 14, 18, 0)),
+    ("*/15 * * * *", datetime(2025, 9, 14, 13, 59, 30), datetime(2025, 9, 14, 14, 0)),
+    ("30 2 * * 1-5", datetime(2025, 9, 13, 12, 0), datetime(2025, 9, 15, 2, 30)),  # Sat -> Mon
+    ("0 12 * * 7", datetime(2025, 9, 14, 12, 0), datetime(2025, 9, 21, 12, 0)),    # 7 = Sunday
+    ("0 0 29 2 *", datetime(2025, 3, 1), datetime(2028, 2, 29, 0, 0)),
+    ("@daily", datetime(2025, 12, 31, 23, 59), datetime(2026, 1, 1, 0, 0)),
+    ("5/1 * * * *", datetime(2025, 6, 1, 10, 5), datetime(2025, 6, 1, 10, 6)),
+])
+def test_cron_next_after(expression, after, expected):
+    """Next run is the first matching minute strictly after the given time"""
+    assert CronExpression(expression).next_after(after) == expected
+
+
+def test_cron_day_fields_are_ored_when_both_restricted():
+    """Vixie semantics: day-of-month OR day-of-week"""
+    cron = CronExpression("0 4 1 * 0")
+    # 2025-09-14 is a Sunday, before October 1st
+    assert cron.next_after(datetime(2025, 9, 10)) == datetime(2025, 9, 14, 4, 0)
+
+
+@pytest.mark.parametrize("expression", ["61 * * * *", "* * *", "a * * * *", "*/0 * * * *"])
+def test_cron_rejects_invalid_expressions(expression):
+    """Malformed expressions raise ValueError (mapped to HTTP 400)"""
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+def test_run_offsets_spread_over_window_with_one_start_per_slot():
+    """Each location starts inside its own slot of the spread window"""
+    offsets = compute_run_offsets(200, 600)
+    slot = 600 / 200
+
+    assert len(offsets) == 200
+    for i, offset in enumerate(offsets):
+        assert i * slot <= offset <= (i + 1) * slot
+
+
+def test_run_offsets_without_spread_start_immediately():
+    """spread_seconds=0 dispatches every location at once"""
+    assert compute_run_offsets(3, 0) == [0.0, 0.0, 0.0]
+    assert compute_run_offsets(0, 300) == []
+
+
+class _FailingSession:
+    async def __aenter__(self):
+        raise ConnectionError("database unavailable")
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.mark.asyncio
+async def test_failed_claim_backs_off_instead_of_staying_due(monkeypatch):
+    """A DB error while claiming pushes the schedule out so the loop sleeps"""
+    monkeypatch.setattr(scheduler_module, "AsyncSessionLocal", _FailingSession)
+    scheduler = PipelineScheduler()
+    now = datetime(2025, 9, 14, 12, 0)
+    schedule = {"schedule_id": "schedule_1", "cron_expression": "0 * * * *", "next_run": now}
+    scheduler._schedules["schedule_1"] = schedule
+
+    await scheduler._fire_schedule(schedule, now)
+
+    assert schedule["next_run"] == now + timedelta(seconds=settings.PIPELINE_SCHEDULER_RETRY_SECONDS)
+
+    # Reload failures keep the backed-off schedule in memory
+    await scheduler._reload_schedules()
+    assert scheduler._schedules == {"schedule_1": schedule}
+
+
+@pytest.mark.asyncio
+async def test_dispatch_holds_no_session_while_spreading(monkeypatch):
+    """Client IDs are loaded in a short session that closes before the first sleep"""
+    open_sessions = []
+
+    class _Session:
+        async def __aenter__(self):
+            open_sessions.append(self)
+            return self
+
+        async def __aexit__(self, *exc):
+            open_sessions.remove(self)
+            return False
+
+    async def client_ids(self, location_ids):
+        return {location_id: "client-1" for location_id in location_ids}
+
+    queued = []
+
+    async def queue(self, location_id, **kwargs):
+        queued.append((location_id, len(open_sessions)))
+        return f"task-{location_id}"
+
+    monkeypatch.setattr(scheduler_module, "AsyncSessionLocal", _Session)
+    monkeypatch.setattr(scheduler_module.ForecastService, "get_location_client_ids", client_ids)
+    monkeypatch.setattr(scheduler_module.ForecastService, "queue_forecast_generation", queue)
+
+    scheduler = PipelineScheduler()
+    run = await scheduler.start_run(["loc-1", "loc-2"], spread_seconds=0.05)
+    await scheduler._dispatchers[run["pipeline_id"]]
+
+    assert queued == [("loc-1", 0), ("loc-2", 0)]
+    assert run["task_ids"] == ["task-loc-1", "task-loc-2"]
@@ -0,0 +1,92 @@
+"""Integration tests for push-based task progress streaming"""
+
+import asyncio
+import pytest
+
+from app.core.job_scheduler import job_scheduler
+from app.core.task_manager import task_manager
+from app.modules.forecast.services import ForecastService
+
+
+@pytest.mark.asyncio
+async def test_batch_event_stream_pushes_transitions_and_summary():
+    """Batch stream emits snapshots, per-task results and a final summary"""
+    service = ForecastService(db=None)
+    batch_id = "test-batch-events"
+    first = await service.queue_forecast_generation("loc-1", batch_id=batch_id)
+    second = await service.queue_forecast_generation("loc-2", batch_id=batch_id)
+
+    async def drive_tasks():
+        await asyncio.sleep(0.01)
+        task_manager.update_task(first, {"status": "processing", "progress": 40})
+        task_manager.update_task(second, {"status": "failed", "error": "no weather"})
+        task_manager.update_task(first, {
+            "status": "completed", "progress": 100, "result": {"forecast_count": 96}
+        })
+
+    driver = asyncio.create_task(drive_tasks())
+    events = [
+        (event, data)
+        async for event, data in service.stream_task_events(
+            task_manager.get_batch_task_ids(batch_id)
+        )
+    ]
+    await driver
+
+    assert [event for event, _ in events] == [
+        "progress", "progress", "progress", "result", "result", "batch_complete"
+    ]
+    assert events[2][1]["progress"] == 40
+    assert events[4][1]["result"] == {"forecast_count": 96}
+    assert events[-1][1] == {
+        "total": 2, "completed": 1, "failed": 1, "cancelled": 0, "missing": 0
+    }
+
+    # Subscriptions are released once the stream ends
+    assert first not in task_manager._subscribers
+    assert second not in task_manager._subscribers
+
+
+@pytest.mark.asyncio
+async def test_event_stream_for_finished_task_returns_immediately():
+    """A task that already finished yields its result and closes the stream"""
+    service = ForecastService(db=None)
+    task_id = await service.queue_forecast_generation("loc-3")
+    task_manager.update_task(task_id, {"status": "completed", "progress": 100})
+
+    events = [event async for event, _ in service.stream_task_events([task_id])]
+
+    assert events == ["result"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_running_task_reaches_a_terminal_status(monkeypatch):
+    """Cancelling a running job ends its event stream with a cancelled result"""
+    submitted = []
+
+    async def submit(task_id, **spec):
+        submitted.append(task_id)
+
+    monkeypatch.setattr(job_scheduler, "submit", submit)
+    service = ForecastService(db=None)
+    task_id = await service.queue_forecast_generation("loc-4")
+    started = asyncio.Event()
+
+    async def slow_location(location_id):
+        started.set()
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(service, "get_location_config", slow_location)
+    running = asyncio.create_task(service.process_forecast_task(task_id))
+    await started.wait()
+
+    events = service.stream_task_events([task_id])
+    assert (await events.__anext__())[0] == "progress"
+
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+
+    event, data = await asyncio.wait_for(events.__anext__(), timeout=1)
+    assert event == "result" and data["status"] == "cancelled"
+    await events.aclose()
@@ -0,0 +1,99 @@
+"""Tests for the per-location weather window cache"""
+
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast.weather_cache import WeatherCache
+
+
+class _Source:
+    """weather_data stand-in recording every fetch"""
+
+    def __init__(self, end: datetime):
+        self.index = pd.date_range(datetime(2025, 6, 1), end, freq="h")
+        self.calls = []
+
+    async def fetch(self, location_id, start_time, end_time, after):
+        self.calls.append(after)
+        lower = self.index > after if after is not None else self.index >= start_time
+        index = self.index[lower & (self.index <= end_time)]
+        return pd.DataFrame({"ghi": [float(ts.hour) for ts in index]}, index=index)
+
+
+START = datetime(2025, 6, 1)
+
+
+@pytest.mark.asyncio
+async def test_repeat_within_freshness_costs_no_queries():
+    """Second read of a covered window is served from memory"""
+    cache, source = WeatherCache(), _Source(START + timedelta(hours=48))
+
+    first = await cache.get_window("loc-1", START, START + timedelta(hours=24), source.fetch)
+    second = await cache.get_window("loc-1", START + timedelta(hours=1), START + timedelta(hours=24), source.fetch)
+
+    assert len(source.calls) == 1
+    assert len(first) == 25 and len(second) == 24
+
+
+@pytest.mark.asyncio
+async def test_longer_horizon_fetches_only_past_high_water_mark():
+    """Extending the window reads rows newer than the cached maximum timestamp"""
+    cache, source = WeatherCache(), _Source(START + timedelta(hours=48))
+
+    await cache.get_window("loc-1", START, START + timedelta(hours=24), source.fetch)
+    window = await cache.get_window("loc-1", START, START + timedelta(hours=48), source.fetch)
+
+    assert source.calls == [None, pd.Timestamp(START + timedelta(hours=24))]
+    assert len(window) == 49
+    assert window.index.is_monotonic_increasing
+
+
+@pytest.mark.asyncio
+async def test_invalidate_and_memory_budget(monkeypatch):
+    """Invalidation forces a reload; over budget the least recently used location goes"""
+    cache, source = WeatherCache(), _Source(START + timedelta(hours=24))
+    end = START + timedelta(hours=24)
+
+    await cache.get_window("loc-1", START, end, source.fetch)
+    cache.invalidate("loc-1")
+    await cache.get_window("loc-1", START, end, source.fetch)
+    assert source.calls == [None, None]
+
+    monkeypatch.setattr(settings, "WEATHER_CACHE_MAX_BYTES", cache.memory_bytes())
+    await cache.get_window("loc-2", START, end, source.fetch)
+    await cache.get_window("loc-1", START, end, source.fetch)
+    assert len(source.calls) == 4  # loc-1 was evicted when loc-2 arrived
+
+
+@pytest.mark.asyncio
+async def test_stale_window_is_reread_to_pick_up_revised_values(monkeypatch):
+    """Past the freshness time cached timestamps are read again, not only newer ones"""
+    cache, source = WeatherCache(), _Source(START + timedelta(hours=24))
+    end = START + timedelta(hours=24)
+
+    await cache.get_window("loc-1", START, end, source.fetch)
+    monkeypatch.setattr(settings, "WEATHER_FRESHNESS_MINUTES", 0)
+
+    async def revised(location_id, start_time, end_time, after):
+        frame = await _Source.fetch(source, location_id, start_time, end_time, after)
+        return frame + 100
+
+    window = await cache.get_window("loc-1", START, end, revised)
+
+    assert source.calls == [None, None]
+    assert window["ghi"].iloc[0] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_locks_go_with_their_entries():
+    """Per-location locks do not pile up for locations no longer cached"""
+    cache, source = WeatherCache(), _Source(START + timedelta(hours=24))
+
+    await cache.get_window("loc-1", START, START + timedelta(hours=24), source.fetch)
+    assert "loc-1" in cache._locks
+
+    cache.invalidate()
+    assert cache._locks == {} and cache._entries == {}
@@ -0,0 +1,140 @@
+"""Tests for hedged SvelteKit weather reads and the circuit breaker"""
+
+import asyncio
+
+import httpx
+import pandas as pd
+import pytest
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import CircuitBreaker, LatencyBudget
+from app.modules.forecast import repositories
+from app.modules.forecast.repositories import ForecastRepository
+
+
+class _StubSvelteKit:
+    """Stub /api/weather/dataframe endpoint with configurable delay and status"""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return httpx.Response(self.status)
+        return httpx.Response(200, json={"success": True, "data": [
+            {"timestamp": "2025-06-01T12:00:00Z", "temperature": 21.0, "ghi": 500.0}
+        ]})
+
+
+class _NoSession:
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Route the shared client to a stub server and use fresh breaker/budget state"""
+    server = _StubSvelteKit()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    monkeypatch.setattr(repositories.http_client, "get", lambda: client)
+
+    breaker = CircuitBreaker("test_weather", failure_threshold=3, reset_seconds=60)
+    latency = LatencyBudget(percentile=95, min_seconds=0.01, max_seconds=0.05)
+    monkeypatch.setattr(repositories, "sveltekit_weather_breaker", breaker)
+    monkeypatch.setattr(repositories, "sveltekit_weather_latency", latency)
+
+    db_reads = []
+
+    async def database_weather(self, location_id, hours):
+        db_reads.append(location_id)
+        return pd.DataFrame({"ghi": [100.0]}, index=pd.DatetimeIndex(["2025-06-01"]))
+
+    monkeypatch.setattr(ForecastRepository, "_get_weather_from_database", database_weather)
+    monkeypatch.setattr(repositories, "AsyncSessionLocal", _NoSession)
+
+    server.breaker = breaker
+    server.db_reads = db_reads
+    return server
+
+
+@pytest.mark.asyncio
+async def test_fast_sveltekit_read_is_not_hedged(stub):
+    """A call within budget is served by SvelteKit only"""
+    df = await ForecastRepository(None).get_recent_weather("loc-1", hours=24)
+
+    assert df["ghi"].tolist() == [500.0]
+    assert "temp_air" in df.columns
+    assert stub.db_reads == []
+    assert stub.breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_slow_sveltekit_read_is_hedged_with_database(stub):
+    """Past the budget the database answer is returned without waiting for SvelteKit"""
+    stub.delay = 2.0
+
+    started = asyncio.get_running_loop().time()
+    df = await ForecastRepository(None).get_recent_weather("loc-1", hours=24)
+
+    assert asyncio.get_running_loop().time() - started < 1.0
+    assert df["ghi"].tolist() == [100.0]
+    assert stub.db_reads == ["loc-1"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_failures_open_the_circuit(stub):
+    """After failure_threshold errors SvelteKit is skipped until the reset time"""
+    stub.status = 503
+    repo = ForecastRepository(None)
+
+    for _ in range(3):
+        await repo.get_recent_weather("loc-1", hours=24)
+    assert stub.calls == 3
+    assert stub.breaker.state == "open"
+
+    df = await repo.get_recent_weather("loc-1", hours=24)
+    assert stub.calls == 3
+    assert df["ghi"].tolist() == [100.0]
+    assert len(stub.db_reads) == 4
+
+
+def test_half_open_trial_closes_or_reopens(monkeypatch):
+    """One trial call after the reset time decides whether the circuit closes"""
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker("test_trial", failure_threshold=1, reset_seconds=10)
+
+    breaker.record_failure()
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_latency_budget_is_clamped_percentile():
+    """The budget follows the observed percentile within its bounds"""
+    budget = LatencyBudget(percentile=95, min_seconds=0.1, max_seconds=2.0, min_samples=5)
+    assert budget.budget() == 2.0
+
+    for seconds in (0.2, 0.3, 0.3, 0.4, 0.5):
+        budget.observe(seconds)
+    assert 0.4 < budget.budget() <= 0.5
+
+    for _ in range(5):
+        budget.observe(0.001)
+    assert budget.budget() >= 0.1
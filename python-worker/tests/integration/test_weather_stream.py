@@ -0,0 +1,70 @@
+"""Tests for incremental decoding of SvelteKit weather dataframe responses"""
+
+import json
+import math
+
+import httpx
+import pytest
+
+from app.modules.forecast import repositories
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.weather_stream import WeatherEnvelopeDecoder, decode_weather_json
+
+RECORDS = [
+    {"timestamp": "2025-06-01T12:00:00.000Z", "temp_air": 21.5, "ghi": None, "windSpeed": "n/a"},
+    {"timestamp": "2025-06-01T12:15:00.000Z", "temp_air": 22, "ghi": 512.25, "dni": 300}
+]
+BODY = json.dumps({"success": True, "data": RECORDS, "metadata": {"recordCount": 2}}).encode()
+
+
+async def _chunks(body: bytes, size: int):
+    for i in range(0, len(body), size):
+        yield body[i:i + size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 5, 64, 10_000])
+async def test_envelope_decodes_into_typed_columns_at_any_chunking(size):
+    """Records land in float64 columns under PVLIB names whatever the chunk boundaries"""
+    envelope, buffers = await decode_weather_json(_chunks(BODY, size))
+    df = buffers.to_frame()
+
+    assert envelope == {"success": True, "metadata": {"recordCount": 2}}
+    assert str(df.index.tz) == "UTC" and df.index.name == "timestamp"
+    assert df["temp_air"].tolist() == [21.5, 22.0]
+    assert math.isnan(df["ghi"].iloc[0]) and df["ghi"].iloc[1] == 512.25
+    assert df["wind_speed"].isna().all()
+    assert math.isnan(df["dni"].iloc[0]) and df["dni"].iloc[1] == 300.0
+    assert (df.dtypes == "float64").all()
+
+
+def test_truncated_body_is_rejected():
+    """A body cut off mid-array is an error, not a short result"""
+    decoder = WeatherEnvelopeDecoder()
+    records = decoder.feed(BODY[:BODY.index(b"512")].decode())
+
+    assert len(records) == 1
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+@pytest.mark.asyncio
+async def test_ndjson_response_is_read_line_by_line(monkeypatch):
+    """An NDJSON answer is decoded without the JSON envelope"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body = "\n".join(json.dumps(record) for record in RECORDS) + "\n"
+        return httpx.Response(200, content=body.encode(), headers={"content-type": "application/x-ndjson"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(repositories.http_client, "get", lambda: client)
+
+    df = await ForecastRepository(None)._get_weather_from_sveltekit("loc-1", hours=24)
+
+    assert requests[0].url.params["format"] == "ndjson"
+    assert df["temp_air"].tolist() == [21.5, 22.0]
+    # Missing readings get the PVLIB defaults
+    assert df["ghi"].tolist() == [0.0, 512.25]
+    assert (df["pressure"] == 1013.25).all()
@@ -0,0 +1,82 @@
+"""Tests for coalesced weather sync triggering"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.config import settings
+from app.integrations.sveltekit import sveltekit_client
+from app.modules.forecast.weather_events import weather_sync_events
+from app.modules.forecast.weather_sync import WeatherSyncCoordinator
+
+
+@pytest.fixture(autouse=True)
+def short_window(monkeypatch):
+    monkeypatch.setattr(settings, "WEATHER_SYNC_COALESCE_SECONDS", 0.05)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_collapse_into_one_bulk_sync():
+    """Duplicate and concurrent requests inside the window become one deduplicated call"""
+    coordinator = WeatherSyncCoordinator()
+    location_ids = [f"loc-{i % 4}" for i in range(12)]
+
+    with patch.object(sveltekit_client, "trigger_bulk_weather_sync", AsyncMock(return_value={"success": True})) as bulk:
+        results = await asyncio.gather(*(coordinator.request_sync(loc) for loc in location_ids))
+
+    assert all(results)
+    bulk.assert_called_once()
+    assert sorted(bulk.call_args[0][0]) == ["loc-0", "loc-1", "loc-2", "loc-3"]
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_at_bulk_max(monkeypatch):
+    """More locations than WEATHER_SYNC_BULK_MAX are synced in several calls"""
+    monkeypatch.setattr(settings, "WEATHER_SYNC_BULK_MAX", 3)
+    coordinator = WeatherSyncCoordinator()
+
+    with patch.object(sveltekit_client, "trigger_bulk_weather_sync", AsyncMock(return_value={})) as bulk:
+        await asyncio.gather(*(coordinator.request_sync(f"loc-{i}") for i in range(7)))
+
+    assert sorted(len(call.args[0]) for call in bulk.call_args_list) == [1, 3, 3]
+
+
+@pytest.mark.asyncio
+async def test_failed_sync_releases_waiters_with_false():
+    """A failing bulk sync resolves every waiter with False"""
+    coordinator = WeatherSyncCoordinator()
+
+    with patch.object(sveltekit_client, "trigger_bulk_weather_sync", AsyncMock(side_effect=RuntimeError("down"))):
+        results = await asyncio.gather(coordinator.request_sync("loc-1"), coordinator.request_sync("loc-2"))
+
+    assert results == [False, False]
+    assert coordinator._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_completion_event_releases_a_location_before_the_bulk_call_returns(monkeypatch):
+    """With sync events delivered, a location's waiters wake when its rows land"""
+    monkeypatch.setattr(weather_sync_events, "_webhook_seen", True)
+    coordinator = WeatherSyncCoordinator()
+    release = asyncio.Event()
+
+    async def slow_bulk(location_ids):
+        await release.wait()
+        return {}
+
+    with patch.object(sveltekit_client, "trigger_bulk_weather_sync", side_effect=slow_bulk):
+        first = asyncio.create_task(coordinator.request_sync("loc-1"))
+        second = asyncio.create_task(coordinator.request_sync("loc-2"))
+        while "loc-1" not in weather_sync_events._waiters:
+            await asyncio.sleep(0.01)
+
+        weather_sync_events.notify(["loc-1"], from_webhook=True)
+
+        assert await asyncio.wait_for(first, timeout=1) is True
+        assert not second.done() and "loc-1" not in coordinator._in_flight
+
+        release.set()
+        assert await asyncio.wait_for(second, timeout=1) is True
+
+    assert weather_sync_events._waiters == {}
@@ -0,0 +1,53 @@
+"""Tests for event-driven weather sync completion"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.integrations.sveltekit import SvelteKitClient
+from app.main import app
+from app.modules.forecast.weather_events import weather_sync_events
+
+LOCATION_ID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+@pytest.fixture(autouse=True)
+def webhook_mode():
+    weather_sync_events._webhook_seen = True
+    yield
+    weather_sync_events._webhook_seen = False
+    weather_sync_events._waiters.clear()
+
+
+@pytest.mark.asyncio
+async def test_completion_event_ends_the_wait_without_polling():
+    """A webhook notification wakes the waiter; status is checked only once"""
+    client = SvelteKitClient()
+
+    with patch.object(client, "get_weather_sync_status", AsyncMock(return_value={"hasRecentData": False})) as status:
+        waiter = asyncio.create_task(client.wait_for_sync_completion(LOCATION_ID, max_wait_seconds=10))
+        await asyncio.sleep(0.05)
+        assert weather_sync_events.notify([LOCATION_ID], from_webhook=True) == 1
+
+        assert await asyncio.wait_for(waiter, timeout=1) is True
+        assert status.call_count == 1
+    assert LOCATION_ID not in weather_sync_events._waiters
+
+
+@pytest.mark.asyncio
+async def test_webhook_endpoint_wakes_waiters():
+    """POST /weather/synced resolves registered waiters"""
+    completion = weather_sync_events.register(LOCATION_ID)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/api/v1/forecasts/weather/synced",
+            json={"location_ids": [LOCATION_ID, LOCATION_ID]}
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {"locations": 1, "waiters_woken": 1}
+    assert completion.done()
@@ -0,0 +1,63 @@
+"""Tests for the multi-location forecast read endpoint"""
+
+from datetime import datetime
+
+import httpx
+import pytest
+
+from app.core.database import get_db
+from app.main import app
+from app.modules.forecast.repositories import ForecastRepository
+
+
+ROWS = [
+    ("loc-1", [datetime(2025, 6, 1, 12), datetime(2025, 6, 1, 13)], [1.0, 2.0], [0.1, 0.2],
+     [0.8, 1.6], [0.9, 1.8], [1.1, 2.2], [1.2, 2.4]),
+    ("loc-2", [datetime(2025, 6, 1, 12)], [5.0], [0.5], [None], [None], [None], [None]),
+]
+
+
+@pytest.mark.asyncio
+async def test_one_query_for_all_locations(recording_session):
+    """All locations are read with a single = ANY(...) query"""
+    session = recording_session
+    session.rows = ROWS
+
+    series = await ForecastRepository(session).get_forecasts_range_bulk(
+        ["loc-1", "loc-2", "loc-3"], datetime(2025, 6, 1), datetime(2025, 6, 2)
+    )
+
+    assert len(session.queries) == 1
+    sql, params = session.queries[0]
+    assert '= ANY(:location_ids)' in sql
+    assert params["location_ids"] == ["loc-1", "loc-2", "loc-3"]
+    assert series["loc-1"]["power_output_mw"] == [1.0, 2.0]
+    assert "loc-3" not in series
+
+
+@pytest.mark.asyncio
+async def test_endpoint_returns_columnar_payload_keyed_by_location(recording_session):
+    """POST /locations/query returns one column set per location"""
+    session = recording_session
+    session.rows = ROWS
+
+    async def override_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_db
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/forecasts/locations/query", json={
+                "location_ids": ["loc-1", "loc-2"],
+                "start_time": "2025-06-01T00:00:00",
+                "end_time": "2025-06-02T00:00:00"
+            })
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+
+    assert response.status_code == 200
+    locations = response.json()["locations"]
+    assert set(locations) == {"loc-1", "loc-2"}
+    assert locations["loc-1"]["time"] == ["2025-06-01T12:00:00", "2025-06-01T13:00:00"]
+    assert locations["loc-2"]["power_mw_q10"] == [None]
@@ -0,0 +1,76 @@
+"""Tests for COPY-based forecast persistence (row preparation and merge statements)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime
+
+from app.core.config import settings
+from app.modules.forecast.repositories import ForecastRepository
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_prepares_rows_vectorially(recording_session):
+    """Invalid power rows are dropped, timestamps become naive UTC, NaN becomes NULL"""
+    session = recording_session
+    index = pd.date_range("2025-06-01 12:00", periods=4, freq="15min", tz="Europe/Bucharest")
+    forecasts = pd.DataFrame({
+        "power_mw": [1.5, np.nan, -0.2, 2.0],
+        "temp_air": [21.0, 22.0, 23.0, np.nan],
+        "model_type": "PHYSICS",
+        "horizon_hours": 2
+    }, index=index)
+
+    saved = await ForecastRepository(session).bulk_save_forecasts("loc-1", forecasts)
+
+    assert saved == 2
+    rows = [dict(zip(session.copied["columns"], record)) for record in session.copied["records"]]
+    assert [row["timestamp"] for row in rows] == [datetime(2025, 6, 1, 9, 0), datetime(2025, 6, 1, 9, 45)]
+    assert [row["temperature"] for row in rows] == [21.0, None]
+    assert {row["modelType"] for row in rows} == {"PHYSICAL"}
+    assert {row["horizonMinutes"] for row in rows} == {120}
+    assert session.committed
+
+
+@pytest.mark.asyncio
+async def test_bulk_save_merges_once_from_staging(recording_session):
+    """One COPY into the temp staging table and a single ON CONFLICT merge"""
+    session = recording_session
+    forecasts = pd.DataFrame(
+        {"power_mw": np.linspace(0, 5, 672)},
+        index=pd.date_range("2025-06-01", periods=672, freq="15min")
+    )
+
+    await ForecastRepository(session).bulk_save_forecasts("loc-1", forecasts)
+
+    assert session.copied["table"] == "forecasts_staging"
+    assert len(session.copied["records"]) == 672
+    statements = [sql for sql, _ in session.queries]
+    assert len(statements) == 2
+    assert "CREATE TEMP TABLE forecasts_staging ON COMMIT DROP" in statements[0]
+    assert "ON CONFLICT (timestamp, \"locationId\")" in statements[1]
+
+
+@pytest.mark.asyncio
+async def test_append_mode_inserts_run_and_moves_latest_pointer(monkeypatch, recording_session):
+    """Append storage COPYs straight into forecast_runs and upserts one pointer per location"""
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "append")
+    session = recording_session
+    repo = ForecastRepository(session)
+    forecasts = pd.DataFrame(
+        {"power_mw": [1.0, 2.0, 3.0]},
+        index=pd.date_range("2025-06-01 10:00", periods=3, freq="h")
+    )
+
+    columns, _ = repo.prepare_forecast_rows("loc-1", forecasts, run_id="run-42")
+    written, unchanged = await repo.merge_forecast_rows(columns)
+
+    assert (written, unchanged) == (3, 0)
+    assert session.copied["table"] == "forecast_runs"
+    statements = [sql for sql, _ in session.queries]
+    assert "ON CONFLICT" not in " ".join(statements[1:])
+    pointer = session.queries[0][1][0]
+    assert pointer["runId"] == "run-42"
+    assert pointer["rowCount"] == 3
+    assert pointer["endTime"] == datetime(2025, 6, 1, 12, 0)
+    assert "forecast_latest_runs" in statements[0]
@@ -0,0 +1,100 @@
+"""Tests for skipping unchanged forecast upserts"""
+
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.main import app
+from app.modules.forecast import repositories
+from app.modules.forecast.fingerprints import ForecastFingerprintCache
+from app.modules.forecast.repositories import ForecastRepository
+
+
+def _rows(location_id, start, powers, q10=None):
+    timestamps = [start + timedelta(minutes=15 * i) for i in range(len(powers))]
+    return {
+        "id": [f"{location_id}-{i}" for i in range(len(powers))],
+        "timestamp": timestamps,
+        "locationId": [location_id] * len(powers),
+        "powerMW": list(powers),
+        "powerMWQ10": list(q10) if q10 is not None else [None] * len(powers)
+    }
+
+
+@pytest.fixture
+def start():
+    return (datetime.utcnow() + timedelta(hours=1)).replace(second=0, microsecond=0)
+
+
+def test_identical_rerun_is_skipped(start):
+    """A second save with the same values writes nothing"""
+    cache = ForecastFingerprintCache()
+    rows = _rows("loc-1", start, [1.0, 2.0, 3.0])
+    cache.remember(rows)
+
+    changed, unchanged = cache.split_unchanged(_rows("loc-1", start, [1.0, 2.0, 3.0]))
+
+    assert unchanged == 3
+    assert changed["id"] == []
+
+
+def test_only_rows_beyond_tolerance_are_written(start):
+    """Sub-tolerance noise is ignored; real changes and new timestamps are written"""
+    cache = ForecastFingerprintCache()
+    cache.remember(_rows("loc-1", start, [1.0, 2.0, 3.0], q10=[0.5, 1.5, 2.5]))
+
+    rerun = _rows("loc-1", start, [1.0004, 2.5, 3.0, 4.0], q10=[0.5, 1.5, 2.0, 3.0])
+    changed, unchanged = cache.split_unchanged(rerun)
+
+    assert unchanged == 1
+    assert changed["powerMW"] == [2.5, 3.0, 4.0]
+
+
+def test_other_locations_are_not_affected(start):
+    """Fingerprints are per location"""
+    cache = ForecastFingerprintCache()
+    cache.remember(_rows("loc-1", start, [1.0, 2.0]))
+
+    changed, unchanged = cache.split_unchanged(_rows("loc-2", start, [1.0, 2.0]))
+
+    assert unchanged == 0
+    assert len(changed["id"]) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/location/loc-1", "/location/loc-1/stream", "/location/loc-1/export"])
+async def test_run_reads_are_rejected_in_upsert_mode(monkeypatch, path):
+    """Skipped rows keep an older runId, so a run is only readable in append mode"""
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "upsert")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(f"/api/v1/forecasts{path}", params={"run_id": "task-1"})
+
+    assert response.status_code == 400
+
+
+def test_weather_or_model_changes_are_written_with_unchanged_power(start):
+    """Every upserted column counts, not only power and quantiles"""
+    cache = ForecastFingerprintCache()
+    cache.remember({**_rows("loc-1", start, [1.0, 2.0]), "ghi": [500.0, 600.0], "modelType": ["PHYSICAL"] * 2})
+
+    rerun = {**_rows("loc-1", start, [1.0, 2.0]), "ghi": [500.0, 650.0], "modelType": ["PHYSICAL", "ENSEMBLE"]}
+    changed, unchanged = cache.split_unchanged(rerun)
+
+    assert unchanged == 1
+    assert changed["ghi"] == [650.0]
+
+
+@pytest.mark.asyncio
+async def test_retention_deletes_drop_the_location_fingerprints(monkeypatch, recording_session):
+    """A re-run over a purged range writes its rows again"""
+    invalidated = []
+    monkeypatch.setattr(repositories.forecast_fingerprints, "invalidate", invalidated.append)
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "upsert")
+    recording_session.respond = lambda sql, params: 2
+
+    deleted = await ForecastRepository(recording_session).delete_forecasts_before("loc-1", datetime.utcnow())
+
+    assert deleted == 2 and invalidated == ["loc-1"]
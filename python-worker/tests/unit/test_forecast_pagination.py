@@ -0,0 +1,77 @@
+"""Tests for keyset-paginated and streamed forecast range reads"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.services import (
+    ForecastService,
+    decode_forecast_cursor,
+    encode_forecast_cursor
+)
+
+START = datetime(2025, 6, 1)
+
+
+def _row(i):
+    return (START + timedelta(minutes=15 * i), "loc-1", float(i), None, 0.5,
+            None, None, None, None, "ML_ENSEMBLE", "2.0", 15 * i,
+            None, None, None, None, None, None)
+
+
+def _keyset_session(session, rows):
+    """Apply the `after` / `limit` parameters to an in-memory table"""
+    session.rows = rows
+
+    def respond(sql, params):
+        matching = [row for row in rows if "after" not in params or row[0] > params["after"]]
+        return matching[:params.get("limit", len(matching))]
+
+    session.respond = respond
+    return session
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    """Cursors decode to the encoded timestamp; malformed ones raise ValueError"""
+    assert decode_forecast_cursor(encode_forecast_cursor(START)) == START
+
+    with pytest.raises(ValueError):
+        decode_forecast_cursor("not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_cover_the_range_once(recording_session):
+    """Following next cursors walks every row exactly once, using keyset predicates"""
+    session = _keyset_session(recording_session, [_row(i) for i in range(7)])
+    service = ForecastService(session)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = await service.get_forecasts_page(
+            "loc-1", START, START + timedelta(days=1), limit=3, cursor=cursor
+        )
+        seen.extend(forecast["power_output_mw"] for forecast in page)
+        if cursor is None:
+            break
+
+    assert seen == [float(i) for i in range(7)]
+    sql, params = session.queries[-1]
+    assert "f.timestamp > :after" in sql and "LIMIT :limit" in sql
+    assert params["limit"] == 4
+
+
+@pytest.mark.asyncio
+async def test_stream_reads_through_server_side_cursor(recording_session):
+    """Streaming uses AsyncSession.stream with yield_per and yields API dicts"""
+    session = recording_session
+    session.rows = [_row(i) for i in range(3)]
+
+    rows = [
+        forecast async for forecast in ForecastRepository(session).stream_forecasts_range(
+            "loc-1", START, START + timedelta(days=1)
+        )
+    ]
+
+    assert [row["time"] for row in rows] == [START + timedelta(minutes=15 * i) for i in range(3)]
+    assert "yield_per" in session.execution_options
@@ -0,0 +1,100 @@
+"""Tests for hourly/daily forecast rollup routing"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.services import ForecastService
+
+START = datetime(2025, 6, 1)
+
+
+ROLLUP_ROW = (START, "loc-1", 2.5, 10.0, 0.25, 2.0, 2.2, 2.8, 3.0, "ML_ENSEMBLE", 20.0, 600.0, 15.0, 0.9)
+
+
+@pytest.fixture
+def rollup_views(monkeypatch):
+    monkeypatch.setattr(ForecastRepository, "rollup_views", {"forecast_rollup_hourly"})
+
+
+@pytest.fixture
+def session(recording_session):
+    recording_session.rows = [ROLLUP_ROW]
+    return recording_session
+
+
+@pytest.mark.asyncio
+async def test_hourly_reads_come_from_the_continuous_aggregate(rollup_views, session):
+    """A set-up rollup view is read directly"""
+
+    rows = await ForecastRepository(session).get_forecast_rollup(
+        "loc-1", START, START + timedelta(days=30), "HOURLY"
+    )
+
+    sql, _ = session.queries[0]
+    assert "FROM forecast_rollup_hourly r" in sql
+    assert rows[0]["energy_mwh"] == 10.0
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_bucketing_without_a_view(rollup_views, monkeypatch, session):
+    """Daily (no view), append storage and run_id reads bucket raw rows in SQL"""
+    repo = ForecastRepository(session)
+
+    await repo.get_forecast_rollup("loc-1", START, START + timedelta(days=30), "DAILY")
+    await repo.get_forecast_rollup("loc-1", START, START + timedelta(days=30), "HOURLY", run_id="run-1")
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "append")
+    await repo.get_forecast_rollup("loc-1", START, START + timedelta(days=30), "HOURLY")
+
+    daily, run, append = (sql for sql, _ in session.queries)
+    assert "time_bucket(INTERVAL '1 day', f.timestamp)" in daily
+    assert 'f."runId" = :run_id' in run and "forecast_rollup_hourly" not in run
+    assert "forecast_latest_runs" in append
+
+
+@pytest.mark.asyncio
+async def test_unsupported_resolution_is_rejected(session):
+    """Only the stored grids and the rollup resolutions are served"""
+    with pytest.raises(ValueError):
+        await ForecastService(session).get_forecasts_at_resolution(
+            "loc-1", START, START + timedelta(days=1), "WEEKLY"
+        )
+
+
+@pytest.mark.asyncio
+async def test_fallback_buckets_cover_whole_edge_buckets(session):
+    """On-the-fly buckets use the same bucket-aligned bounds as the aggregate reads"""
+
+    await ForecastRepository(session).get_forecast_rollup(
+        "loc-1", START + timedelta(minutes=30), START + timedelta(hours=5, minutes=30), "HOURLY"
+    )
+
+    sql, _ = session.queries[0]
+    assert "f.timestamp >= time_bucket(INTERVAL '1 hour', CAST(:start_time AS TIMESTAMP))" in sql
+    assert "f.timestamp < time_bucket(INTERVAL '1 hour', CAST(:end_time AS TIMESTAMP)) + INTERVAL '1 hour'" in sql
+    assert "f.timestamp >= :start_time" not in sql
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resolution", ["FIVE_MINUTES", "FIFTEEN_MINUTES"])
+async def test_fine_resolutions_read_rows_stored_on_that_grid(resolution, recording_session):
+    """Native grids filter on the stored resolution column instead of bucketing"""
+    session = recording_session
+
+    await ForecastService(session).get_forecasts_at_resolution(
+        "loc-1", START, START + timedelta(days=1), resolution
+    )
+
+    sql, params = session.queries[0]
+    assert "f.resolution = :resolution" in sql and params["resolution"] == resolution
+    assert "time_bucket" not in sql
+
+
+@pytest.mark.asyncio
+async def test_rollup_resolutions_cannot_be_paged(session):
+    with pytest.raises(ValueError):
+        await ForecastService(session).get_forecasts_page(
+            "loc-1", START, START + timedelta(days=1), limit=10, resolution="HOURLY"
+        )
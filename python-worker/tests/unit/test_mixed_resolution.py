@@ -0,0 +1,102 @@
+"""Tests for mixed-resolution (fine then coarse) forecast horizons"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast import repositories
+from app.modules.forecast.fingerprints import ForecastFingerprintCache
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.services import _uses_mixed_resolution
+from app.modules.forecast.utils.time_resolution import mixed_resolution_segments, resample_weather
+
+
+def _hourly_weather(hours):
+    index = pd.date_range("2025-06-01 06:00", periods=hours, freq="h", tz="UTC")
+    ghi = np.clip(800 * np.sin((index.hour.values - 6) / 12 * np.pi), 0, None)
+    return pd.DataFrame({"ghi": ghi, "temp_air": 20.0}, index=index)
+
+
+def test_week_ahead_horizon_is_split_at_the_cutover():
+    """Fine points up to the cut-over, hourly after it, with no overlap or gap"""
+    weather = _hourly_weather(168)
+
+    segments = mixed_resolution_segments(weather, "FIFTEEN_MINUTES", "HOURLY", cutover_hours=48)
+
+    assert [segment[0] for segment in segments] == ["FIFTEEN_MINUTES", "HOURLY"]
+    (_, fine_weather, fine_start, cutover), (_, coarse_weather, coarse_start, end) = segments
+    assert cutover == coarse_start == weather.index[0] + pd.Timedelta(hours=48)
+    # The fine slice reaches the cut-over sample so interpolation covers it
+    assert fine_weather.index[-1] == cutover
+
+    fine = resample_weather(fine_weather, "15min")
+    fine = fine[(fine.index >= fine_start) & (fine.index < cutover)]
+    coarse = coarse_weather[(coarse_weather.index >= coarse_start) & (coarse_weather.index < end)]
+
+    assert len(fine) == 48 * 4 and len(coarse) == 120
+    assert fine.index[-1] + pd.Timedelta(minutes=15) == coarse.index[0]
+    # 672 points on the fine grid throughout
+    assert 168 * 4 / (len(fine) + len(coarse)) > 2
+
+
+def test_short_horizon_stays_on_the_fine_grid():
+    """Nothing worth forecasting past the cut-over -> one fine segment"""
+    weather = _hourly_weather(49)
+
+    segments = mixed_resolution_segments(weather, "FIFTEEN_MINUTES", "HOURLY", cutover_hours=48)
+
+    assert len(segments) == 1 and segments[0][0] == "FIFTEEN_MINUTES"
+    assert len(segments[0][1]) == 49
+
+
+def test_mixed_mode_only_for_long_horizons_and_coarser_grids(monkeypatch):
+    monkeypatch.setattr(settings, "FORECAST_MIXED_RESOLUTION", True)
+    monkeypatch.setattr(settings, "FORECAST_MIXED_CUTOVER_HOURS", 48)
+    monkeypatch.setattr(settings, "FORECAST_COARSE_RESOLUTION", "HOURLY")
+
+    assert _uses_mixed_resolution("FIFTEEN_MINUTES", 168)
+    assert not _uses_mixed_resolution("FIFTEEN_MINUTES", 48)
+    assert not _uses_mixed_resolution("HOURLY", 168)
+
+    monkeypatch.setattr(settings, "FORECAST_MIXED_RESOLUTION", False)
+    assert not _uses_mixed_resolution("FIFTEEN_MINUTES", 168)
+
+
+@pytest.mark.asyncio
+async def test_superseded_fine_rows_are_deleted(monkeypatch, recording_session):
+    """Rows between the coarse timestamps go, and the location's fingerprints are dropped"""
+    invalidated = []
+    monkeypatch.setattr(repositories.forecast_fingerprints, "invalidate", invalidated.append)
+    session = recording_session
+    session.respond = lambda sql, params: 3
+    keep = pd.date_range("2025-06-03 06:00", periods=3, freq="h", tz="UTC")
+
+    deleted = await ForecastRepository(session).delete_forecasts_off_grid("loc-1", keep[0], keep[-1], keep)
+
+    sql, params = session.queries[0]
+    assert deleted == 3 and session.committed
+    assert "NOT (timestamp = ANY(:keep))" in sql
+    assert params["keep"][0].tzinfo is None and len(params["keep"]) == 3
+    assert invalidated == ["loc-1"]
+
+
+def test_unchanged_rows_switching_grid_are_relabelled():
+    """Night zeros at hourly marks are rewritten when they move to the coarse grid"""
+    cache = ForecastFingerprintCache()
+    start = (pd.Timestamp.utcnow().tz_localize(None) + pd.Timedelta(days=3)).floor("h")
+    timestamps = [start + pd.Timedelta(hours=i) for i in range(3)]
+
+    def rows(resolution):
+        return {
+            "id": [str(i) for i in range(3)],
+            "timestamp": timestamps,
+            "locationId": ["loc-1"] * 3,
+            "powerMW": [0.0] * 3,
+            "resolution": [resolution] * 3
+        }
+
+    cache.remember(rows("FIFTEEN_MINUTES"))
+    changed, unchanged = cache.split_unchanged(rows("HOURLY"))
+
+    assert unchanged == 0 and changed["resolution"] == ["HOURLY"] * 3
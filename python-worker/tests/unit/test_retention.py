@@ -0,0 +1,91 @@
+"""Tests for chunk-aware retention and batched deletes"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast import retention as retention_module
+from app.modules.forecast.repositories import ForecastRepository
+from app.modules.forecast.retention import StorageMaintenance
+
+
+def _batch_session(session, rows):
+    """Each DELETE removes up to :batch of the remaining rows"""
+    remaining = [rows]
+
+    def respond(sql, params):
+        deleted = min(remaining[0], params["batch"])
+        remaining[0] -= deleted
+        return deleted
+
+    session.respond = respond
+    return session
+
+
+@pytest.mark.asyncio
+async def test_deletes_commit_in_batches(monkeypatch, recording_session):
+    """A large delete is split into committed batches of RETENTION_DELETE_BATCH_ROWS"""
+    monkeypatch.setattr(settings, "RETENTION_DELETE_BATCH_ROWS", 100)
+    session = _batch_session(recording_session, 250)
+
+    deleted = await ForecastRepository(session).delete_forecasts_before("loc-1", datetime(2025, 1, 1))
+
+    assert deleted == 250
+    assert len(session.queries) == 3 and session.commits == 3
+
+
+class _FakeRepo:
+    dropped = []
+
+    def __init__(self, db):
+        pass
+
+    async def get_hypertables(self):
+        return {"forecasts": True}
+
+    async def get_chunks_before(self, table, before):
+        cutoff = datetime.utcnow() - timedelta(days=settings.FORECAST_RETENTION_DAYS)
+        return [
+            {"chunk_name": "old", "range_start": cutoff - timedelta(days=2),
+             "range_end": cutoff - timedelta(days=1), "is_compressed": True, "total_bytes": 1000},
+            {"chunk_name": "edge", "range_start": cutoff - timedelta(hours=12),
+             "range_end": cutoff + timedelta(hours=12), "is_compressed": True, "total_bytes": 800},
+            {"chunk_name": "cold", "range_start": cutoff + timedelta(days=30),
+             "range_end": cutoff + timedelta(days=31), "is_compressed": False, "total_bytes": 500}
+        ]
+
+    async def get_compression_ratio(self, table):
+        return 0.1
+
+    async def count_rows_before(self, table, before, since=None):
+        return 42
+
+    async def drop_chunks_before(self, table, before):
+        _FakeRepo.dropped.append(table)
+        return ["old"]
+
+    async def delete_rows_before(self, table, before, location_id=None):
+        return 42
+
+
+@pytest.mark.asyncio
+async def test_dry_run_reports_without_dropping(monkeypatch, recording_session):
+    """Dry runs report droppable/partial/compressible data and change nothing"""
+    monkeypatch.setattr(retention_module, "ForecastRepository", _FakeRepo)
+    monkeypatch.setattr(retention_module, "AsyncSessionLocal", lambda: recording_session)
+    monkeypatch.setattr(settings, "FORECAST_STORAGE_MODE", "upsert")
+    _FakeRepo.dropped = []
+
+    report = await StorageMaintenance().run(dry_run=True)
+
+    forecasts = next(t for t in report["tables"] if t["table"] == "forecasts")
+    assert forecasts["droppable_chunks"] == 1 and forecasts["droppable_bytes"] == 1000
+    assert forecasts["partial_rows"] == 42
+    assert forecasts["compressible_chunks"] == 1
+    assert forecasts["estimated_compression_savings_bytes"] == 450
+    assert _FakeRepo.dropped == []
+
+    applied = await StorageMaintenance().run(dry_run=False)
+    assert _FakeRepo.dropped == ["forecasts"]
+    assert next(t for t in applied["tables"] if t["table"] == "forecasts")["rows_deleted"] == 42
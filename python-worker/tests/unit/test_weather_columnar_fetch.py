@@ -0,0 +1,65 @@
+"""Tests for the columnar (array_agg) weather fetch"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.core.config import settings
+from app.modules.forecast.repositories import ForecastRepository
+
+
+@pytest.fixture(autouse=True)
+def no_weather_cache(monkeypatch):
+    """Exercise the database path directly"""
+    monkeypatch.setattr(settings, "WEATHER_CACHE_ENABLED", False)
+
+
+def _arrays():
+    timestamps = [datetime(2025, 6, 1, h) for h in range(3)]
+    return (
+        timestamps,
+        [18.0, None, 20.0],     # temperature
+        [60.0, 61.0, 62.0],     # humidity
+        [2.0, 2.5, None],       # windSpeed
+        [10.0, 20.0, 30.0],     # cloudCover
+        [0.0, 150.0, 400.0],    # ghi
+        [0.0, 100.0, 300.0],    # dni
+        [0.0, 50.0, 100.0],     # dhi
+    )
+
+
+@pytest.mark.asyncio
+async def test_future_weather_frame_from_column_arrays(recording_session):
+    """Arrays become float columns (NULL -> NaN) with PVLIB constants added"""
+    recording_session.rows = [_arrays()]
+    repo = ForecastRepository(recording_session)
+
+    df = await repo.get_future_weather("loc-1", hours=48)
+
+    assert list(df.index) == [datetime(2025, 6, 1, h) for h in range(3)]
+    assert df["ghi"].tolist() == [0.0, 150.0, 400.0]
+    assert np.isnan(df["temp_air"].iloc[1])
+    assert (df["pressure"] == 1013.25).all() and (df["albedo"] == 0.2).all()
+
+
+@pytest.mark.asyncio
+async def test_database_fallback_fills_gaps_but_keeps_zero_readings(recording_session):
+    """Only missing values get defaults; a real 0.0 reading stays 0.0"""
+    recording_session.rows = [_arrays()]
+    repo = ForecastRepository(recording_session)
+
+    df = await repo._get_weather_from_database("loc-1", hours=24)
+
+    assert df["temp_air"].tolist() == [18.0, 20.0, 20.0]
+    assert df["wind_speed"].tolist() == [2.0, 2.5, 2.0]
+    assert df["ghi"].iloc[0] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_no_rows_returns_empty_frame(recording_session):
+    """array_agg over zero rows yields NULL arrays"""
+    recording_session.rows = [(None,) * 8]
+    repo = ForecastRepository(recording_session)
+
+    assert (await repo.get_future_weather("loc-1", hours=48)).empty
@@ -65,6 +65,7 @@ export enum ModelType {
 }
 
 export enum ResolutionType {
+  FIVE_MINUTES = 'FIVE_MINUTES',          // 5min
   FIFTEEN_MINUTES = 'FIFTEEN_MINUTES',    // 15min
   THIRTY_MINUTES = 'THIRTY_MINUTES',      // 30min
   HOURLY = 'HOURLY',                      // 1h
@@ -186,6 +187,7 @@ export function formatForecastForCSV(forecast: Forecast): LinearForecastRow {
 
 export function resolutionToMinutes(resolution: ResolutionType): number {
   switch (resolution) {
+    case ResolutionType.FIVE_MINUTES: return 5;
     case ResolutionType.FIFTEEN_MINUTES: return 15;
     case ResolutionType.THIRTY_MINUTES: return 30;
     case ResolutionType.HOURLY: return 60;
@@ -198,6 +200,7 @@ export function resolutionToMinutes(resolution: ResolutionType): number {
 
 export function resolutionToString(resolution: ResolutionType): string {
   switch (resolution) {
+    case ResolutionType.FIVE_MINUTES: return '5min';
     case ResolutionType.FIFTEEN_MINUTES: return '15min';
     case ResolutionType.THIRTY_MINUTES: return '30min';
     case ResolutionType.HOURLY: return '1h';
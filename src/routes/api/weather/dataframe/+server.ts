@@ -62,6 +62,31 @@ export const GET: RequestHandler = async ({ url }) => {
       pressure: 1013.25, // Default pressure as field doesn't exist in model
     }));
 
+    // NDJSON: one record per line, so the worker can decode while it downloads
+    if (url.searchParams.get("format") === "ndjson") {
+      const encoder = new TextEncoder();
+      let index = 0;
+      const stream = new ReadableStream<Uint8Array>({
+        pull(controller) {
+          const batch = dataframeData.slice(index, index + 1000);
+          index += batch.length;
+          if (batch.length === 0) {
+            controller.close();
+            return;
+          }
+          controller.enqueue(
+            encoder.encode(batch.map((record) => JSON.stringify(record)).join("\n") + "\n"),
+          );
+        },
+      });
+      return new Response(stream, {
+        headers: {
+          "Content-Type": "application/x-ndjson",
+          "X-Record-Count": String(dataframeData.length),
+        },
+      });
+    }
+
     return json({
       success: true,
       data: dataframeData,